@@ -0,0 +1,129 @@
+<?php
+/**
+ * onion.press OPcache status
+ * Version: 1.0.0
+ *
+ * Installed by onion.press into the WordPress document root. It only answers
+ * requests made from inside the web containers (127.0.0.1) that carry the
+ * token onion.press keeps in /etc/onionpress/php/status-token; everyone else
+ * gets a 404. The token is needed because Apache's remoteip setup trusts
+ * X-Forwarded-For from the Docker network, so the address alone is not proof.
+ *
+ *   (no query)   OPcache status as JSON, without the per-script list
+ *   ?preload=1   a preload script for the WordPress core files that are hot
+ *   ?prime=1     compile the files in the current preload script into OPcache
+ */
+
+const ONIONPRESS_TOKEN_FILE = '/etc/onionpress/php/status-token';
+const ONIONPRESS_PRELOAD_FILE = '/etc/onionpress/php/preload.php';
+
+// A core file needs this many hits since the last start to be preloaded
+const ONIONPRESS_PRELOAD_MIN_HITS = 2;
+
+function onionpress_not_found() {
+    http_response_code(404);
+    exit;
+}
+
+function onionpress_authorized() {
+    $address = $_SERVER['REMOTE_ADDR'] ?? '';
+    if ($address !== '127.0.0.1' && $address !== '::1') {
+        return false;
+    }
+    $token = is_readable(ONIONPRESS_TOKEN_FILE) ? trim((string) file_get_contents(ONIONPRESS_TOKEN_FILE)) : '';
+    $given = (string) ($_SERVER['HTTP_X_ONIONPRESS_TOKEN'] ?? '');
+    return $token !== '' && hash_equals($token, $given);
+}
+
+function onionpress_wp_version() {
+    $source = @file_get_contents(__DIR__ . '/wp-includes/version.php');
+    return ($source && preg_match("/\\\$wp_version = '([^']+)'/", $source, $m)) ? $m[1] : '';
+}
+
+/**
+ * Core files (wp-includes, wp-admin/includes and the bootstrap files) by hits, hottest first
+ */
+function onionpress_hot_core_files($scripts) {
+    $root = __DIR__ . '/';
+    $files = array();
+    foreach ($scripts as $script) {
+        $path = $script['full_path'];
+        if (strpos($path, $root) !== 0 || $script['hits'] < ONIONPRESS_PRELOAD_MIN_HITS) {
+            continue;
+        }
+        $relative = substr($path, strlen($root));
+        if (preg_match('#^(wp-includes/|wp-admin/includes/|wp-(settings|load|blog-header)\.php$|index\.php$)#', $relative)) {
+            $files[$path] = $script['hits'];
+        }
+    }
+    arsort($files);
+    return array_keys($files);
+}
+
+function onionpress_preload_script($files) {
+    $version = onionpress_wp_version();
+    $lines = array(
+        '<?php',
+        '// Generated by onion.press from OPcache hit counts: ' . count($files) . ' hot core files of',
+        '// WordPress ' . $version . ' (' . gmdate('Y-m-d H:i') . ' UTC). Used as opcache.preload when',
+        '// PHP_PRELOAD=yes, and compiled into OPcache after every start. After a WordPress',
+        '// update the list is skipped until it is generated again.',
+        '$onionpress_preload_version = ' . var_export($version, true) . ';',
+        '$onionpress_preload_files = array(',
+    );
+    foreach ($files as $file) {
+        $lines[] = '    ' . var_export($file, true) . ',';
+    }
+    $lines[] = ');';
+    $lines[] = '$onionpress_version_source = @file_get_contents(' . var_export(__DIR__ . '/wp-includes/version.php', true) . ');';
+    $lines[] = 'if ($onionpress_version_source && strpos($onionpress_version_source, "\'" . $onionpress_preload_version . "\'") !== false) {';
+    $lines[] = '    foreach ($onionpress_preload_files as $onionpress_file) {';
+    $lines[] = '        if (is_file($onionpress_file)) {';
+    $lines[] = '            @opcache_compile_file($onionpress_file);';
+    $lines[] = '        }';
+    $lines[] = '    }';
+    $lines[] = '}';
+    return implode("\n", $lines) . "\n";
+}
+
+/**
+ * Compile the preload list into OPcache; returns how many scripts were added
+ * (in a function, so the preload script's variables stay local)
+ */
+function onionpress_prime() {
+    $before = opcache_get_status(false)['opcache_statistics']['num_cached_scripts'] ?? 0;
+    include ONIONPRESS_PRELOAD_FILE;
+    return (opcache_get_status(false)['opcache_statistics']['num_cached_scripts'] ?? 0) - $before;
+}
+
+if (!onionpress_authorized()) {
+    onionpress_not_found();
+}
+
+header('Cache-Control: no-store');
+
+if (!function_exists('opcache_get_status')) {
+    header('Content-Type: application/json');
+    echo json_encode(array('opcache_enabled' => false));
+    exit;
+}
+
+if (isset($_GET['preload'])) {
+    $status = opcache_get_status(true);
+    header('Content-Type: text/plain');
+    echo onionpress_preload_script(onionpress_hot_core_files($status['scripts'] ?? array()));
+    exit;
+}
+
+$primed = null;
+if (isset($_GET['prime']) && is_readable(ONIONPRESS_PRELOAD_FILE)) {
+    $primed = onionpress_prime();
+}
+
+$status = opcache_get_status(false) ?: array('opcache_enabled' => false);
+if ($primed !== null) {
+    $status['onionpress_primed'] = $primed;
+}
+$status['onionpress_wp_version'] = onionpress_wp_version();
+header('Content-Type: application/json');
+echo json_encode($status);
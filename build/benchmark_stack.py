@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Stack variant benchmark for Onion.Press
+
+Restarts the stack once per variant (STACK_VARIANT=apache: Apache + mod_php
+in the wordpress container; STACK_VARIANT=fpm: nginx serving static files
+from the wordpress-data volume in front of a bounded PHP-FPM pool), waits
+for the local port, then drives it with concurrent clients for a fixed time
+and samples container memory while it does. Prints requests per second,
+p50/p95 latency and peak memory side by side.
+
+Both variants run on the same volumes, so switching back and forth needs no
+data migration. The stack is left running on the last variant benchmarked;
+restart it from the menu (or `onion.press restart`) to return to the one in
+~/.onion.press/config.
+
+Usage:
+    python3 build/benchmark_stack.py [--variants apache,fpm] [--duration S]
+                                     [--concurrency N] [--path PATH]
+
+The default path carries a query string, which both the page cache rules
+(Apache's .htaccess, nginx's try_files) skip, so every request runs PHP and
+the two worker models are what gets compared. Pass --path / to measure
+cached pages instead.
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAUNCHER = os.path.join(PROJECT_DIR, "Onion.Press.app", "Contents", "MacOS", "onion.press")
+sys.path.insert(0, os.path.join(PROJECT_DIR, "src"))
+
+import docker_api  # noqa: E402
+import vm_sizing  # noqa: E402
+
+# Any query string skips the page cache, so PHP renders every request
+DEFAULT_PATH = "/?onionpress-bench=1"
+
+# Containers that serve web requests in each variant (the database is shared)
+VARIANT_CONTAINERS = {
+    "apache": ("onionpress-wordpress", "onionpress-db"),
+    "fpm": ("onionpress-web", "onionpress-wordpress", "onionpress-db"),
+}
+
+
+def restart_stack(variant):
+    """Restart the stack on a variant; the environment overrides STACK_VARIANT in config"""
+    env = dict(os.environ, ONIONPRESS_STACK_VARIANT=variant)
+    result = subprocess.run([LAUNCHER, "restart"], capture_output=True, text=True, env=env, timeout=900)
+    if result.returncode != 0:
+        raise RuntimeError(f"restart on {variant} failed:\n{result.stdout[-2000:]}{result.stderr[-2000:]}")
+
+
+def fetch(host, port, path, timeout=10):
+    """One GET on a fresh connection; return (status, seconds)"""
+    started = time.monotonic()
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("GET", path, headers={"Host": "localhost:8080"})
+        response = conn.getresponse()
+        response.read()
+        return response.status, time.monotonic() - started
+    finally:
+        conn.close()
+
+
+def wait_until_serving(host, port, path, timeout=300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if fetch(host, port, path)[0] < 500:
+                return
+        except OSError:
+            pass
+        time.sleep(2)
+    raise RuntimeError(f"http://{host}:{port}{path} did not answer within {timeout}s")
+
+
+def run_load(host, port, path, concurrency, duration):
+    """Concurrent clients for `duration` seconds; return (latencies, errors)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        while time.monotonic() < stop_at:
+            try:
+                status, seconds = fetch(host, port, path)
+            except OSError:
+                status, seconds = None, None
+            with lock:
+                if status == 200:
+                    latencies.append(seconds)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def sample_memory(docker, names, stop, peaks):
+    """Record the highest total memory (MB) seen until `stop` is set"""
+    while not stop.is_set():
+        total = 0
+        for name in names:
+            try:
+                total += vm_sizing.container_usage(docker.stats(name) or {})[1]
+            except docker_api.DockerAPIError:
+                pass
+        peaks.append(total // (1024 * 1024))
+
+
+def benchmark(variant, docker, args):
+    print(f"Restarting on {variant}...", flush=True)
+    restart_stack(variant)
+    wait_until_serving(args.host, args.port, args.path)
+
+    # Warm up OPcache, the object cache and the database before measuring
+    run_load(args.host, args.port, args.path, args.concurrency, args.warmup)
+
+    idle = vm_sizing.sample_usage(docker, VARIANT_CONTAINERS[variant], optional=())
+    stop = threading.Event()
+    peaks = []
+    sampler = threading.Thread(target=sample_memory,
+                               args=(docker, VARIANT_CONTAINERS[variant], stop, peaks), daemon=True)
+    sampler.start()
+    latencies, errors = run_load(args.host, args.port, args.path, args.concurrency, args.duration)
+    stop.set()
+    sampler.join()
+
+    result = {
+        "variant": variant,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / args.duration,
+        "p50": vm_sizing.percentile(latencies, 50) * 1000 if latencies else 0,
+        "p95": vm_sizing.percentile(latencies, 95) * 1000 if latencies else 0,
+        "mean": statistics.mean(latencies) * 1000 if latencies else 0,
+        "idle_mb": idle[1] if idle else 0,
+        "peak_mb": max(peaks) if peaks else 0,
+    }
+    print(f"  {result['rps']:.1f} req/s, p50 {result['p50']:.0f}ms, p95 {result['p95']:.0f}ms, "
+          f"{errors} errors, memory {result['idle_mb']}MB idle / {result['peak_mb']}MB peak")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare throughput and memory of the stack variants")
+    parser.add_argument("--variants", default="apache,fpm")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of measured load per variant")
+    parser.add_argument("--warmup", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--path", default=DEFAULT_PATH,
+                        help="request path (the default bypasses the page cache)")
+    args = parser.parse_args()
+
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    unknown = [v for v in variants if v not in VARIANT_CONTAINERS]
+    if unknown:
+        parser.error(f"unknown variant(s): {', '.join(unknown)}")
+
+    docker = docker_api.DockerClient()
+    results = [benchmark(variant, docker, args) for variant in variants]
+
+    print("")
+    print(f"{'variant':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7} {'idle MB':>8} {'peak MB':>8}")
+    for r in results:
+        print(f"{r['variant']:<8} {r['rps']:>8.1f} {r['p50']:>8.0f} {r['p95']:>8.0f} "
+              f"{r['errors']:>7} {r['idle_mb']:>8} {r['peak_mb']:>8}")
+    if any(r["requests"] == 0 for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
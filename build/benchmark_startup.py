@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Onion.Press menubar app
+
+Measures two things and exits non-zero when either regresses:
+
+1. Time-to-splash: launches src/menubar.py with ONIONPRESS_SPLASH_BENCHMARK=1
+   (the app prints when the splash window is on screen and exits) and takes
+   the median over several runs.
+2. Eager imports: in the same runs the app also prints sys.modules as it was
+   when the splash appeared; fails if a module that should be deferred
+   (key_manager, mnemonic, docker_api, ...) is already loaded by then.
+
+The module-load import time (`python3 -X importtime`) is printed for reference.
+
+Usage:
+    python3 build/benchmark_startup.py [--runs N] [--budget-ms MS] [--save-baseline]
+
+The baseline (best median seen with --save-baseline) is kept per machine in
+~/.onion.press/startup-baseline; a median more than --tolerance percent
+slower than the baseline fails as well.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MENUBAR = os.path.join(PROJECT_DIR, "src", "menubar.py")
+BASELINE_FILE = os.path.expanduser("~/.onion.press/startup-baseline")
+
+# Default time-to-splash budget (interpreter start through splash on screen)
+DEFAULT_BUDGET_MS = 1500
+
+# Modules that must not be imported before the splash
+DEFERRED_MODULES = [
+    "key_manager", "mnemonic", "bip39_words", "docker_api", "readiness",
+    "tor_log", "scheduler", "diagnostics", "startup_trace", "image_pull",
+    "image_updates", "vm_sizing", "web_log",
+    "traffic_stats", "object_cache", "php_opcache", "buffer_pool",
+    "address_cache", "status",
+]
+
+# Deferred by menubar.py but possibly pulled in by rumps/pyobjc; reported only
+SOFT_DEFERRED_MODULES = ["json", "plistlib", "concurrent.futures", "tarfile"]
+
+
+def time_to_splash(python):
+    """Launch the menubar app once; return (milliseconds until the splash was shown, modules loaded by then)
+
+    Runs with a throwaway HOME (and no DOCKER_HOST), so the real ~/.onion.press
+    log isn't rotated and no background thread reaches the running stack.
+    """
+    with tempfile.TemporaryDirectory(prefix="onionpress-bench-") as home:
+        os.makedirs(os.path.join(home, ".onion.press"))
+        env = dict(os.environ, ONIONPRESS_SPLASH_BENCHMARK="1", HOME=home)
+        env.pop("DOCKER_HOST", None)
+        started = time.time()
+        result = subprocess.run([python, MENUBAR], capture_output=True, text=True, env=env, timeout=60)
+    modules = set()
+    for line in result.stdout.splitlines():
+        if line.startswith("SPLASH_MODULES="):
+            modules = set(line.split("=", 1)[1].split(","))
+        elif line.startswith("SPLASH_SHOWN_US="):
+            return int(line.split("=", 1)[1]) / 1000.0 - started * 1000.0, modules
+    raise RuntimeError(f"menubar exited without showing the splash:\n{result.stderr[-2000:]}")
+
+
+def import_time(python):
+    """Return the total ms spent importing modules while menubar's module body runs"""
+    code = ("import sys; sys.path.insert(0, %r); "
+            "import importlib.util as u; s = u.spec_from_file_location('menubar_bench', %r); "
+            "m = u.module_from_spec(s); s.loader.exec_module(m)"
+            % (os.path.dirname(MENUBAR), MENUBAR))
+    result = subprocess.run([python, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing menubar failed:\n{result.stderr[-2000:]}")
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line.split("|")
+        if not parts[-1].startswith("  "):  # Top-level import
+            total_us += int(parts[1].strip())
+    return total_us / 1000.0
+
+
+def read_baseline():
+    try:
+        with open(BASELINE_FILE, 'r') as f:
+            return float(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark menubar time-to-splash")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--tolerance", type=float, default=20.0,
+                        help="percent slower than the saved baseline that counts as a regression")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--python", default=sys.executable,
+                        help="interpreter with rumps/pyobjc installed")
+    args = parser.parse_args()
+
+    failures = []
+
+    print(f"Imports at module load: {import_time(args.python):.0f}ms")
+
+    samples = []
+    imported = set()
+    for _ in range(args.runs):
+        ms, modules = time_to_splash(args.python)
+        samples.append(ms)
+        imported |= modules
+    eager = [name for name in DEFERRED_MODULES if name in imported]
+    if eager:
+        failures.append(f"modules imported before the splash: {', '.join(eager)}")
+    soft = [name for name in SOFT_DEFERRED_MODULES if name in imported]
+    if soft:
+        print(f"Note: imported before the splash by a dependency: {', '.join(soft)}")
+
+    median = statistics.median(samples)
+    print(f"Time to splash: median {median:.0f}ms over {args.runs} runs "
+          f"(min {min(samples):.0f}ms, max {max(samples):.0f}ms, budget {args.budget_ms:.0f}ms)")
+    if median > args.budget_ms:
+        failures.append(f"time to splash {median:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+
+    baseline = read_baseline()
+    if baseline is not None:
+        limit = baseline * (1 + args.tolerance / 100.0)
+        print(f"Baseline: {baseline:.0f}ms (limit {limit:.0f}ms)")
+        if median > limit:
+            failures.append(f"time to splash regressed: {median:.0f}ms vs baseline {baseline:.0f}ms")
+
+    if args.save_baseline and not failures and (baseline is None or median < baseline):
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, 'w') as f:
+            f.write(f"{median:.1f}\n")
+        print(f"Saved baseline {median:.0f}ms to {BASELINE_FILE}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -225,6 +225,48 @@ rm -rf "$TEMP_BIN_DIR"
 
 echo "Container runtime binaries installed successfully"
 
+# Bundle the onion.press WordPress plugins the launcher installs
+PLUGINS_DIR="$APP_PATH/Contents/Resources/plugins"
+rm -rf "$PLUGINS_DIR"
+mkdir -p "$PLUGINS_DIR"
+cp -R "$PROJECT_DIR/wordpress-plugins/onionpress-page-cache" "$PLUGINS_DIR/"
+cp -R "$PROJECT_DIR/wordpress-plugins/onionpress-object-cache" "$PLUGINS_DIR/"
+
+# Optionally bundle the container images so first run loads them from disk instead of
+# downloading ~1GB: BUNDLE_IMAGES=yes ./build/build-dmg-simple.sh (needs Docker on the build machine)
+IMAGES_DIR="$APP_PATH/Contents/Resources/images"
+rm -rf "$IMAGES_DIR"
+if [ "$BUNDLE_IMAGES" = "yes" ]; then
+    echo "Bundling container images..."
+    mkdir -p "$IMAGES_DIR"
+    IMAGE_MANIFEST="$IMAGES_DIR/manifest.txt"
+    echo "# image platform archive id" > "$IMAGE_MANIFEST"
+
+    # Pinned images from docker-compose.yml with their platform (the VM is arm64
+    # unless a service says otherwise), plus the alpine helper image from onion.press
+    BUNDLE_LIST=$(awk '
+        /^  [a-z]/ { if (image) print image, platform; image = ""; platform = "linux/arm64" }
+        $1 == "image:" { image = $2 }
+        $1 == "platform:" { platform = $2 }
+        END { if (image) print image, platform }
+    ' "$APP_PATH/Contents/Resources/docker/docker-compose.yml")
+    ALPINE_IMAGE=$(grep '^ALPINE_IMAGE=' "$APP_PATH/Contents/MacOS/onion.press" | cut -d'"' -f2)
+    BUNDLE_LIST="$BUNDLE_LIST
+$ALPINE_IMAGE linux/arm64"
+
+    echo "$BUNDLE_LIST" | while read image platform; do
+        [ -n "$image" ] || continue
+        archive="$(echo "$image" | tr '/:' '__').tar.gz"
+        echo "  $image ($platform)"
+        docker pull --quiet --platform "$platform" "$image"
+        # docker save writes an OCI image layout; docker load reads it gzipped
+        docker save "$image" | gzip -9 > "$IMAGES_DIR/$archive"
+        id=$(docker image inspect -f '{{.Id}}' "$image")
+        echo "$image $platform $archive $id" >> "$IMAGE_MANIFEST"
+    done
+    echo "  Bundled images: $(du -sh "$IMAGES_DIR" | cut -f1)"
+fi
+
 # Build standalone MenubarApp using py2app
 # This bundles Python + all dependencies into a self-contained .app so
 # end users don't need Python/pip installed.
@@ -250,6 +292,24 @@ python3 -m venv "$MENUBAR_BUILD_DIR/venv"
 SITE_PACKAGES=$("$MENUBAR_BUILD_DIR/venv/bin/python3" -c "import site; print(site.getsitepackages()[0])")
 cp "$SCRIPTS_DIR/key_manager.py" "$SITE_PACKAGES/"
 cp "$SCRIPTS_DIR/bip39_words.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/docker_api.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/readiness.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/tor_log.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/address_cache.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/scheduler.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/status.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/diagnostics.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/startup_trace.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/lazy_import.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/buffered_log.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/image_pull.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/image_updates.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/vm_sizing.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/web_log.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/traffic_stats.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/object_cache.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/php_opcache.py" "$SITE_PACKAGES/"
+cp "$SCRIPTS_DIR/buffer_pool.py" "$SITE_PACKAGES/"
 
 # Run py2app build using the root setup.py
 cd "$PROJECT_DIR"
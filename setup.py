@@ -41,8 +41,9 @@ OPTIONS = {
     # py2app cannot auto-detect these because it runs menubar.py via exec(),
     # not import. If you add a new local .py module, ADD IT HERE or the build
     # will appear to succeed but the app will crash at launch with
-    # "ModuleNotFoundError".
-    'includes': ['subprocess', 'threading', 'os', 'time', 'json', 'key_manager', 'bip39_words'],
+    # "ModuleNotFoundError". Modules menubar.py loads through lazy() are
+    # invisible to py2app's import scan, so they must be listed here too.
+    'includes': ['subprocess', 'threading', 'os', 'time', 'json', 'plistlib', 'lazy_import', 'buffered_log', 'key_manager', 'bip39_words', 'docker_api', 'readiness', 'tor_log', 'address_cache', 'scheduler', 'status', 'diagnostics', 'startup_trace', 'image_pull', 'image_updates', 'vm_sizing', 'web_log', 'traffic_stats', 'object_cache', 'php_opcache', 'buffer_pool'],
     'excludes': ['tkinter', 'test', 'unittest', 'urllib', 'urllib.request', 'urllib.error', 'http', 'http.client', 'http.server'],
     'arch': 'universal2',  # Build for both Intel and Apple Silicon
     'strip': True,  # Strip debug symbols to reduce size
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Onion address cache for onion.press
+The onion address only changes on first run (new tor-keys volume) or when a
+key is imported, so it is persisted in ~/.onion.press/onion-address instead of
+being read from the Tor container on every status poll.
+
+The file uses the same KEY=value format as the config and secrets files so the
+bash launcher can read it with grep/cut:
+
+    ADDRESS=op2....onion
+    VOLUME_CREATED_AT=2026-01-31T12:00:00Z
+
+VOLUME_CREATED_AT records which tor-keys volume the address belongs to; a
+recreated volume has a different creation time and invalidates the entry.
+"""
+
+import os
+
+CACHE_FILENAME = "onion-address"
+TOR_KEYS_VOLUME = "onionpress-tor-keys"
+
+
+def cache_path(app_support=None):
+    app_support = app_support or os.path.expanduser("~/.onion.press")
+    return os.path.join(app_support, CACHE_FILENAME)
+
+
+def load(app_support=None):
+    """Return (address, volume_created_at) from the cache, or None"""
+    values = {}
+    try:
+        with open(cache_path(app_support), 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, value = line.split('=', 1)
+                    values[key] = value
+    except OSError:
+        return None
+    address = values.get("ADDRESS", "")
+    if not address.endswith(".onion"):
+        return None
+    return address, values.get("VOLUME_CREATED_AT", "")
+
+
+def save(address, volume_created_at, app_support=None):
+    """Atomically write the cache"""
+    path = cache_path(app_support)
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, 'w') as f:
+            f.write("# Cached onion address - deleted automatically when the key changes\n")
+            f.write(f"ADDRESS={address}\n")
+            f.write(f"VOLUME_CREATED_AT={volume_created_at}\n")
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def invalidate(app_support=None):
+    """Forget the cached address (new key written or tor-keys volume recreated)"""
+    try:
+        os.unlink(cache_path(app_support))
+    except OSError:
+        pass
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+InnoDB buffer pool warmth for onion.press
+MariaDB saves the IDs of its hottest pages when it stops (onion.press also
+asks for a dump before `docker compose down`) and reads them back in the
+background after it starts. This module reads the buffer pool status from
+the db container through the Docker Engine API, so readiness can wait for
+that load to finish and the Diagnostics dialog can show how warm the cache is.
+
+Usage:
+    python3 buffer_pool.py
+"""
+
+import sys
+
+import docker_api
+
+CONTAINER_NAME = "onionpress-db"
+
+# Runs as root with the password from the container's own environment
+SQL_COMMAND = 'MYSQL_PWD="$MYSQL_ROOT_PASSWORD" exec mariadb -uroot -N -B -e "$0"'
+
+
+def run_sql(docker, sql, timeout=5):
+    """Tab-separated rows from the db container, or None when it can't be queried"""
+    try:
+        code, stdout, _ = docker.exec_run(CONTAINER_NAME, ["sh", "-c", SQL_COMMAND, sql], timeout=timeout)
+    except docker_api.DockerAPIError:
+        return None
+    if code != 0:
+        return None
+    return [line.split("\t") for line in stdout.decode("utf-8", errors="replace").splitlines() if line]
+
+
+def read_status(docker, timeout=5):
+    """The Innodb_buffer_pool_* status variables, or None when the database isn't answering"""
+    rows = run_sql(docker, "SHOW GLOBAL STATUS LIKE 'Innodb_buffer_pool%'", timeout=timeout)
+    if rows is None:
+        return None
+    return {row[0]: row[1] if len(row) > 1 else "" for row in rows}
+
+
+def loading(status):
+    """Whether the saved page list is still being read back ("Loading ...", "Loaded 123/456 pages")"""
+    load = (status or {}).get("Innodb_buffer_pool_load_status", "")
+    return load.startswith("Loading") or load.startswith("Loaded ")
+
+
+def describe_load(load):
+    if not load or "not started" in load:
+        return "Warm-up: nothing to load"
+    if load.startswith("Loading") or load.startswith("Loaded "):
+        return f"Warm-up: in progress ({load})"
+    if "completed" in load:
+        return "Warm-up: saved pages loaded" + (f" (at {load.split(' at ', 1)[1]})" if " at " in load else "")
+    if "Cannot open" in load:
+        return "Warm-up: no saved page list yet (saved when the database stops)"
+    return f"Warm-up: {load}"
+
+
+def report_lines(status):
+    """Lines for the Diagnostics dialog"""
+    if status is None:
+        return ["Status unavailable (database not running or still starting)"]
+
+    def number(name):
+        return int(status.get(name) or 0)
+
+    lines = [describe_load(status.get("Innodb_buffer_pool_load_status", ""))]
+
+    data_pages = number("Innodb_buffer_pool_pages_data")
+    total_pages = number("Innodb_buffer_pool_pages_total")
+    if total_pages:
+        lines.append(f"Cached: {number('Innodb_buffer_pool_bytes_data') / (1024 * 1024):.0f} MB "
+                     f"({data_pages * 100.0 / total_pages:.0f}% of the buffer pool)")
+
+    lookups = number("Innodb_buffer_pool_read_requests")
+    disk_reads = number("Innodb_buffer_pool_reads")
+    if lookups:
+        lines.append(f"Served from memory: {(lookups - disk_reads) * 100.0 / lookups:.2f}% "
+                     f"({disk_reads} of {lookups} page reads went to disk)")
+
+    dump = status.get("Innodb_buffer_pool_dump_status", "")
+    if "completed" in dump and " at " in dump:
+        lines.append(f"Hot pages last saved: {dump.split(' at ', 1)[1]}")
+    return lines
+
+
+def main():
+    if len(sys.argv) > 1:
+        print("Usage: buffer_pool.py")
+        sys.exit(1)
+    docker = docker_api.DockerClient()
+    for line in report_lines(read_status(docker)):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
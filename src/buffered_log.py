@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Buffered background logging for onion.press
+Log calls only put the message on a queue; one writer thread batches queued
+messages into a single write, so threads never block on the disk or race on
+the file. Files rotate by size: the full file is renamed to <name>.1 and
+gzipped to <name>.1.gz, older segments shift up, and the oldest are deleted
+once the log and its segments exceed the total size cap.
+
+Optionally every message is also written as a JSON line (ts, component,
+event, duration_ms and any extra fields) to a second file, so tools can
+parse the log without regexes.
+
+The bash scripts append to the same onion.press.log with their own short-lived
+opens; rotation renames the file, so their next write starts the new one.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024         # Rotate the live file at this size
+DEFAULT_MAX_TOTAL_BYTES = 50 * 1024 * 1024  # Live file plus gzipped segments
+QUEUE_LIMIT = 10000                         # Messages buffered before new ones are dropped
+BATCH_SIZE = 512                            # Messages per write
+
+
+class RotatingFile:
+    """Append-only file rotated by size (or daily), old segments gzipped, total size capped"""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, max_total_bytes=DEFAULT_MAX_TOTAL_BYTES, daily=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.daily = daily  # Also start a new file on the first write of each day
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            self._file = os.fdopen(fd, 'a', encoding='utf-8')
+        return self._file
+
+    def write(self, text):
+        """Append text; rotate first if the file (possibly grown by other writers) is full"""
+        try:
+            info = os.stat(self.path)
+            if info.st_size >= self.max_bytes or (
+                    self.daily and info.st_size
+                    and time.localtime(info.st_mtime)[:3] != time.localtime()[:3]):
+                self.rotate()
+        except OSError:
+            pass
+        f = self._open()
+        f.write(text)
+        f.flush()
+
+    def segments(self):
+        """Existing gzipped segments as (index, path), newest first"""
+        directory, name = os.path.split(self.path)
+        found = []
+        try:
+            for entry in os.listdir(directory or "."):
+                if entry.startswith(name + ".") and entry.endswith(".gz"):
+                    index = entry[len(name) + 1:-len(".gz")]
+                    if index.isdigit():
+                        found.append((int(index), os.path.join(directory, entry)))
+        except OSError:
+            pass
+        return sorted(found)
+
+    def rotate(self):
+        """Move the live file to <name>.1.gz and shift older segments up"""
+        import gzip
+        import shutil
+
+        self.close()
+        for index, segment in reversed(self.segments()):
+            try:
+                os.replace(segment, f"{self.path}.{index + 1}.gz")
+            except OSError:
+                pass
+        # Rename first so concurrent appenders (the bash scripts) move to a fresh file
+        staged = f"{self.path}.1"
+        try:
+            os.replace(self.path, staged)
+        except OSError:
+            return
+        try:
+            with open(staged, 'rb') as src, gzip.open(f"{staged}.gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.unlink(staged)
+        except OSError:
+            pass
+        self.enforce_cap()
+
+    def enforce_cap(self):
+        """Delete the oldest segments until everything fits in max_total_bytes"""
+        try:
+            total = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        except OSError:
+            total = 0
+        kept = []
+        full = False
+        for index, segment in self.segments():
+            try:
+                size = os.path.getsize(segment)
+            except OSError:
+                continue
+            full = full or total + size > self.max_total_bytes
+            if full:
+                try:
+                    os.unlink(segment)
+                except OSError:
+                    pass
+            else:
+                total += size
+                kept.append(segment)
+        return kept
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+class BufferedLogger:
+    """Queue-backed logger; one background thread does all file I/O"""
+
+    def __init__(self, path, json_path=None, component="menubar",
+                 max_bytes=DEFAULT_MAX_BYTES, max_total_bytes=DEFAULT_MAX_TOTAL_BYTES):
+        self.component = component
+        self.text_file = RotatingFile(path, max_bytes, max_total_bytes)
+        self.json_file = RotatingFile(json_path, max_bytes, max_total_bytes) if json_path else None
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=QUEUE_LIMIT)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def log(self, message, component=None, duration=None, **fields):
+        """Queue one message; duration is in seconds, extra fields go to the JSON line"""
+        try:
+            self._queue.put_nowait((time.time(), message, component or self.component, duration, fields))
+        except queue.Full:
+            self.dropped += 1
+
+    def enable_json(self, json_path):
+        """Start writing JSON lines to json_path as well"""
+        def enable():
+            if self.json_file is None:
+                self.json_file = RotatingFile(json_path, self.text_file.max_bytes, self.text_file.max_total_bytes)
+        self._queue.put(enable)
+
+    def rotate(self):
+        """Rotate the text log on the writer thread (e.g. at startup, to separate sessions)"""
+        self._queue.put(self.text_file.rotate)
+
+    def flush(self, timeout=2.0):
+        """Block until everything queued so far is on disk"""
+        done = threading.Event()
+        try:
+            self._queue.put(done.set, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        text = []
+        lines = []
+        for item in batch:
+            if callable(item):
+                # Control item (flush marker, rotation): write what came before it first
+                self._emit(text, lines)
+                text, lines = [], []
+                item()
+                continue
+            stamp, message, component, duration, fields = item
+            text.append(f"[{datetime.fromtimestamp(stamp).strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
+            if self.json_file is not None:
+                lines.append(self._json_line(stamp, message, component, duration, fields))
+        if self.dropped:
+            text.append(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
+                        f"WARNING: {self.dropped} log messages dropped (queue full)\n")
+            self.dropped = 0
+        self._emit(text, lines)
+
+    def _emit(self, text, lines):
+        try:
+            if text:
+                self.text_file.write("".join(text))
+            if lines:
+                self.json_file.write("".join(lines))
+        except Exception as e:
+            print(f"Error writing to log: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _json_line(stamp, message, component, duration, fields):
+        import json
+        record = {
+            "ts": datetime.fromtimestamp(stamp).isoformat(timespec="milliseconds"),
+            "component": component,
+            "event": message,
+        }
+        if duration is not None:
+            record["duration_ms"] = round(duration * 1000, 1)
+        record.update(fields)
+        return json.dumps(record, ensure_ascii=False, default=str) + "\n"
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Diagnostics for onion.press
+Probe latency histograms and availability history for the Diagnostics menu.
+
+Every readiness probe duration goes into a fixed-bucket histogram, so memory
+stays constant no matter how long the app runs and percentiles are cheap.
+Availability is recorded as intervals (up / down / stopped) in a small
+fixed-size ring buffer file, ~/.onion.press/uptime.ring, so 24h and 7d
+uptime survive app restarts without the file ever growing.
+"""
+
+import os
+import struct
+import sys
+import threading
+import time
+
+# Histogram bucket upper bounds in milliseconds; one overflow bucket follows
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+STATE_STOPPED = 0  # Containers not running (user stopped the service or app was quit)
+STATE_DOWN = 1     # Running but not ready
+STATE_UP = 2       # WordPress and the onion service both verified
+STATE_NAMES = {STATE_STOPPED: "stopped", STATE_DOWN: "down", STATE_UP: "up"}
+
+UPTIME_FILENAME = "uptime.ring"
+UPTIME_CAPACITY = 4096  # Intervals kept (~37 KB)
+
+# A gap longer than this between observations starts a new interval
+# (the app wasn't running, so nothing is known about that time)
+MAX_OBSERVATION_GAP = 900
+
+_HEADER = struct.Struct("<4sII")  # magic, capacity, index of the newest record
+_RECORD = struct.Struct("<IIB")   # start, end (epoch seconds), state
+_MAGIC = b"OPUP"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += 1
+
+    def percentile(self, p):
+        """Upper bound in ms of the bucket holding the p-th percentile (None if beyond the last bucket)"""
+        if not self.total:
+            return None
+        target = p / 100.0 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return self.buckets[i] if i < len(self.buckets) else None
+        return None
+
+    def format_percentile(self, p):
+        value = self.percentile(p)
+        if value is None:
+            return f">{self.buckets[-1] // 1000}s"
+        return f"≤{value}ms" if value < 1000 else f"≤{value / 1000:g}s"
+
+
+class ProbeStats:
+    """One latency histogram per readiness probe"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+
+    def record_result(self, result):
+        """Record every probe that actually ran in a ReadinessResult"""
+        with self._lock:
+            for probe in result.probes.values():
+                if probe.skipped:
+                    continue
+                histogram = self.histograms.setdefault(probe.name, LatencyHistogram())
+                histogram.record(probe.duration)
+
+    def report_lines(self):
+        with self._lock:
+            lines = []
+            for name, histogram in sorted(self.histograms.items()):
+                lines.append(f"{name}: p50 {histogram.format_percentile(50)}, "
+                             f"p95 {histogram.format_percentile(95)}, "
+                             f"p99 {histogram.format_percentile(99)} "
+                             f"({histogram.total} samples)")
+            return lines
+
+
+class UptimeLog:
+    """Availability intervals in a fixed-size on-disk ring buffer"""
+
+    def __init__(self, path=None, capacity=UPTIME_CAPACITY):
+        self.path = path or os.path.join(os.path.expanduser("~/.onion.press"), UPTIME_FILENAME)
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._newest = None  # Index of the newest record, None if empty
+        self._current = None  # (start, end, state) of the newest record
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                magic, capacity, newest = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or capacity != self.capacity or newest >= capacity:
+                    raise ValueError("incompatible uptime ring")
+                f.seek(_HEADER.size + newest * _RECORD.size)
+                record = _RECORD.unpack(f.read(_RECORD.size))
+        except (OSError, ValueError, struct.error):
+            return
+        if record[0]:
+            self._newest = newest
+            self._current = record
+
+    def _write(self, index, record):
+        """Write one record and the header in place"""
+        mode = 'r+b' if os.path.exists(self.path) else 'w+b'
+        with open(self.path, mode) as f:
+            if mode == 'w+b':
+                f.truncate(_HEADER.size + self.capacity * _RECORD.size)
+            f.seek(_HEADER.size + index * _RECORD.size)
+            f.write(_RECORD.pack(*record))
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, self.capacity, index))
+
+    def observe(self, state, now=None):
+        """Record that the service was in state at time now"""
+        now = int(now or time.time())
+        with self._lock:
+            current = self._current
+            if current and current[2] == state and now - current[1] <= MAX_OBSERVATION_GAP:
+                # Same state: extend the newest interval in place
+                index, record = self._newest, (current[0], now, state)
+            else:
+                # State changed: close the previous interval at this observation
+                if current and now - current[1] <= MAX_OBSERVATION_GAP and now != current[1]:
+                    try:
+                        self._write(self._newest, (current[0], now, current[2]))
+                    except OSError:
+                        pass
+                index = 0 if self._newest is None else (self._newest + 1) % self.capacity
+                record = (now, now, state)
+            try:
+                self._write(index, record)
+            except OSError:
+                return
+            self._newest, self._current = index, record
+
+    def intervals(self):
+        """All stored intervals, oldest first"""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return []
+        records = []
+        for offset in range(_HEADER.size, len(data) - _RECORD.size + 1, _RECORD.size):
+            record = _RECORD.unpack_from(data, offset)
+            if record[0]:
+                records.append(record)
+        records.sort()
+        return records
+
+    def uptime(self, window, now=None):
+        """Return (uptime fraction or None, seconds observed, seconds stopped) over the last window seconds
+
+        Time while the service was stopped or the app wasn't running doesn't count against uptime.
+        """
+        now = now or time.time()
+        since = now - window
+        up = down = stopped = 0
+        for start, end, state in self.intervals():
+            overlap = min(end, now) - max(start, since)
+            if overlap <= 0:
+                continue
+            if state == STATE_UP:
+                up += overlap
+            elif state == STATE_DOWN:
+                down += overlap
+            else:
+                stopped += overlap
+        observed = up + down
+        return (up / observed if observed else None), observed, stopped
+
+    def format_uptime(self, window, now=None):
+        fraction, observed, _ = self.uptime(window, now)
+        if fraction is None:
+            return "no data"
+        return f"{fraction * 100:.2f}% of {observed / 3600:.1f}h observed"
+
+
+def main():
+    """Print the uptime history (python3 diagnostics.py [uptime|intervals])"""
+    command = sys.argv[1] if len(sys.argv) > 1 else "uptime"
+    log = UptimeLog()
+    if command == "intervals":
+        for start, end, state in log.intervals():
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start))}  "
+                  f"{end - start:>7}s  {STATE_NAMES.get(state, state)}")
+    elif command == "uptime":
+        print(f"24h: {log.format_uptime(86400)}")
+        print(f"7d:  {log.format_uptime(7 * 86400)}")
+    else:
+        print("Usage: diagnostics.py [uptime|intervals]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+Docker Engine API client for onion.press
+Talks HTTP/1.1 directly over the Colima Unix socket so the menubar app can
+query containers without forking bash, docker, docker compose or jq.
+
+http.client/urllib are deliberately excluded from the py2app bundle (see
+setup.py), so this module speaks just enough HTTP/1.1 on a raw socket:
+Content-Length and chunked bodies, keep-alive connection reuse, and the
+multiplexed stdout/stderr framing Docker uses for logs and exec output.
+"""
+
+import io
+import json
+import os
+import socket
+import struct
+import tarfile
+import threading
+import time
+
+# Container names from docker-compose.yml
+CONTAINER_NAMES = ("onionpress-tor", "onionpress-wordpress", "onionpress-db")
+
+# Containers of the optional compose overrides (cache proxy, object cache, PHP-FPM front)
+OPTIONAL_CONTAINER_NAMES = ("onionpress-cache", "onionpress-redis", "onionpress-web")
+
+HOSTNAME_PATH = "/var/lib/tor/hidden_service/wordpress/hostname"
+
+# Safe to send again when the connection drops after the request was written
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+
+
+class DockerAPIError(Exception):
+    """Raised when the Docker daemon returns an error or cannot be reached"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def _quote(value):
+    """Percent-encode a query string value (urllib is excluded from the bundle)"""
+    safe = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_.~"
+    return "".join(chr(b) if b in safe else f"%{b:02X}" for b in str(value).encode("utf-8"))
+
+
+def default_socket_path():
+    """Return the Docker socket path from DOCKER_HOST or the bundled Colima default"""
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):]
+    colima_home = os.environ.get("COLIMA_HOME", os.path.expanduser("~/.onion.press/colima"))
+    return os.path.join(colima_home, "default", "docker.sock")
+
+
+class _Response:
+    """A parsed HTTP response whose body is read lazily from the socket"""
+
+    def __init__(self, conn, status, headers):
+        self.conn = conn
+        self.status = status
+        self.headers = headers
+        self._chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+        length = headers.get("content-length")
+        self._remaining = int(length) if length is not None else None
+        self._chunk_left = 0
+        self._done = False
+        # Keep-alive is only possible when the body length is known
+        self.reusable = (
+            headers.get("connection", "").lower() != "close"
+            and (self._chunked or self._remaining is not None)
+        )
+
+    def read_chunk(self, size=65536):
+        """Return the next piece of body, or b'' at end of body"""
+        if self._done:
+            return b""
+        if self._chunked:
+            if self._chunk_left == 0:
+                line = self.conn.readline()
+                if not line:
+                    self._done = True
+                    return b""
+                self._chunk_left = int(line.split(b";", 1)[0].strip() or b"0", 16)
+                if self._chunk_left == 0:
+                    # Consume trailers up to the blank line
+                    while self.conn.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    self._done = True
+                    return b""
+            data = self.conn.read(min(size, self._chunk_left))
+            self._chunk_left -= len(data)
+            if self._chunk_left == 0:
+                self.conn.readline()  # CRLF after chunk data
+            if not data:
+                self._done = True
+            return data
+        if self._remaining is not None:
+            if self._remaining == 0:
+                self._done = True
+                return b""
+            data = self.conn.read(min(size, self._remaining))
+            self._remaining -= len(data)
+            if not data:
+                self._done = True
+            return data
+        # No framing: body runs until the daemon closes the connection
+        data = self.conn.read(size, partial=True)
+        if not data:
+            self._done = True
+        return data
+
+    def read(self):
+        """Read the rest of the body"""
+        parts = []
+        while True:
+            data = self.read_chunk()
+            if not data:
+                break
+            parts.append(data)
+        return b"".join(parts)
+
+    def iter_lines(self):
+        """Yield newline-terminated lines from a streaming body"""
+        pending = b""
+        while True:
+            data = self.read_chunk()
+            if not data:
+                break
+            pending += data
+            while b"\n" in pending:
+                line, pending = pending.split(b"\n", 1)
+                yield line
+        if pending:
+            yield pending
+
+    def json(self):
+        body = self.read()
+        return json.loads(body) if body else None
+
+
+class _Connection:
+    """One Unix socket connection with a small read buffer"""
+
+    def __init__(self, socket_path, timeout):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self._buf = b""
+
+    def settimeout(self, timeout):
+        self.sock.settimeout(timeout)
+
+    def send(self, data):
+        self.sock.sendall(data)
+
+    def _fill(self):
+        data = self.sock.recv(65536)
+        self._buf += data
+        return bool(data)
+
+    def readline(self):
+        while b"\n" not in self._buf:
+            if not self._fill():
+                line, self._buf = self._buf, b""
+                return line
+        line, self._buf = self._buf.split(b"\n", 1)
+        return line + b"\n"
+
+    def read(self, size, partial=False):
+        """Read exactly size bytes (or fewer at EOF); partial returns what is available"""
+        if partial:
+            if not self._buf:
+                self._fill()
+            data, self._buf = self._buf[:size], self._buf[size:]
+            return data
+        while len(self._buf) < size:
+            if not self._fill():
+                break
+        data, self._buf = self._buf[:size], self._buf[size:]
+        return data
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def demux_stream(data):
+    """Split Docker's multiplexed stream framing into (stdout, stderr) bytes
+
+    Each frame is an 8-byte header [stream, 0, 0, 0, size(uint32 BE)] followed
+    by size bytes. Data without framing (TTY containers) is returned as stdout.
+    """
+    stdout, stderr = [], []
+    offset = 0
+    while offset + 8 <= len(data):
+        stream_type = data[offset]
+        if stream_type not in (0, 1, 2) or data[offset + 1:offset + 4] != b"\x00\x00\x00":
+            return data, b""
+        size = struct.unpack(">I", data[offset + 4:offset + 8])[0]
+        payload = data[offset + 8:offset + 8 + size]
+        (stderr if stream_type == 2 else stdout).append(payload)
+        offset += 8 + size
+    return b"".join(stdout), b"".join(stderr)
+
+
+def iter_demuxed(response):
+    """Yield (stream_type, payload) frames from a multiplexed streaming response"""
+    pending = b""
+    while True:
+        data = response.read_chunk()
+        if not data:
+            break
+        pending += data
+        while len(pending) >= 8:
+            size = struct.unpack(">I", pending[4:8])[0]
+            if len(pending) < 8 + size:
+                break
+            yield pending[0], pending[8:8 + size]
+            pending = pending[8 + size:]
+
+
+class DockerClient:
+    """Pooled HTTP-over-Unix-socket client for the Docker Engine API"""
+
+    def __init__(self, socket_path=None, timeout=10, pool_size=4):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._pool = []
+        self._pool_lock = threading.Lock()
+
+    # -- connection handling --------------------------------------------
+
+    def available(self):
+        """Return True if the socket exists and the daemon answers /_ping"""
+        if not os.path.exists(self.socket_path):
+            return False
+        try:
+            return self.ping()
+        except (DockerAPIError, OSError):
+            return False
+
+    def _acquire(self, timeout, pooled=True):
+        conn = None
+        if pooled:
+            with self._pool_lock:
+                conn = self._pool.pop() if self._pool else None
+        if conn is None:
+            try:
+                conn = _Connection(self.socket_path, timeout)
+            except OSError as e:
+                raise DockerAPIError(f"Cannot connect to Docker socket {self.socket_path}: {e}")
+        else:
+            conn.settimeout(timeout)
+        return conn
+
+    def _release(self, conn, response):
+        if response.reusable and response._done:
+            with self._pool_lock:
+                if len(self._pool) < self.pool_size:
+                    self._pool.append(conn)
+                    return
+        conn.close()
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for conn in pool:
+            conn.close()
+
+    def _write_request(self, conn, method, path, params, body, headers):
+        if params:
+            query = "&".join(
+                f"{_quote(k)}={_quote(v)}" for k, v in params.items() if v is not None
+            )
+            if query:
+                path = f"{path}?{query}"
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+            headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        body = body or b""
+        lines = [f"{method} {path} HTTP/1.1", "Host: docker"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if body or method in ("POST", "PUT"):
+            lines.append(f"Content-Length: {len(body)}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+        conn.send(request)
+
+    def _read_response(self, conn):
+        status_line = conn.readline()
+        if not status_line:
+            raise ConnectionResetError("Docker daemon closed the connection")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        status = int(parts[1])
+        response_headers = {}
+        while True:
+            line = conn.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        return _Response(conn, status, response_headers)
+
+    def _open(self, method, path, params=None, body=None, headers=None, timeout=None):
+        """Send a request and return (connection, response) with the body unread"""
+        timeout = self.timeout if timeout is None else timeout
+        # Anything that isn't safe to resend goes out on a fresh connection,
+        # so an idle pooled one the daemon already closed can't swallow it
+        conn = self._acquire(timeout, pooled=method in IDEMPOTENT_METHODS)
+        written = False
+        try:
+            self._write_request(conn, method, path, params, body, headers)
+            written = True
+            response = self._read_response(conn)
+        except (ConnectionResetError, BrokenPipeError, ValueError, IndexError) as e:
+            conn.close()
+            if written and method not in IDEMPOTENT_METHODS:
+                # The daemon may already have acted on it (exec start, pull...)
+                raise DockerAPIError(f"{method} {path} failed: {e}")
+            # Stale pooled connection - retry once on a fresh one
+            try:
+                conn = _Connection(self.socket_path, timeout)
+                self._write_request(conn, method, path, params, body, headers)
+                response = self._read_response(conn)
+            except (OSError, ValueError, IndexError) as e:
+                conn.close()
+                raise DockerAPIError(f"{method} {path} failed: {e}")
+        except OSError as e:
+            conn.close()
+            raise DockerAPIError(f"{method} {path} failed: {e}")
+        if response.status >= 400:
+            try:
+                message = (response.json() or {}).get("message", "")
+            except (ValueError, OSError):
+                message = ""
+            self._release(conn, response)
+            raise DockerAPIError(f"{method} {path}: HTTP {response.status} {message}".strip(),
+                                 status=response.status)
+        return conn, response
+
+    def request(self, method, path, params=None, body=None, headers=None, timeout=None):
+        """Perform a request and return the decoded JSON body (or raw bytes)"""
+        conn, response = self._open(method, path, params, body, headers, timeout)
+        try:
+            data = response.read()
+        except OSError as e:
+            conn.close()
+            raise DockerAPIError(f"{method} {path} failed reading body: {e}")
+        self._release(conn, response)
+        if response.headers.get("content-type", "").startswith("application/json"):
+            return json.loads(data) if data else None
+        return data
+
+    def stream(self, method, path, params=None, body=None, headers=None, timeout=None):
+        """Open a streaming request; caller must close() the returned response's connection"""
+        conn, response = self._open(method, path, params, body, headers, timeout)
+        return response
+
+    # -- endpoints ------------------------------------------------------
+
+    def ping(self):
+        return self.request("GET", "/_ping", timeout=3) == b"OK"
+
+    def containers(self, all=False, names=CONTAINER_NAMES):
+        """List containers, optionally restricted to the given names"""
+        params = {"all": "1" if all else "0"}
+        if names:
+            params["filters"] = json.dumps({"name": [f"^/{n}$" for n in names]})
+        return self.request("GET", "/containers/json", params=params) or []
+
+    def inspect_container(self, name):
+        return self.request("GET", f"/containers/{name}/json")
+
+    def images(self):
+        """List local images"""
+        return self.request("GET", "/images/json") or []
+
+    def inspect_image(self, image):
+        return self.request("GET", f"/images/{image}/json")
+
+    def stats(self, container):
+        """One stats sample (the daemon fills precpu_stats, so this takes about a second)"""
+        return self.request("GET", f"/containers/{container}/stats", params={"stream": "0"}, timeout=15)
+
+    def inspect_volume(self, name):
+        return self.request("GET", f"/volumes/{name}")
+
+    def exec_run(self, container, cmd, timeout=10):
+        """Run a command in a container and return (exit_code, stdout, stderr)"""
+        created = self.request("POST", f"/containers/{container}/exec", body={
+            "Cmd": list(cmd),
+            "AttachStdout": True,
+            "AttachStderr": True,
+        })
+        exec_id = created["Id"]
+        response = self.stream("POST", f"/exec/{exec_id}/start",
+                               body={"Detach": False, "Tty": False}, timeout=timeout)
+        try:
+            raw = response.read()
+        except OSError as e:
+            raise DockerAPIError(f"exec {cmd[0]} in {container} failed: {e}")
+        finally:
+            response.conn.close()
+        stdout, stderr = demux_stream(raw)
+        info = self.request("GET", f"/exec/{exec_id}/json")
+        return info.get("ExitCode"), stdout, stderr
+
+    def logs(self, container, tail=None, since=None, timestamps=False, stdout=True, stderr=True, timeout=None):
+        """Return (stdout, stderr) log bytes for a container"""
+        params = {
+            "stdout": "1" if stdout else "0",
+            "stderr": "1" if stderr else "0",
+            "timestamps": "1" if timestamps else "0",
+            "tail": tail if tail is not None else "all",
+            "since": since,
+        }
+        raw = self.request("GET", f"/containers/{container}/logs", params=params, timeout=timeout)
+        return demux_stream(raw)
+
+    def follow_logs(self, container, tail=None, since=None, timestamps=False):
+        """Return an iterator of (stream_type, payload) frames as the container writes them
+
+        Like events(), the request is made before returning.
+        """
+        params = {
+            "stdout": "1",
+            "stderr": "1",
+            "follow": "1",
+            "timestamps": "1" if timestamps else "0",
+            "tail": tail if tail is not None else "all",
+            "since": since,
+        }
+        response = self.stream("GET", f"/containers/{container}/logs", params=params, timeout=None)
+
+        def iterate():
+            try:
+                for frame in iter_demuxed(response):
+                    yield frame
+            finally:
+                response.conn.close()
+
+        return iterate()
+
+    def events(self, filters=None, since=None):
+        """Subscribe to the /events stream and return an iterator of event dicts
+
+        The HTTP request is made before returning, so connection errors raise
+        here rather than on first iteration. The iterator ends when the daemon
+        closes the stream (e.g. Colima stopped).
+        """
+        params = {
+            "filters": json.dumps(filters) if filters else None,
+            "since": since,
+        }
+        response = self.stream("GET", "/events", params=params, timeout=None)
+
+        def iterate():
+            try:
+                for line in response.iter_lines():
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+            finally:
+                response.conn.close()
+
+        return iterate()
+
+    def pull_image(self, image, platform=None):
+        """Pull an image and return an iterator of progress dicts from /images/create
+
+        Each item is one JSON message from the daemon, e.g.
+        {"status": "Downloading", "id": "<layer>", "progressDetail": {"current": n, "total": m}}.
+        Pull failures arrive as {"error": "..."} messages. Like events(), the
+        request is made before returning.
+        """
+        name, _, tag = image.rpartition(":")
+        if not name or "/" in tag:
+            name, tag = image, "latest"
+        params = {"fromImage": name, "tag": tag, "platform": platform}
+        # Generous read timeout: layer extraction can be silent for a while
+        response = self.stream("POST", "/images/create", params=params, timeout=300)
+
+        def iterate():
+            try:
+                for line in response.iter_lines():
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+            finally:
+                response.conn.close()
+
+        return iterate()
+
+    def get_archive(self, container, path, timeout=None):
+        """Return the tar archive bytes for a path inside a container"""
+        return self.request("GET", f"/containers/{container}/archive", params={"path": path},
+                            timeout=timeout)
+
+    def read_file(self, container, path, timeout=None):
+        """Read a single file from a container via the archive endpoint"""
+        data = self.get_archive(container, path, timeout=timeout)
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            member = tar.next()
+            if member is None or not member.isfile():
+                raise DockerAPIError(f"{path} in {container} is not a regular file")
+            return tar.extractfile(member).read()
+
+    def put_archive(self, container, path, tar_bytes):
+        """Extract a tar archive into a directory inside a container"""
+        self.request("PUT", f"/containers/{container}/archive", params={"path": path},
+                     body=tar_bytes, headers={"Content-Type": "application/x-tar"})
+
+
+def benchmark(cycles=5, launcher_script=None, bin_dir=None):
+    """Compare one status cycle via subprocesses against the in-process API client
+
+    The subprocess path mirrors what OnionPressApp.check_status did before this
+    client existed: `onion.press status`, `onion.press address`, then docker
+    exec/logs/exec for the Tor checks. Spawn counts only include processes this
+    interpreter forks directly; bash, compose and jq children come on top.
+    """
+    import subprocess
+
+    spawns = [0]
+    original_popen_init = subprocess.Popen.__init__
+
+    def counting_init(self, *args, **kwargs):
+        spawns[0] += 1
+        original_popen_init(self, *args, **kwargs)
+
+    docker_bin = os.path.join(bin_dir, "docker") if bin_dir else "docker"
+
+    def subprocess_cycle():
+        if launcher_script:
+            subprocess.run([launcher_script, "status"], capture_output=True, timeout=60)
+            subprocess.run([launcher_script, "address"], capture_output=True, timeout=60)
+        subprocess.run([docker_bin, "exec", "onionpress-tor", "cat", HOSTNAME_PATH],
+                       capture_output=True, timeout=5)
+        subprocess.run([docker_bin, "logs", "--tail", "100", "onionpress-tor"],
+                       capture_output=True, timeout=5)
+        subprocess.run([docker_bin, "exec", "onionpress-tor", "wget", "-q", "-O", "/dev/null",
+                        "--timeout=5", "http://wordpress:80/"], capture_output=True, timeout=10)
+
+    client = DockerClient()
+
+    def api_cycle():
+        client.containers()
+        client.read_file("onionpress-tor", HOSTNAME_PATH)
+        client.logs("onionpress-tor", tail=100)
+        client.exec_run("onionpress-tor", ["wget", "-q", "-O", "/dev/null", "--timeout=5",
+                                           "http://wordpress:80/"])
+
+    results = {}
+    subprocess.Popen.__init__ = counting_init
+    try:
+        for label, cycle in (("subprocess", subprocess_cycle), ("api", api_cycle)):
+            spawns[0] = 0
+            timings = []
+            for _ in range(cycles):
+                start = time.perf_counter()
+                try:
+                    cycle()
+                except (DockerAPIError, OSError, subprocess.SubprocessError) as e:
+                    print(f"{label}: cycle failed: {e}")
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            results[label] = {
+                "spawns_per_cycle": spawns[0] / cycles,
+                "median_ms": timings[len(timings) // 2] * 1000,
+                "max_ms": timings[-1] * 1000,
+            }
+    finally:
+        subprocess.Popen.__init__ = original_popen_init
+        client.close()
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+        here = os.path.dirname(os.path.realpath(__file__))
+        launcher = os.path.join(here, "..", "Onion.Press.app", "Contents", "MacOS", "onion.press")
+        bin_dir = os.path.join(here, "..", "Onion.Press.app", "Contents", "Resources", "bin")
+        results = benchmark(
+            cycles,
+            launcher_script=launcher if os.path.exists(launcher) else None,
+            bin_dir=bin_dir if os.path.isdir(bin_dir) else None,
+        )
+        print(f"Status cycle over {cycles} runs:")
+        for label, r in results.items():
+            print(f"  {label:<10} {r['spawns_per_cycle']:>4.1f} spawns/cycle  "
+                  f"median {r['median_ms']:>7.1f} ms  max {r['max_ms']:>7.1f} ms")
+    elif len(sys.argv) > 1 and sys.argv[1] == 'ps':
+        for c in DockerClient().containers(all=True):
+            print(f"{c['Names'][0].lstrip('/'):<24} {c['State']:<10} {c['Status']}")
+    else:
+        print("Usage: docker_api.py {ps|bench [cycles]}")
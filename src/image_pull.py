@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Parallel image pulls for onion.press
+Pulls the images of the active compose files (the base stack plus the
+optional services and stack variant the launcher selected) concurrently
+through the Docker Engine API (/images/create) and aggregates the per-layer
+progress messages into one running total with a transfer rate and ETA, for
+the launch splash.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import docker_api
+import vm_sizing
+
+# Seconds of samples used for the transfer rate
+RATE_WINDOW = 10
+
+# Layer phases after which all of the layer's bytes are on disk
+_LAYER_DONE = ("Download complete", "Verifying Checksum", "Extracting", "Pull complete")
+
+
+def compose_images(compose_files):
+    """(image, platform) for every service in the compose files, later files overriding earlier ones
+
+    Reads the flat layout the bundled files use (service names indented two
+    spaces under services:, their keys four) line by line; PyYAML isn't bundled.
+    """
+    services = {}
+    for path in compose_files:
+        try:
+            with open(path, 'r') as f:
+                lines = f.readlines()
+        except OSError:
+            continue
+        section = service = None
+        for line in lines:
+            line = line.rstrip()
+            text = line.lstrip()
+            if not text or text.startswith("#"):
+                continue
+            indent = len(line) - len(text)
+            if indent == 0:
+                section, service = text.rstrip(":"), None
+            elif section == "services" and indent == 2 and text.endswith(":"):
+                service = services.setdefault(text[:-1], {})
+            elif service is not None and indent == 4:
+                key, _, value = text.partition(":")
+                if key in ("image", "platform"):
+                    service[key] = value.split(" #", 1)[0].strip().strip("'\"")
+    images = []
+    for entry in services.values():
+        image = (entry.get("image"), entry.get("platform"))
+        if image[0] and image not in images:
+            images.append(image)
+    return images
+
+
+def active_compose_files(data_dir, docker_dir=None):
+    """The compose files the launcher selected (COMPOSE_FILE in compose-env)
+
+    With docker_dir, the files are looked up there by name (the app may have
+    moved since the launcher wrote compose-env), falling back to the base file.
+    """
+    selected = vm_sizing.read_key_values(os.path.join(data_dir, "compose-env")).get("COMPOSE_FILE", "")
+    files = [path for path in selected.split(":") if path]
+    if docker_dir is None:
+        return [path for path in files if os.path.exists(path)]
+    files = [os.path.join(docker_dir, os.path.basename(path)) for path in files]
+    files = [path for path in files if os.path.exists(path)]
+    return files or [os.path.join(docker_dir, "docker-compose.yml")]
+
+
+def active_images(data_dir, docker_dir=None):
+    """(image, platform) pairs the running configuration uses"""
+    return compose_images(active_compose_files(data_dir, docker_dir))
+
+
+def bundled_images(bundle_dir):
+    """Images shipped in the app bundle (Resources/images/manifest.txt) with their archive present
+
+    Manifest lines are "<image> <platform> <archive> <image id>"; the launcher
+    loads these on first run instead of downloading them.
+    """
+    bundled = set()
+    try:
+        with open(os.path.join(bundle_dir, "manifest.txt"), 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 4 and not line.startswith('#') \
+                        and os.path.exists(os.path.join(bundle_dir, parts[2])):
+                    bundled.add(parts[0])
+    except OSError:
+        pass
+    return bundled
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1000 or unit == "GB":
+            return f"{count:.0f} {unit}" if unit in ("B", "KB") else f"{count:.1f} {unit}"
+        count /= 1000.0
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    return f"{seconds // 60}m {seconds % 60:02d}s"
+
+
+class PullProgress:
+    """Aggregate of layer progress across concurrent pulls"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.layers = {}        # layer id -> [current bytes, total bytes or None, done]
+        self.images_done = {}   # image -> True (pulled), False (failed)
+        self.updated = set()    # images for which a newer version was downloaded
+        self._samples = deque()  # (time, downloaded bytes)
+        self.started_at = time.monotonic()
+
+    def feed(self, image, message):
+        """Apply one /images/create progress message"""
+        status = message.get("status", "")
+        layer = message.get("id")
+        detail = message.get("progressDetail") or {}
+        with self._lock:
+            if status.startswith("Status: Downloaded newer image"):
+                self.updated.add(image)
+            if not layer or layer == image.rpartition(":")[2]:
+                return
+            entry = self.layers.setdefault(layer, [0, None, False])
+            if status == "Already exists":
+                # Shared with an image we already have; nothing to download
+                entry[:] = [0, 0, True]
+            elif status == "Downloading":
+                entry[0] = detail.get("current", entry[0])
+                if detail.get("total"):
+                    entry[1] = detail["total"]
+            elif status in _LAYER_DONE and not entry[2]:
+                if entry[1]:
+                    entry[0] = entry[1]
+                entry[2] = True
+
+    def finish(self, image, ok):
+        with self._lock:
+            self.images_done[image] = ok
+
+    def snapshot(self):
+        """Return (downloaded bytes, known total bytes, bytes/sec, eta seconds or None)"""
+        now = time.monotonic()
+        with self._lock:
+            downloaded = sum(entry[0] for entry in self.layers.values())
+            total = sum(entry[1] or entry[0] for entry in self.layers.values())
+            samples = self._samples
+            samples.append((now, downloaded))
+            while len(samples) > 2 and now - samples[0][0] > RATE_WINDOW:
+                samples.popleft()
+            elapsed = samples[-1][0] - samples[0][0]
+            rate = (samples[-1][1] - samples[0][1]) / elapsed if elapsed > 0 else 0.0
+        eta = (total - downloaded) / rate if rate > 0 and total > downloaded else None
+        return downloaded, total, rate, eta
+
+    def describe(self):
+        """One-line progress summary for the splash"""
+        downloaded, total, rate, eta = self.snapshot()
+        if not total:
+            return "Preparing image downloads..."
+        text = f"Downloading {format_bytes(downloaded)} of {format_bytes(total)}"
+        if rate > 0:
+            text += f" · {format_bytes(rate)}/s"
+        if eta is not None:
+            text += f" · ~{format_duration(eta)} left"
+        return text
+
+
+def pull_images(docker, images, on_progress=None, log=None, interval=1.0):
+    """Pull (image, platform) pairs concurrently; return the PullProgress once all pulls finish
+
+    on_progress(progress) is called about every interval seconds while pulling.
+    Raises DockerAPIError (status None) if the daemon can't be reached at all.
+    """
+    log = log or (lambda message: None)
+    progress = PullProgress()
+    done = threading.Event()
+
+    # An unreachable daemon fails fast here; each pull then opens its own stream,
+    # so a failed request can't leave the other streams open
+    docker.ping()
+
+    def pull(image, platform):
+        ok = True
+        try:
+            for message in docker.pull_image(image, platform=platform):
+                if message.get("error"):
+                    log(f"✗ Pull failed for {image}: {message['error']}")
+                    ok = False
+                else:
+                    progress.feed(image, message)
+        except (docker_api.DockerAPIError, OSError, ValueError) as e:
+            log(f"✗ Pull failed for {image}: {e}")
+            ok = False
+        progress.finish(image, ok)
+        if ok:
+            log(f"Image downloaded: {image}")
+
+    threads = [threading.Thread(target=pull, args=image, daemon=True) for image in images]
+    for thread in threads:
+        thread.start()
+
+    def report():
+        while not done.wait(interval):
+            if on_progress:
+                on_progress(progress)
+
+    reporter = threading.Thread(target=report, daemon=True)
+    reporter.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    reporter.join()
+    if on_progress:
+        on_progress(progress)
+    return progress
+
+
+def main():
+    """Pull the active compose files' images with a progress line (python3 image_pull.py [socket])"""
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else None
+    images = active_images(os.path.expanduser("~/.onion.press"))
+    if not images:
+        print("No compose files recorded in ~/.onion.press/compose-env (start onion.press once)")
+        sys.exit(1)
+    docker = docker_api.DockerClient(socket_path=socket_path)
+    started = time.monotonic()
+    progress = pull_images(
+        docker,
+        images,
+        on_progress=lambda p: print(f"\r{p.describe():<72}", end="", flush=True),
+        log=lambda message: print(f"\n{message}"),
+    )
+    downloaded, _, _, _ = progress.snapshot()
+    print(f"\nPulled {format_bytes(downloaded)} in {format_duration(time.monotonic() - started)}")
+    sys.exit(0 if all(progress.images_done.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
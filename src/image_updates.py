@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Digest-based image update check for onion.press
+Asks the registry for each image's manifest digest with a conditional HEAD
+request (If-None-Match: the digest we already have) and only reports images
+whose digest changed, so an update check costs a few small requests instead
+of three full pulls.
+
+Known digests are kept in ~/.onion.press/image-digests, shared with the bash
+launcher's update_images:
+
+    # image digest checked_at
+    wordpress:6.7 sha256:... 1760000000
+
+The registry defaults to Docker Hub; IMAGE_REGISTRY_URL in the config points
+the check at another registry (e.g. a local registry:2 for testing).
+HTTP goes through curl like the rest of the app (no "local network" prompt).
+
+Usage:
+    python3 image_updates.py check [--registry URL]
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+import docker_api
+import image_pull
+
+DEFAULT_REGISTRY_URL = "https://registry-1.docker.io"
+DIGEST_CACHE_FILENAME = "image-digests"
+
+# A check younger than this is trusted without asking the registry again
+# (the menubar and the launcher both check on launch)
+CACHE_FRESH_SECONDS = 600
+
+MANIFEST_ACCEPT = ", ".join([
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+])
+
+# Per-image outcomes of a check
+CURRENT = "current"   # Digest unchanged
+CHANGED = "changed"   # Registry has a different digest - pull it
+UNKNOWN = "unknown"   # Registry unreachable or unexpected response
+
+
+class DigestCache:
+    """Image -> (digest, checked_at) persisted as a small text file"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.path.expanduser("~/.onion.press"), DIGEST_CACHE_FILENAME)
+        self._lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 3 and not line.startswith('#'):
+                        try:
+                            self.entries[parts[0]] = (parts[1], int(parts[2]))
+                        except ValueError:
+                            pass
+        except OSError:
+            pass
+
+    def get(self, image):
+        return self.entries.get(image, (None, 0))
+
+    def set(self, image, digest, checked_at=None):
+        with self._lock:
+            self.entries[image] = (digest, int(checked_at or time.time()))
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, 'w') as f:
+                    f.write("# image digest checked_at\n")
+                    for name, (value, stamp) in sorted(self.entries.items()):
+                        f.write(f"{name} {value} {stamp}\n")
+                os.replace(temp_path, self.path)
+            except OSError:
+                pass
+
+
+def manifest_url(image, registry_url=DEFAULT_REGISTRY_URL):
+    name, _, tag = image.rpartition(":")
+    if not name or "/" in tag:
+        name, tag = image, "latest"
+    if "/" not in name:
+        name = f"library/{name}"  # Docker Hub official images
+    return f"{registry_url.rstrip('/')}/v2/{name}/manifests/{tag}"
+
+
+def _curl_head(url, headers, timeout):
+    """Return (status, lowercase header dict) for a HEAD request"""
+    cmd = ["curl", "-s", "-I", "--max-time", str(timeout)]
+    for header in headers:
+        cmd += ["-H", header]
+    result = subprocess.run(cmd + [url], capture_output=True, text=True,
+                            encoding='utf-8', errors='replace', timeout=timeout + 5)
+    lines = result.stdout.replace("\r", "").split("\n")
+    if result.returncode != 0 or not lines or not lines[0].startswith("HTTP/"):
+        return None, {}
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    return status, headers
+
+
+def _bearer_token(challenge, timeout):
+    """Fetch an anonymous pull token for a 'Bearer realm=...' challenge"""
+    fields = dict(re.findall(r'(\w+)="([^"]*)"', challenge))
+    realm = fields.pop("realm", None)
+    if not realm:
+        return None
+    query = "&".join(f"{key}={value}" for key, value in fields.items())
+    result = subprocess.run(["curl", "-s", "--max-time", str(timeout), f"{realm}?{query}"],
+                            capture_output=True, text=True, encoding='utf-8', errors='replace',
+                            timeout=timeout + 5)
+    match = re.search(r'"(?:token|access_token)"\s*:\s*"([^"]+)"', result.stdout)
+    return match.group(1) if match else None
+
+
+def remote_digest(image, known_digest=None, registry_url=DEFAULT_REGISTRY_URL, timeout=10):
+    """Return (state, digest) for one image using a conditional manifest HEAD"""
+    url = manifest_url(image, registry_url)
+    headers = [f"Accept: {MANIFEST_ACCEPT}"]
+    if known_digest:
+        headers.append(f'If-None-Match: "{known_digest}"')
+    status, response = _curl_head(url, headers, timeout)
+    if status == 401 and response.get("www-authenticate", "").lower().startswith("bearer"):
+        token = _bearer_token(response["www-authenticate"], timeout)
+        if token:
+            status, response = _curl_head(url, headers + [f"Authorization: Bearer {token}"], timeout)
+
+    if status == 304:
+        return CURRENT, known_digest
+    if status == 200:
+        digest = response.get("docker-content-digest") or response.get("etag", "").strip('"')
+        if not digest:
+            return UNKNOWN, None
+        return (CURRENT if digest == known_digest else CHANGED), digest
+    return UNKNOWN, None
+
+
+def local_digest(docker, image):
+    """Digest of the locally pulled image from its RepoDigests, or None"""
+    name = image.rpartition(":")[0] or image
+    try:
+        info = docker.inspect_image(image)
+    except docker_api.DockerAPIError:
+        return None
+    for repo_digest in (info or {}).get("RepoDigests") or []:
+        repo, _, digest = repo_digest.partition("@")
+        if repo in (name, f"docker.io/{name}", f"docker.io/library/{name}"):
+            return digest
+    return None
+
+
+def check_images(images, cache, docker=None, registry_url=DEFAULT_REGISTRY_URL, max_age=CACHE_FRESH_SECONDS):
+    """Check every image concurrently; return {image: (state, digest)}"""
+    results = {}
+    now = time.time()
+
+    def check(image):
+        digest, checked_at = cache.get(image)
+        if digest is None and docker is not None:
+            digest = local_digest(docker, image)
+        elif digest and now - checked_at < max_age:
+            results[image] = (CURRENT, digest)
+            return
+        state, remote = remote_digest(image, digest, registry_url)
+        if state == CURRENT:
+            cache.set(image, remote)
+        results[image] = (state, remote)
+
+    threads = [threading.Thread(target=check, args=(image,), daemon=True) for image in images]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] != "check":
+        print("Usage: image_updates.py check [--registry URL]")
+        sys.exit(1)
+    registry_url = DEFAULT_REGISTRY_URL
+    if "--registry" in args:
+        registry_url = args[args.index("--registry") + 1]
+    cache = DigestCache()
+    images = [image for image, _ in image_pull.active_images(os.path.expanduser("~/.onion.press"))]
+    results = check_images(images, cache, registry_url=registry_url, max_age=0)
+    for image in images:
+        state, digest = results[image]
+        print(f"{state:<8} {image} {digest or ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ Converts Tor v3 Ed25519 private keys to/from BIP39 mnemonic words with checksums
 
 import subprocess
 
+import address_cache
+
 try:
     from mnemonic import Mnemonic
 except ImportError:
@@ -201,6 +203,9 @@ def write_private_key(key_bytes):
             if result.returncode != 0:
                 raise Exception(f"Failed to set key permissions: {result.stderr.decode()}")
 
+            # The onion address is about to change - drop the cached one
+            address_cache.invalidate()
+
             # Restart Tor container to regenerate public key and hostname
             subprocess.run(['docker', 'restart', 'onionpress-tor'],
                          capture_output=True, timeout=30)
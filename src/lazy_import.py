@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Lazy module imports for onion.press
+The menubar app should show its splash before paying for anything it doesn't
+need yet. lazy("name") returns a stand-in that imports the real module the
+first time one of its attributes is used, and records how long that took.
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+# Seconds spent importing each lazily loaded module, filled in on first use
+import_times = {}
+
+_lock = threading.RLock()
+
+
+class LazyModule:
+    """Stand-in that imports the named module on first attribute access"""
+
+    def __init__(self, name):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with _lock:
+                module = self._module
+                if module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    import_times[self._name] = time.perf_counter() - started
+                    object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy(name):
+    """Return the module if it is already imported, otherwise a LazyModule"""
+    return sys.modules.get(name) or LazyModule(name)
@@ -4,22 +4,48 @@ onion.press Menu Bar Application
 Provides a simple menu bar interface to control the WordPress + Tor onion service
 """
 
+import time
+_imports_started = time.perf_counter()
+
 import rumps
 import subprocess
 import os
 import threading
-import time
-import json
-import plistlib
 import sys
-from datetime import datetime
 import AppKit
 
 # Add scripts directory to path for imports
 script_dir = os.path.dirname(os.path.realpath(__file__))
 sys.path.insert(0, script_dir)
 
-import key_manager
+# Everything else is imported on first use, after the splash is up.
+# key_manager in particular loads the mnemonic package and its wordlists and
+# is only needed for Export/Import/Uninstall.
+from lazy_import import lazy, import_times
+import buffered_log
+json = lazy("json")
+plistlib = lazy("plistlib")
+key_manager = lazy("key_manager")
+docker_api = lazy("docker_api")
+address_cache = lazy("address_cache")
+readiness = lazy("readiness")
+tor_log = lazy("tor_log")
+scheduler = lazy("scheduler")
+status = lazy("status")
+diagnostics = lazy("diagnostics")
+startup_trace = lazy("startup_trace")
+image_pull = lazy("image_pull")
+image_updates = lazy("image_updates")
+vm_sizing = lazy("vm_sizing")
+web_log = lazy("web_log")
+traffic_stats = lazy("traffic_stats")
+object_cache = lazy("object_cache")
+php_opcache = lazy("php_opcache")
+buffer_pool = lazy("buffer_pool")
+
+# Time spent importing modules before the splash can be shown
+IMPORT_TIME = time.perf_counter() - _imports_started
+IMPORT_BUDGET = 0.3  # seconds; build/benchmark_startup.py enforces time-to-splash
 
 
 def parse_version(version_str):
@@ -32,6 +58,8 @@ def parse_version(version_str):
 
 class OnionPressApp(rumps.App):
     def __init__(self):
+        init_started = int(time.time() * 1000000)  # startup_trace.now_us() without importing it yet
+
         # Get paths first (fast - no I/O)
         self.app_support = os.path.expanduser("~/.onion.press")
         self.script_dir = os.path.dirname(os.path.realpath(__file__))
@@ -74,6 +102,11 @@ class OnionPressApp(rumps.App):
         self.info_plist = os.path.join(self.contents_dir, "Info.plist")
         self.log_file = os.path.join(self.app_support, "onion.press.log")
 
+        # All log writes go through one background writer thread; the previous
+        # session's log is rotated out (gzipped) before anything new is written
+        self.logger = buffered_log.BufferedLogger(self.log_file)
+        self.logger.rotate()
+
         # Initialize rumps WITHOUT icon first (fastest possible)
         super(OnionPressApp, self).__init__("", quit_button=None)
 
@@ -101,29 +134,97 @@ class OnionPressApp(rumps.App):
         os.environ["DOCKER_HOST"] = f"unix://{self.colima_home}/default/docker.sock"
         os.environ["DOCKER_CONFIG"] = docker_config_dir
 
+        self.init_started = init_started
+
+        # State (the pollers, probers and their threads are built by
+        # start_services() once the splash is on screen)
+        self.address_cache_validated = False
+        self._check_lock = threading.Lock()  # Only one status check at a time
+        self.web_log = None  # WordPress access-log capture (created on first start)
+        self.traffic_stats = None  # Access-log counters (loaded from their checkpoint on first use)
+        self._traffic_lock = threading.Lock()
+        self.auto_opened_browser = False  # Track if we've auto-opened browser this session
+        self.setup_dialog_showing = False  # Track if setup dialog is currently showing
+        self.monitoring_tor_install = False  # Track if we're monitoring for Tor Browser installation
+        self.caffeinate_process = None  # Process handle for caffeinate to prevent sleep
+        self.events_connected = False  # True while subscribed to the Docker events stream
+
+        # Menu items
+        # Store reference to browser menu item so we can update its title
+        self.browser_menu_item = rumps.MenuItem("Open in Tor Browser", callback=self.open_tor_browser)
+
+        self.menu = [
+            rumps.MenuItem("Starting...", callback=None),
+            rumps.separator,
+            rumps.MenuItem("Copy Onion Address", callback=self.copy_address),
+            self.browser_menu_item,
+            rumps.separator,
+            rumps.MenuItem("Start", callback=self.start_service),
+            rumps.MenuItem("Stop", callback=self.stop_service),
+            rumps.MenuItem("Restart", callback=self.restart_service),
+            rumps.separator,
+            rumps.MenuItem("View Logs", callback=self.view_logs),
+            rumps.MenuItem("View Web Usage Log", callback=self.view_web_log),
+            rumps.MenuItem("Traffic Stats...", callback=self.show_traffic_stats),
+            rumps.MenuItem("Diagnostics...", callback=self.show_diagnostics),
+            rumps.MenuItem("Settings...", callback=self.open_settings),
+            rumps.separator,
+            rumps.MenuItem("Export Private Key...", callback=self.export_key),
+            rumps.MenuItem("Import Private Key...", callback=self.import_key),
+            rumps.separator,
+            rumps.MenuItem("Check for Updates...", callback=self.check_for_updates),
+            rumps.MenuItem("About Onion.Press", callback=self.show_about),
+            rumps.MenuItem("Uninstall...", callback=self.uninstall),
+            rumps.separator,
+            rumps.MenuItem("Quit", callback=self.quit_app),
+        ]
+
+    def start_services(self):
+        """Build the pollers and probers and start their threads, once the splash is on screen"""
+        # Launch phase spans (joins the launcher's trace via ONIONPRESS_TRACE_ID)
+        self.tracer = startup_trace.StartupTracer(
+            trace_dir=os.path.join(self.app_support, "traces"))
+
+        # One backoff/jitter/battery-aware policy for every polling loop
+        self.scheduler = scheduler.PollScheduler()
+
+        # In-process Docker Engine API client (no bash/docker/jq forks per poll)
+        self.docker = docker_api.DockerClient(
+            socket_path=os.path.join(self.colima_home, "default", "docker.sock")
+        )
+
+        # Tor log is parsed once, incrementally, instead of tailed every poll
+        self.tor_log = tor_log.TorLogFollower(self.docker, log=self.log)
+
+        # Single readiness prober; results are published for the bash launcher too
+        self.readiness = readiness.ReadinessEngine(
+            self.docker,
+            docker_bin=os.path.join(self.bin_dir, "docker"),
+            state_file=os.path.join(self.app_support, "readiness"),
+            tor_log_follower=self.tor_log,
+            upstream=lambda: self.read_compose_env().get("ONIONPRESS_UPSTREAM", "wordpress"),
+            warm_wait=lambda: self.read_config_value("DB_WARM_WAIT", "no") == "yes",
+        )
+
         # Do slow I/O operations in background after icon appears
         def background_init():
-            # Rotate log file on startup to avoid confusion with old sessions
-            if os.path.exists(self.log_file):
-                # Keep only the last session as backup
-                backup_log = os.path.join(self.app_support, "onion.press.log.prev")
-                try:
-                    import shutil
-                    shutil.move(self.log_file, backup_log)
-                except OSError:
-                    pass  # If rotation fails, just append
+            span_started = startup_trace.now_us()
+
+            # Structured JSON-lines log for tools (LOG_JSON=yes in config)
+            if self.read_config_value("LOG_JSON", "no").strip().lower() == "yes":
+                self.logger.enable_json(os.path.join(self.app_support, "onion.press.jsonl"))
 
             # Debug logging
-            with open(self.log_file, 'a') as f:
-                f.write(f"DEBUG: frozen={getattr(sys, 'frozen', False)}\n")
-                f.write(f"DEBUG: resources_dir={self.resources_dir}\n")
-                f.write(f"DEBUG: bin_dir={self.bin_dir}\n")
-                f.write(f"DEBUG: launcher_script={self.launcher_script}\n")
-                f.write(f"DEBUG: icon_stopped exists={os.path.exists(self.icon_stopped)}\n")
-                f.write(f"DEBUG: icon_stopped path={self.icon_stopped}\n")
-                f.write(f"DEBUG: rumps initialized successfully\n")
+            self.log(f"DEBUG: frozen={getattr(sys, 'frozen', False)}")
+            self.log(f"DEBUG: resources_dir={self.resources_dir}")
+            self.log(f"DEBUG: bin_dir={self.bin_dir}")
+            self.log(f"DEBUG: launcher_script={self.launcher_script}")
+            self.log(f"DEBUG: icon_stopped exists={os.path.exists(self.icon_stopped)}")
+            self.log(f"DEBUG: icon_stopped path={self.icon_stopped}")
+            self.log("DEBUG: rumps initialized successfully")
 
             # Create Docker config without credential store (avoids docker-credential-osxkeychain errors)
+            docker_config_dir = os.environ["DOCKER_CONFIG"]
             os.makedirs(docker_config_dir, exist_ok=True)
             docker_config_file = os.path.join(docker_config_dir, "config.json")
             if not os.path.exists(docker_config_file):
@@ -156,50 +257,31 @@ class OnionPressApp(rumps.App):
             # Update browser menu title after checking filesystem
             self.update_browser_menu_title()
 
+            self.tracer.record("background_init", span_started)
+
         # Start background initialization
         threading.Thread(target=background_init, daemon=True).start()
 
-        # State
-        self.onion_address = "Starting..."
-        self.is_running = False
-        self.is_ready = False  # WordPress is ready to serve requests
-        self.checking = False
-        self._checking_lock = threading.Lock()  # Protect self.checking from race conditions
-        self.web_log_process = None  # Background process for web logs
-        self.web_log_file_handle = None  # File handle for web log capture
-        self.last_status_logged = None  # Track last logged status to avoid spam
-        self.auto_opened_browser = False  # Track if we've auto-opened browser this session
-        self.setup_dialog_showing = False  # Track if setup dialog is currently showing
-        self.monitoring_tor_install = False  # Track if we're monitoring for Tor Browser installation
-        self.caffeinate_process = None  # Process handle for caffeinate to prevent sleep
+        # Show the cached onion address straight away; it is validated against
+        # the tor-keys volume on the first status check
+        self.address_cache = address_cache.load(self.app_support)
+        self.status = status.StatusStore(
+            status.StatusSnapshot(
+                onion_address=self.address_cache[0] if self.address_cache else "Starting..."),
+            log=self.log
+        )
 
-        # Menu items
-        # Store reference to browser menu item so we can update its title
-        self.browser_menu_item = rumps.MenuItem("Open in Tor Browser", callback=self.open_tor_browser)
+        # Status consumers - each runs only when one of its fields changes
+        self.status.subscribe(self.on_visible_status_change, status.VISIBLE_FIELDS)
+        self.status.subscribe(self.on_ready_change, ("ready",))
+        self.status.subscribe(self.on_running_change, ("running",))
+        self.status.subscribe(self.on_status_checked, ("running", "checked_at"))
 
-        self.menu = [
-            rumps.MenuItem("Starting...", callback=None),
-            rumps.separator,
-            rumps.MenuItem("Copy Onion Address", callback=self.copy_address),
-            self.browser_menu_item,
-            rumps.separator,
-            rumps.MenuItem("Start", callback=self.start_service),
-            rumps.MenuItem("Stop", callback=self.stop_service),
-            rumps.MenuItem("Restart", callback=self.restart_service),
-            rumps.separator,
-            rumps.MenuItem("View Logs", callback=self.view_logs),
-            rumps.MenuItem("View Web Usage Log", callback=self.view_web_log),
-            rumps.MenuItem("Settings...", callback=self.open_settings),
-            rumps.separator,
-            rumps.MenuItem("Export Private Key...", callback=self.export_key),
-            rumps.MenuItem("Import Private Key...", callback=self.import_key),
-            rumps.separator,
-            rumps.MenuItem("Check for Updates...", callback=self.check_for_updates),
-            rumps.MenuItem("About Onion.Press", callback=self.show_about),
-            rumps.MenuItem("Uninstall...", callback=self.uninstall),
-            rumps.separator,
-            rumps.MenuItem("Quit", callback=self.quit_app),
-        ]
+        # Probe latency histograms and availability history for Diagnostics...
+        self.probe_stats = diagnostics.ProbeStats()
+        self.uptime_log = diagnostics.UptimeLog(os.path.join(self.app_support, diagnostics.UPTIME_FILENAME))
+        self.launch_duration = None  # Seconds from app launch to first ready
+        self.status.subscribe(self.record_uptime, ("running", "ready", "checked_at"))
 
         # Ensure Docker is available
         threading.Thread(target=self.ensure_docker_available, daemon=True).start()
@@ -207,9 +289,23 @@ class OnionPressApp(rumps.App):
         # Start status checker
         self.start_status_checker()
 
+        # Watch container start/die/health/oom events so state changes show up immediately
+        self.start_event_watcher()
+
+        # Follow the Tor log for bootstrap and descriptor publish state
+        self.tor_log.start()
+
+        # Sample container CPU/memory use so the launcher can size the VM to the load
+        self.start_pressure_sampler()
+
+        # Keep traffic counters current so each update only parses a few new lines
+        self.start_traffic_stats_updater()
+
         # Auto-start on launch
         threading.Thread(target=self.auto_start, daemon=True).start()
 
+        self.tracer.record("app_init", self.init_started)
+
     def show_launch_splash(self):
         """Show non-blocking launch splash with logo - no I/O blocking"""
         def show():
@@ -277,12 +373,15 @@ class OnionPressApp(rumps.App):
                 self.launch_splash = window
                 self.launch_splash_time_field = time_field  # Store reference for updates
 
+                if os.environ.get("ONIONPRESS_SPLASH_BENCHMARK"):
+                    # build/benchmark_startup.py: report time-to-splash and what was imported by then
+                    shown_us = int(time.time() * 1000000)
+                    print(f"SPLASH_MODULES={','.join(sorted(sys.modules))}")
+                    print(f"SPLASH_SHOWN_US={shown_us}", flush=True)
+                    os._exit(0)
+
                 # Log splash creation
-                try:
-                    with open(self.log_file, 'a') as f:
-                        f.write(f"DEBUG: Launch splash created and shown\n")
-                except Exception:
-                    pass
+                self.log("DEBUG: Launch splash created and shown")
 
                 # Add logo in background (I/O happens after window shows)
                 def add_logo():
@@ -298,6 +397,9 @@ class OnionPressApp(rumps.App):
             except Exception as e:
                 pass  # Don't log yet, log file not ready
 
+            # Queued behind the splash, so the window is drawn before any of this work starts
+            AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(self.start_services)
+
         # Show on main thread
         AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(show)
 
@@ -327,16 +429,12 @@ class OnionPressApp(rumps.App):
         """Action handler for Dismiss button"""
         self.dismiss_launch_splash()
 
-    def log(self, message):
-        """Write log message to onion.press.log file"""
-        try:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            log_message = f"[{timestamp}] {message}\n"
-            fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
-            with os.fdopen(fd, 'a', encoding='utf-8') as f:
-                f.write(log_message)
-        except Exception as e:
-            print(f"Error writing to log: {e}")
+    def log(self, message, component=None, duration=None, **fields):
+        """Queue a log message for onion.press.log (written by the background log thread)
+
+        duration (seconds) and extra fields only appear in the JSON-lines log.
+        """
+        self.logger.log(message, component=component, duration=duration, **fields)
 
     def start_caffeinate(self):
         """Start caffeinate to prevent Mac from sleeping while service runs"""
@@ -463,6 +561,18 @@ class OnionPressApp(rumps.App):
         self.startup_time = time.time()
         self.log("=" * 60)
 
+        # Import-time budget for the menubar process
+        import_ms = int(IMPORT_TIME * 1000)
+        budget_ms = int(IMPORT_BUDGET * 1000)
+        if IMPORT_TIME > IMPORT_BUDGET:
+            self.log(f"WARNING: Module imports took {import_ms}ms before the splash (budget {budget_ms}ms)")
+        else:
+            self.log(f"Module imports before splash: {import_ms}ms (budget {budget_ms}ms)")
+        deferred = ", ".join(f"{name} {int(seconds * 1000)}ms"
+                             for name, seconds in sorted(import_times.items()))
+        if deferred:
+            self.log(f"Deferred imports so far: {deferred}")
+
         # macOS version
         try:
             result = subprocess.run(["sw_vers", "-productVersion"], capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=5)
@@ -503,55 +613,45 @@ class OnionPressApp(rumps.App):
 
         self.log("=" * 60)
 
-    def start_web_log_capture(self):
-        """Start capturing WordPress logs to a file"""
-        if self.web_log_process is not None:
-            return  # Already running
+    def compose_images(self):
+        """(image, platform) pairs of the compose files the launcher selected"""
+        return image_pull.active_images(self.app_support, os.path.join(self.parent_resources_dir, "docker"))
 
-        try:
-            web_log_file = os.path.join(self.app_support, "wordpress-access.log")
-            docker_bin = os.path.join(self.bin_dir, "docker")
+    def read_compose_env(self):
+        """Compose files, Tor upstream and stack variant the launcher selected on its last run"""
+        return vm_sizing.read_key_values(os.path.join(self.app_support, "compose-env"))
 
-            # Open log file for writing (kept as instance var so we can close it later)
-            self.web_log_file_handle = open(web_log_file, 'a')
-
-            # Start docker logs process in background
-            self.web_log_process = subprocess.Popen(
-                [docker_bin, "logs", "-f", "--tail", "100", "onionpress-wordpress"],
-                stdout=self.web_log_file_handle,
-                stderr=subprocess.STDOUT,
-                env={
-                    "DOCKER_HOST": f"unix://{self.colima_home}/default/docker.sock"
-                }
+    def start_web_log_capture(self):
+        """Start capturing WordPress logs to a file, resuming where the last capture stopped"""
+        if self.web_log is None:
+            try:
+                max_total_mb = int(self.read_config_value("WEB_LOG_MAX_MB", "100"))
+            except ValueError:
+                max_total_mb = 100
+            self.web_log = web_log.WebLogCapture(
+                self.docker,
+                os.path.join(self.app_support, web_log.WEB_LOG_FILENAME),
+                max_bytes=min(web_log.DEFAULT_MAX_BYTES, max_total_mb * 1024 * 1024 // 4),
+                max_total_bytes=max_total_mb * 1024 * 1024,
+                log=self.log,
             )
-            print(f"Started web log capture to {web_log_file}")
-        except Exception as e:
-            print(f"Error starting web log capture: {e}")
-            if hasattr(self, 'web_log_file_handle') and self.web_log_file_handle:
-                self.web_log_file_handle.close()
-                self.web_log_file_handle = None
-            self.web_log_process = None
+        if not self.web_log.running:
+            # The front container's log has every visit: the cache proxy (with cache
+            # statuses), nginx in the PHP-FPM variant, otherwise Apache in wordpress
+            self.web_log.container = "onionpress-wordpress"
+            for name in ("onionpress-cache", "onionpress-web"):
+                try:
+                    if self.docker.inspect_container(name).get("State", {}).get("Running"):
+                        self.web_log.container = name
+                        break
+                except docker_api.DockerAPIError:
+                    pass
+        self.web_log.start()
 
     def stop_web_log_capture(self):
         """Stop capturing WordPress logs"""
-        if self.web_log_process is not None:
-            try:
-                self.web_log_process.terminate()
-                self.web_log_process.wait(timeout=5)
-            except Exception:
-                try:
-                    self.web_log_process.kill()
-                except Exception:
-                    pass
-            self.web_log_process = None
-            # Close the log file handle to avoid leaking it
-            if hasattr(self, 'web_log_file_handle') and self.web_log_file_handle:
-                try:
-                    self.web_log_file_handle.close()
-                except Exception:
-                    pass
-                self.web_log_file_handle = None
-            print("Stopped web log capture")
+        if self.web_log is not None:
+            self.web_log.stop()
 
     def ensure_docker_available(self):
         """Ensure bundled Colima is running (no-op during first-time setup as launcher handles it)"""
@@ -586,32 +686,19 @@ class OnionPressApp(rumps.App):
 
         # Wait for Colima to be ready (important for first-time setup)
         self.log("Waiting for container runtime to be ready...")
-        docker_bin = os.path.join(self.bin_dir, "docker")
         colima_initialized = os.path.join(self.colima_home, ".initialized")
 
-        # Wait up to 3 minutes for Colima initialization
-        max_wait = 180  # 3 minutes
-        waited = 0
-        while waited < max_wait:
+        def runtime_ready():
             # Check if Colima is initialized and docker is responding
-            if os.path.exists(colima_initialized):
-                try:
-                    result = subprocess.run(
-                        [docker_bin, "info"],
-                        capture_output=True,
-                        timeout=5,
-                        env=os.environ.copy()
-                    )
-                    if result.returncode == 0:
-                        self.log("Container runtime is ready")
-                        break
-                except Exception:
-                    pass
+            return os.path.exists(colima_initialized) and self.docker.available()
 
-            time.sleep(3)
-            waited += 3
-
-        if waited >= max_wait:
+        # Wait up to 3 minutes for Colima initialization
+        with self.tracer.span("wait_for_colima"):
+            runtime_is_ready = self.scheduler.wait_until("colima", runtime_ready, timeout=180,
+                                                         initial=1, maximum=10, baseline=3)
+        if runtime_is_ready:
+            self.log("Container runtime is ready")
+        else:
             self.log("WARNING: Container runtime not ready after 3 minutes")
 
         # Check if UPDATE_ON_LAUNCH is enabled
@@ -691,255 +778,224 @@ class OnionPressApp(rumps.App):
             print(f"Error running command {command}: {e}")
             return None
 
-    def check_wordpress_health(self, log_result=True):
-        """Check if WordPress is actually responding to requests"""
-        try:
-            if log_result:
-                self.log("Checking local access: http://localhost:8080")
-            # Use curl instead of urllib to avoid "local network" permission prompt
-            result = subprocess.run(
-                ["curl", "-s", "--max-time", "3", "http://localhost:8080"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=5
-            )
-            if result.returncode == 0:
-                content = result.stdout
-                # Check for database errors or WordPress not ready
-                if 'Error establishing a database connection' in content:
-                    if log_result:
-                        self.log("✗ Local access: Database connection error")
-                    return False
-                if 'Database connection error' in content:
-                    if log_result:
-                        self.log("✗ Local access: Database connection error")
-                    return False
-                # If we get here and got a response, WordPress is responding
-                # Either it's the install page or actual WordPress content
-                if log_result:
-                    self.log("✓ Local access: WordPress responding")
-                return True
-            else:
-                if log_result:
-                    self.log(f"✗ Local access: Connection failed (curl exit code {result.returncode})")
-                return False
-        except Exception as e:
-            if log_result:
-                self.log(f"✗ Local access: Connection failed ({str(e)})")
-            return False
-
-    def check_tor_reachability(self, log_result=True):
-        """Check if the .onion service is properly configured and published"""
-        if not self.onion_address or self.onion_address in ["Starting...", "Not running", "Generating address..."]:
-            return False
+    def get_container_states(self):
+        """Return {container name: state} for the compose containers
 
+        Uses the Docker Engine API over the Colima socket, falling back to
+        `onion.press status` (docker compose ps + jq) if the socket is unusable.
+        """
         try:
-            if log_result:
-                self.log(f"Checking Tor onion service status for: {self.onion_address}")
-
-            docker_bin = os.path.join(self.bin_dir, "docker")
-
-            # Set up environment for docker commands
-            docker_env = os.environ.copy()
-            docker_env["DOCKER_HOST"] = f"unix://{self.colima_home}/default/docker.sock"
-            docker_env["DOCKER_CONFIG"] = os.path.join(self.app_support, "docker-config")
-
-            # Check 1: Verify hostname file exists and matches
-            result = subprocess.run(
-                [docker_bin, "exec", "onionpress-tor",
-                 "cat", "/var/lib/tor/hidden_service/wordpress/hostname"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=5,
-                env=docker_env
-            )
-
-            if result.returncode != 0:
-                if log_result:
-                    self.log(f"✗ Hidden service hostname file not found")
-                return False
-
-            hostname = result.stdout.strip()
-            if hostname != self.onion_address:
-                if log_result:
-                    self.log(f"✗ Hostname mismatch: {hostname} != {self.onion_address}")
-                return False
-
-            # Check 2: Verify Tor has bootstrapped to 100%
-            result = subprocess.run(
-                [docker_bin, "logs", "--tail", "100", "onionpress-tor"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=5,
-                env=docker_env
-            )
+            containers = self.docker.containers()
+            return {c["Names"][0].lstrip("/"): c.get("State", "").lower() for c in containers}
+        except docker_api.DockerAPIError:
+            pass
 
-            if "Bootstrapped 100% (done)" not in result.stdout:
-                if log_result:
-                    self.log(f"✗ Tor not fully bootstrapped yet")
-                return False
+        status_json = self.run_command("status")
+        if not status_json or status_json == "[]":
+            return {}
+        try:
+            status = json.loads(status_json)
+            return {s.get("Name", ""): s.get("State", "").lower() for s in status}
+        except Exception:
+            return {}
+
+    def cached_onion_address(self):
+        """Return the cached onion address if it still belongs to the tor-keys volume"""
+        if self.address_cache is None:
+            self.address_cache = address_cache.load(self.app_support)
+            self.address_cache_validated = False
+            if self.address_cache is None:
+                return None
+        if not self.address_cache_validated:
+            try:
+                volume = self.docker.inspect_volume(address_cache.TOR_KEYS_VOLUME)
+            except docker_api.DockerAPIError:
+                return None
+            if volume.get("CreatedAt", "") != self.address_cache[1]:
+                self.log("tor-keys volume was recreated - discarding cached onion address")
+                address_cache.invalidate(self.app_support)
+                self.address_cache = None
+                return None
+            self.address_cache_validated = True
+        return self.address_cache[0]
+
+    def remember_onion_address(self, address):
+        """Persist a freshly read onion address with the volume it belongs to"""
+        try:
+            volume = self.docker.inspect_volume(address_cache.TOR_KEYS_VOLUME)
+        except docker_api.DockerAPIError:
+            return
+        address_cache.save(address, volume.get("CreatedAt", ""), self.app_support)
+        self.address_cache = (address, volume.get("CreatedAt", ""))
+        self.address_cache_validated = True
 
-            # Check 3: Verify no critical errors in recent logs
-            if "ERROR" in result.stdout or "failed to publish" in result.stdout.lower():
-                if log_result:
-                    self.log(f"✗ Tor errors detected in logs")
-                return False
+    def log_readiness(self, result):
+        """Log the outcome of a readiness pass in the same terms as the probes"""
+        local = result.probes["local_http"]
+        self.log("Checking local access: http://localhost:8080")
+        self.log(f"{'✓' if local.ok else '✗'} Local access: {local.detail}")
 
-            # Check 4: Verify WordPress is reachable from Tor container
-            # (SOCKS proxy at 127.0.0.1:9050 doesn't work through Colima VM
-            # port forwarding, so we test the actual path: tor -> wordpress
-            # over the Docker network using docker exec + wget)
-            probe_result = subprocess.run(
-                [docker_bin, "exec", "onionpress-tor",
-                 "wget", "-q", "-O", "/dev/null", "--timeout=5",
-                 "http://wordpress:80/"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=10,
-                env=docker_env
-            )
-            if probe_result.returncode != 0:
-                if log_result:
-                    self.log(f"✗ WordPress not reachable from Tor container")
-                return False
+        if not result.onion_address:
+            return
+        self.log(f"Checking Tor onion service status for: {result.onion_address}")
+        if result.onion_ready:
+            self.log(f"✓ Onion service verified: {result.onion_address}")
+            return
+        for name in ("hostname", "bootstrap", "tor_to_wordpress"):
+            probe = result.probes[name]
+            if not probe.ok:
+                self.log(f"✗ {probe.detail}")
+                break
 
-            if log_result:
-                self.log(f"✓ Onion service verified: {self.onion_address}")
+    @property
+    def is_running(self):
+        return self.status.snapshot.running
 
-            return True
+    @property
+    def is_ready(self):
+        """WordPress is ready to serve requests"""
+        return self.status.snapshot.ready
 
-        except Exception as e:
-            if log_result:
-                self.log(f"✗ Tor status check failed: {str(e)}")
-            return False
+    @property
+    def onion_address(self):
+        return self.status.snapshot.onion_address
 
     def check_status(self):
         """Check if containers are running and get onion address"""
-        with self._checking_lock:
-            if self.checking:
-                return
-            self.checking = True
+        if not self._check_lock.acquire(blocking=False):
+            return
 
         try:
-            # Check if containers are running
-            status_json = self.run_command("status")
-
-            if status_json and status_json != "[]":
-                try:
-                    status = json.loads(status_json)
-                    self.is_running = len(status) > 0 and all(
-                        s.get("State", "").lower() == "running" for s in status
-                    )
-                except Exception:
-                    self.is_running = False
+            # Check if containers are running (docker compose ps only lists running ones)
+            states = self.get_container_states()
+            running = any(state == "running" for state in states.values())
+
+            # Get onion address and readiness if running
+            if running:
+                # One concurrent pass: hostname, Tor bootstrap, local HTTP, tor -> wordpress
+                # (the hostname read is skipped while the cached address is valid)
+                known_address = self.cached_onion_address()
+                result = self.readiness.run(known_address=known_address)
+                self.probe_stats.record_result(result)
+                onion_address = result.onion_address or "Generating address..."
+                if result.onion_address and not known_address:
+                    self.remember_onion_address(result.onion_address)
+
+                # Only log details if we're not ready yet or the address changed
+                previous = self.status.snapshot
+                if not previous.ready or not previous.running or previous.onion_address != onion_address:
+                    self.log_readiness(result)
+
+                # If it works in Tor Browser, show as ready
+                self.status.publish(running=True, ready=result.ready, onion_address=onion_address,
+                                    checked_at=time.time())
             else:
-                self.is_running = False
+                self.readiness.clear()
+                self.status.publish(running=False, ready=False, onion_address="Not running",
+                                    checked_at=time.time())
 
-            # Get onion address if running
-            if self.is_running:
-                addr = self.run_command("address")
-                if addr and addr != "Generating...":
-                    self.onion_address = addr.strip()
-                else:
-                    self.onion_address = "Generating address..."
-
-                # Determine if we should do detailed checks and logging
-                # Only do detailed checks if we're not ready yet or status changed
-                current_status = (self.is_running, self.onion_address)
-                should_log = (current_status != self.last_status_logged) or not self.is_ready
-
-                # Check if WordPress is ready and Tor is reachable
-                wordpress_ready = self.check_wordpress_health(log_result=should_log)
-
-                # Check Tor reachability immediately - if it works in Tor Browser, show as ready
-                tor_reachable = self.check_tor_reachability(log_result=should_log)
-
-                previous_ready = self.is_ready
-                ready_now = wordpress_ready and tor_reachable
-
-                if ready_now and not previous_ready:
-                    self.is_ready = True
-                    elapsed = int(time.time() - self.startup_time)
-                    self.log(f"✓ System fully operational (launched in {elapsed}s)")
-                    self.last_status_logged = current_status
-
-                    # Dismiss setup dialog if it's showing
-                    self.dismiss_setup_dialog()
-
-                    # Auto-open Tor Browser on first ready (if installed)
-                    if not self.auto_opened_browser:
-                        self.auto_opened_browser = True
-                        self.auto_open_browser()
-
-                    # Force menu update (changes icon to green)
-                    self.update_menu()
-
-                    # Dismiss splash AFTER icon turns green
-                    self.dismiss_launch_splash()
-                elif ready_now:
-                    # Already was ready, keep it ready
-                    self.is_ready = True
-                    # Update last_status_logged to prevent repeated logging
-                    self.last_status_logged = current_status
-
-                # Start web log capture if not already running
-                if self.web_log_process is None:
-                    threading.Thread(target=self.start_web_log_capture, daemon=True).start()
-
-                # Start caffeinate if not already running (prevents sleep while service runs)
-                if self.caffeinate_process is None or self.caffeinate_process.poll() is not None:
-                    self.start_caffeinate()
-            else:
-                # Log when stopping
-                if self.is_running or self.is_ready:
-                    self.log("Service stopped")
-                    self.last_status_logged = None
+        except Exception as e:
+            print(f"Error checking status: {e}")
+        finally:
+            self._check_lock.release()
 
-                    # Only dismiss setup dialog when actually stopping (not during startup)
-                    self.dismiss_setup_dialog()
+    def on_visible_status_change(self, old, new):
+        """Redraw the menu when something it shows has changed"""
+        self.update_menu(new)
 
-                self.onion_address = "Not running"
-                self.is_ready = False
-                self.auto_opened_browser = False  # Reset for next start
+    def on_ready_change(self, old, new):
+        """Log, dismiss dialogs and open the browser when the site becomes ready"""
+        if not new.ready:
+            return
+        elapsed = int(time.time() - self.startup_time)
+        self.log(f"✓ System fully operational (launched in {elapsed}s)",
+                 component="startup", duration=time.time() - self.startup_time)
+        if self.launch_duration is None:
+            self.launch_duration = elapsed
+        if not self.tracer.finalized:
+            # The launch is over: write this launch's trace file
+            self.tracer.record("first_green_icon", self.tracer.launch_start_us, tid="launch")
+            trace_path = self.tracer.finalize()
+            if trace_path:
+                self.log(f"Startup trace written to {trace_path}")
+
+        # Dismiss setup dialog if it's showing
+        self.dismiss_setup_dialog()
 
-                # Stop web log capture if running
-                if self.web_log_process is not None:
-                    self.stop_web_log_capture()
+        # Auto-open Tor Browser on first ready (if installed)
+        if not self.auto_opened_browser:
+            self.auto_opened_browser = True
+            threading.Thread(target=self.auto_open_browser, daemon=True).start()
 
-                # Stop caffeinate to allow Mac to sleep
-                self.stop_caffeinate()
+        # Dismiss splash (the menu update queued just before turns the icon green first)
+        self.dismiss_launch_splash()
 
-            # Update menu
-            self.update_menu()
+    def on_running_change(self, old, new):
+        """Log and reset per-run state when the service stops or starts"""
+        # The launcher may have recreated the tor-keys volume (first run, reset);
+        # check the cached address against it again
+        self.address_cache_validated = False
+        if old.running and not new.running:
+            self.log("Service stopped")
+            # Only dismiss setup dialog when actually stopping (not during startup)
+            self.dismiss_setup_dialog()
+            self.auto_opened_browser = False  # Reset for next start
 
-        except Exception as e:
-            print(f"Error checking status: {e}")
-        finally:
-            self.checking = False
+    def record_uptime(self, old, new):
+        """Append the current availability to the uptime ring buffer"""
+        if new.checked_at is None:
+            return
+        if not new.running:
+            state = diagnostics.STATE_STOPPED
+        elif new.ready:
+            state = diagnostics.STATE_UP
+        else:
+            state = diagnostics.STATE_DOWN
+        self.uptime_log.observe(state, new.checked_at)
+
+    def on_status_checked(self, old, new):
+        """Keep web log capture and caffeinate in step with the service"""
+        if new.running:
+            # Start web log capture if not already running
+            if self.web_log is None or not self.web_log.running:
+                self.start_web_log_capture()
+
+            # Start caffeinate if not already running (prevents sleep while service runs)
+            if self.caffeinate_process is None or self.caffeinate_process.poll() is not None:
+                self.start_caffeinate()
+        else:
+            # Stop web log capture if running
+            self.stop_web_log_capture()
+
+            # Stop caffeinate to allow Mac to sleep
+            if self.caffeinate_process is not None:
+                self.stop_caffeinate()
+
+    def update_menu(self, snapshot=None):
+        """Update menu items based on a status snapshot - thread-safe"""
+        snapshot = snapshot or self.status.snapshot
 
-    def update_menu(self):
-        """Update menu items based on current state - thread-safe"""
         # Dispatch UI updates to main thread to avoid AppKit threading violations
         def do_update():
-            if self.is_running and self.is_ready:
+            if snapshot.transition:
+                # A start/stop/restart is in progress
+                if snapshot.transition != "Stopping":
+                    self.icon = self.icon_starting
+                self.menu["Starting..."].title = f"Status: {snapshot.transition}..."
+            elif snapshot.running and snapshot.ready:
                 # Fully operational
                 self.icon = self.icon_running
-                self.menu["Starting..."].title = f"Address: {self.onion_address}"
+                self.menu["Starting..."].title = f"Address: {snapshot.onion_address}"
                 self.menu["Start"].set_callback(None)
                 self.menu["Stop"].set_callback(self.stop_service)
                 self.menu["Restart"].set_callback(self.restart_service)
-            elif self.is_running and not self.is_ready:
+            elif snapshot.running and not snapshot.ready:
                 # Containers running but WordPress not ready yet
                 self.icon = self.icon_starting
-                self.menu["Starting..."].title = "Status: Starting up, please wait..."
+                if snapshot.onion_address.endswith(".onion"):
+                    self.menu["Starting..."].title = f"Starting up: {snapshot.onion_address}"
+                else:
+                    self.menu["Starting..."].title = "Status: Starting up, please wait..."
                 self.menu["Start"].set_callback(None)
                 self.menu["Stop"].set_callback(self.stop_service)
                 self.menu["Restart"].set_callback(self.restart_service)
@@ -959,15 +1015,135 @@ class OnionPressApp(rumps.App):
         def checker():
             while True:
                 self.check_status()
-                # Check frequently when starting up, slowly when ready
-                if self.is_ready:
-                    time.sleep(30)  # Check every 30 seconds when operational
+                # Check frequently when starting up, slowly when ready.
+                # Container events wake us early, so once the events stream is
+                # connected polling is only a sanity check.
+                if not self.is_ready:
+                    interval, baseline = 5, 5      # Check every 5 seconds during startup
+                elif self.events_connected:
+                    interval, baseline = 300, 30   # Events report changes; poll every 5 minutes
                 else:
-                    time.sleep(5)   # Check every 5 seconds during startup
+                    interval, baseline = 30, 30    # No event stream; check every 30 seconds
+                self.scheduler.sleep("status", interval, baseline=baseline)
 
         thread = threading.Thread(target=checker, daemon=True)
         thread.start()
 
+    def handle_container_event(self, event):
+        """React to a Docker container event for one of our containers"""
+        action = event.get("Action") or event.get("status") or ""
+        name = event.get("Actor", {}).get("Attributes", {}).get("name", "")
+        if name not in docker_api.CONTAINER_NAMES:
+            return
+
+        if action in ("die", "oom", "kill") or action.startswith("health_status: unhealthy"):
+            self.log(f"Container event: {name} {action}")
+            # Drop out of the ready state right away instead of waiting for the next poll
+            self.status.publish(ready=False)
+            self.scheduler.wake("status")
+        elif action in ("start", "restart") or action.startswith("health_status"):
+            self.log(f"Container event: {name} {action}")
+            self.scheduler.wake("status")
+
+    def start_event_watcher(self):
+        """Start background thread subscribed to the Docker events stream"""
+        def watcher():
+            retry_delay = 2
+            filters = {"type": ["container"], "container": list(docker_api.CONTAINER_NAMES)}
+            while True:
+                try:
+                    events = self.docker.events(filters=filters, since=int(time.time()))
+                    if not self.events_connected:
+                        self.log("Subscribed to Docker container events")
+                    self.events_connected = True
+                    retry_delay = 2
+                    for event in events:
+                        self.handle_container_event(event)
+                except (docker_api.DockerAPIError, OSError, ValueError):
+                    pass
+
+                if self.events_connected:
+                    self.log("Docker events stream closed - falling back to polling")
+                    self.events_connected = False
+                    # Whatever happened to the daemon, re-check state now
+                    self.scheduler.wake("status")
+                self.scheduler.sleep("events", retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+        thread = threading.Thread(target=watcher, daemon=True)
+        thread.start()
+
+    def start_pressure_sampler(self):
+        """Start background thread recording container CPU and memory use for VM sizing"""
+        def sampler():
+            pressure_log = None
+            while True:
+                self.scheduler.sleep("pressure", vm_sizing.SAMPLE_INTERVAL)
+                snapshot = self.status.snapshot
+                if not (snapshot.running and snapshot.ready):
+                    continue
+                usage = vm_sizing.sample_usage(self.docker)
+                if usage is None:
+                    continue
+                if pressure_log is None:
+                    pressure_log = vm_sizing.PressureLog(self.app_support)
+                pressure_log.add(*usage)
+
+        thread = threading.Thread(target=sampler, daemon=True)
+        thread.start()
+
+    def update_traffic_stats(self):
+        """Parse access-log lines added since the last checkpoint; return the stats"""
+        with self._traffic_lock:
+            if self.traffic_stats is None:
+                self.traffic_stats = traffic_stats.TrafficStats(
+                    os.path.join(self.app_support, web_log.WEB_LOG_FILENAME),
+                    os.path.join(self.app_support, traffic_stats.CHECKPOINT_FILENAME),
+                )
+            started = time.monotonic()
+            try:
+                read = self.traffic_stats.update()
+            except OSError as e:
+                self.log(f"✗ Traffic stats update failed: {e}")
+                return self.traffic_stats
+            if read:
+                self.log(f"Traffic stats: parsed {read} new log lines",
+                         component="traffic", duration=time.monotonic() - started)
+            return self.traffic_stats
+
+    def start_traffic_stats_updater(self):
+        """Start background thread folding new access-log lines into the traffic counters"""
+        def updater():
+            while True:
+                self.scheduler.sleep("traffic", 600)
+                if self.status.snapshot.running:
+                    self.update_traffic_stats()
+
+        thread = threading.Thread(target=updater, daemon=True)
+        thread.start()
+
+    def read_page_cache_stats(self):
+        """Per-hour pages the page cache plugin rendered, or None when it isn't running"""
+        try:
+            data = self.docker.read_file("onionpress-wordpress", traffic_stats.PAGE_CACHE_STATS_PATH)
+        except (docker_api.DockerAPIError, OSError):
+            return None
+        return traffic_stats.parse_page_cache_stats(data)
+
+    def show_traffic_stats(self, _):
+        """Show visits per hour, status codes, page cache hits and top pages from the access log"""
+        def show():
+            stats = self.update_traffic_stats()
+            self.show_native_alert(
+                title="Onion.Press Traffic Stats",
+                message="\n".join(stats.report_lines(page_cache=self.read_page_cache_stats())),
+                buttons=["OK"],
+                default_button=0,
+                style="informational"
+            )
+
+        threading.Thread(target=show, daemon=True).start()
+
     @rumps.clicked("Copy Onion Address")
     def copy_address(self, _):
         """Copy onion address to clipboard"""
@@ -990,55 +1166,45 @@ class OnionPressApp(rumps.App):
 
         def check_for_tor():
             tor_browser_path = "/Applications/Tor Browser.app"
-            timeout = 600  # 10 minutes
-            check_interval = 3  # Check every 3 seconds
-            elapsed = 0
-
-            while elapsed < timeout and self.monitoring_tor_install:
-                time.sleep(check_interval)
-                elapsed += check_interval
-
-                # Verify the app is in /Applications and is a proper app bundle
-                if os.path.exists(tor_browser_path) and os.path.isdir(tor_browser_path):
-                    # Check it's actually in /Applications (not on a volume)
-                    real_path = os.path.realpath(tor_browser_path)
-                    if not real_path.startswith("/Applications/"):
-                        continue  # It's a symlink or on a volume, keep waiting
-
-                    # Verify it's a proper app bundle with executable
-                    executable_path = os.path.join(tor_browser_path, "Contents", "MacOS", "firefox")
-                    if not os.path.exists(executable_path):
-                        continue  # Not fully installed yet
-
-                    self.log("Tor Browser detected in Applications!")
-                    self.monitoring_tor_install = False
-
-                    # Dismiss setup dialog before showing browser ready dialog
-                    self.dismiss_setup_dialog()
-
-                    # Show dialog asking if they want to open the site
-                    address = self.onion_address
-                    try:
-                        button_index = self.show_native_alert(
-                            title="Onion.Press",
-                            message=f"Tor Browser is now installed!\n\nWould you like to open your site?\n\n{address}",
-                            buttons=["Open Site", "Later"],
-                            default_button=0,
-                            style="informational"
-                        )
-
-                        if button_index == 0:  # Open Site
-                            url = f"http://{address}"
-                            # Use full path to ensure we open the one in Applications
-                            subprocess.run(["open", "-a", tor_browser_path, url])
-                            self.log(f"Opened site in Tor Browser: {url}")
-                    except Exception as e:
-                        self.log(f"Error showing Tor Browser ready dialog: {e}")
-                    return
+            executable_path = os.path.join(tor_browser_path, "Contents", "MacOS", "firefox")
+
+            def installed_or_cancelled():
+                return (not self.monitoring_tor_install
+                        or self.browser_installed(tor_browser_path, executable_path))
+
+            # Check every 3 seconds at first, backing off while nothing changes, for up to 10 minutes
+            found = self.scheduler.wait_until("browser-install", installed_or_cancelled,
+                                              timeout=600, initial=3, maximum=15, baseline=3)
+            if not found or not self.monitoring_tor_install:
+                # Timeout reached
+                self.monitoring_tor_install = False
+                self.log("Tor Browser installation monitor timed out")
+                return
 
-            # Timeout reached
+            self.log("Tor Browser detected in Applications!")
             self.monitoring_tor_install = False
-            self.log("Tor Browser installation monitor timed out")
+
+            # Dismiss setup dialog before showing browser ready dialog
+            self.dismiss_setup_dialog()
+
+            # Show dialog asking if they want to open the site
+            address = self.onion_address
+            try:
+                button_index = self.show_native_alert(
+                    title="Onion.Press",
+                    message=f"Tor Browser is now installed!\n\nWould you like to open your site?\n\n{address}",
+                    buttons=["Open Site", "Later"],
+                    default_button=0,
+                    style="informational"
+                )
+
+                if button_index == 0:  # Open Site
+                    url = f"http://{address}"
+                    # Use full path to ensure we open the one in Applications
+                    subprocess.run(["open", "-a", tor_browser_path, url])
+                    self.log(f"Opened site in Tor Browser: {url}")
+            except Exception as e:
+                self.log(f"Error showing Tor Browser ready dialog: {e}")
 
         threading.Thread(target=check_for_tor, daemon=True).start()
 
@@ -1052,59 +1218,58 @@ class OnionPressApp(rumps.App):
 
         def check_for_brave():
             brave_browser_path = "/Applications/Brave Browser.app"
-            timeout = 600  # 10 minutes
-            check_interval = 3  # Check every 3 seconds
-            elapsed = 0
-
-            while elapsed < timeout and self.monitoring_tor_install:
-                time.sleep(check_interval)
-                elapsed += check_interval
-
-                # Verify the app is in /Applications and is a proper app bundle
-                if os.path.exists(brave_browser_path) and os.path.isdir(brave_browser_path):
-                    # Check it's actually in /Applications (not on a volume)
-                    real_path = os.path.realpath(brave_browser_path)
-                    if not real_path.startswith("/Applications/"):
-                        continue  # It's a symlink or on a volume, keep waiting
-
-                    # Verify it's a proper app bundle with executable
-                    executable_path = os.path.join(brave_browser_path, "Contents", "MacOS", "Brave Browser")
-                    if not os.path.exists(executable_path):
-                        continue  # Not fully installed yet
-
-                    self.log("Brave Browser detected in Applications!")
-                    self.monitoring_tor_install = False
-
-                    # Dismiss setup dialog before showing browser ready dialog
-                    self.dismiss_setup_dialog()
-
-                    # Show dialog asking if they want to open the site
-                    address = self.onion_address
-                    try:
-                        button_index = self.show_native_alert(
-                            title="Onion.Press",
-                            message=f"Brave Browser is now installed!\n\nWould you like to open your site?\n\n{address}",
-                            buttons=["Open Site", "Later"],
-                            default_button=0,
-                            style="informational"
-                        )
-
-                        if button_index == 0:  # Open Site
-                            url = f"http://{address}"
-                            # Launch Brave in Tor mode using executable with --tor flag
-                            brave_executable = os.path.join(brave_browser_path, "Contents", "MacOS", "Brave Browser")
-                            subprocess.run([brave_executable, "--tor", url])
-                            self.log(f"Opened site in Brave Browser (Tor mode): {url}")
-                    except Exception as e:
-                        self.log(f"Error showing Brave Browser ready dialog: {e}")
-                    return
+            brave_executable = os.path.join(brave_browser_path, "Contents", "MacOS", "Brave Browser")
+
+            def installed_or_cancelled():
+                return (not self.monitoring_tor_install
+                        or self.browser_installed(brave_browser_path, brave_executable))
+
+            # Check every 3 seconds at first, backing off while nothing changes, for up to 10 minutes
+            found = self.scheduler.wait_until("browser-install", installed_or_cancelled,
+                                              timeout=600, initial=3, maximum=15, baseline=3)
+            if not found or not self.monitoring_tor_install:
+                # Timeout reached
+                self.monitoring_tor_install = False
+                self.log("Brave Browser installation monitor timed out")
+                return
 
-            # Timeout reached
+            self.log("Brave Browser detected in Applications!")
             self.monitoring_tor_install = False
-            self.log("Brave Browser installation monitor timed out")
+
+            # Dismiss setup dialog before showing browser ready dialog
+            self.dismiss_setup_dialog()
+
+            # Show dialog asking if they want to open the site
+            address = self.onion_address
+            try:
+                button_index = self.show_native_alert(
+                    title="Onion.Press",
+                    message=f"Brave Browser is now installed!\n\nWould you like to open your site?\n\n{address}",
+                    buttons=["Open Site", "Later"],
+                    default_button=0,
+                    style="informational"
+                )
+
+                if button_index == 0:  # Open Site
+                    url = f"http://{address}"
+                    # Launch Brave in Tor mode using executable with --tor flag
+                    subprocess.run([brave_executable, "--tor", url])
+                    self.log(f"Opened site in Brave Browser (Tor mode): {url}")
+            except Exception as e:
+                self.log(f"Error showing Brave Browser ready dialog: {e}")
 
         threading.Thread(target=check_for_brave, daemon=True).start()
 
+    def browser_installed(self, app_path, executable_path):
+        """Return True once a browser app bundle is fully installed in /Applications"""
+        if not (os.path.exists(app_path) and os.path.isdir(app_path)):
+            return False
+        # Check it's actually in /Applications (not a symlink or on a volume)
+        if not os.path.realpath(app_path).startswith("/Applications/"):
+            return False
+        # Verify it's a proper app bundle with executable (not still copying)
+        return os.path.exists(executable_path)
+
     def update_browser_menu_title(self):
         """Update the browser menu item title based on which browser is available"""
         tor_browser_path = "/Applications/Tor Browser.app"
@@ -1202,7 +1367,7 @@ class OnionPressApp(rumps.App):
     @rumps.clicked("Start")
     def start_service(self, _):
         """Start the WordPress + Tor service"""
-        self.menu["Starting..."].title = "Status: Starting..."
+        self.status.publish(transition="Starting")
 
         def start():
             # Check if this is first run (no docker images yet)
@@ -1232,8 +1397,14 @@ class OnionPressApp(rumps.App):
             except Exception:
                 pass
 
+            # Pull all images in parallel first so the splash can show byte-level progress
+            # (compose then finds them present)
+            if first_run:
+                self.pull_images_with_progress()
+
             # Start the service
-            subprocess.run([self.launcher_script, "start"])
+            with self.tracer.span("launcher_start"):
+                subprocess.run([self.launcher_script, "start"])
 
             # If first run, start containers directly (which will pull images automatically)
             if first_run:
@@ -1253,13 +1424,15 @@ class OnionPressApp(rumps.App):
                                     key, val = line.split('=', 1)
                                     # Strip surrounding single quotes
                                     env[key] = val.strip("'")
+                    # Same compose files and Tor upstream the launcher selected
+                    env.update(self.read_compose_env())
                     # Use the bundled docker binary
                     docker_bin = os.path.join(self.bin_dir, "docker")
                     # Run in separate thread so it doesn't block
                     def pull_and_start():
                         # Don't capture output - let it stream to log file
                         docker_log = os.path.join(self.app_support, "docker-pull.log")
-                        with open(docker_log, 'w') as log_file:
+                        with open(docker_log, 'w') as log_file, self.tracer.span("compose_up"):
                             result = subprocess.run(
                                 [docker_bin, "compose", "up", "-d"],
                                 cwd=docker_dir,
@@ -1273,66 +1446,54 @@ class OnionPressApp(rumps.App):
                             self.log("Containers started")
 
                     threading.Thread(target=pull_and_start, daemon=True).start()
-                    # Monitor downloads in background (don't block WordPress health polling)
-                    threading.Thread(target=self.monitor_image_downloads, daemon=True).start()
                 except Exception as e:
                     self.log(f"Error starting containers: {e}")
 
-            # Poll until WordPress is responding (replaces fixed sleep)
-            max_wait = 60
-            waited = 0
-            while waited < max_wait:
-                if self.check_wordpress_health(log_result=False):
-                    self.log(f"WordPress responding after {waited}s")
-                    break
-                time.sleep(2)
-                waited += 2
+            # Wait for the status checker's readiness pass to see WordPress respond
+            started = time.time()
+            self.scheduler.wake("status")
+            self.status.publish(transition=None)
+            if self.readiness.wait_for(lambda r: r.wordpress_ready, timeout=60):
+                self.log(f"WordPress responding after {int(time.time() - started)}s")
 
+            # Starts caffeinate (via on_status_checked) to prevent sleep while service runs
             self.check_status()
 
-            # Start caffeinate to prevent sleep while service runs
-            self.start_caffeinate()
-
         threading.Thread(target=start, daemon=True).start()
 
     @rumps.clicked("Stop")
     def stop_service(self, _):
         """Stop the WordPress + Tor service"""
-        self.menu["Starting..."].title = "Status: Stopping..."
+        self.status.publish(transition="Stopping")
 
         def stop():
             subprocess.run([self.launcher_script, "stop"])
             time.sleep(1)
-            self.check_status()
+            self.status.publish(transition=None)
 
-            # Stop caffeinate to allow Mac to sleep
-            self.stop_caffeinate()
+            # Stops caffeinate (via on_status_checked) to allow Mac to sleep
+            self.check_status()
 
         threading.Thread(target=stop, daemon=True).start()
 
     @rumps.clicked("Restart")
     def restart_service(self, _):
         """Restart the WordPress + Tor service"""
-        self.menu["Starting..."].title = "Status: Restarting..."
-        self.icon = self.icon_starting  # Change icon to indicate restarting
+        # Mark as not ready during restart (icon changes to indicate restarting)
+        self.status.publish(transition="Restarting", ready=False)
 
         def restart():
-            # Mark as not ready during restart
-            self.is_ready = False
-            self.is_running = False
+            self.readiness.clear()
 
             # Run restart command
             subprocess.run([self.launcher_script, "restart"])
+            self.status.publish(transition=None)
 
-            # Poll until WordPress is responding (replaces fixed sleep)
-            max_wait = 60
-            waited = 0
-            while waited < max_wait:
-                if self.check_wordpress_health(log_result=False):
-                    self.log(f"WordPress responding after restart ({waited}s)")
-                    break
-                time.sleep(2)
-                waited += 2
+            # Wait for the status checker's readiness pass to see WordPress respond
+            started = time.time()
+            self.scheduler.wake("status")
+            if self.readiness.wait_for(lambda r: r.wordpress_ready, timeout=60):
+                self.log(f"WordPress responding after restart ({int(time.time() - started)}s)")
 
             # Check status after restart
             self.check_status()
@@ -1355,7 +1516,7 @@ class OnionPressApp(rumps.App):
             rumps.alert("Service not running. Please start the service first.")
             return
 
-        web_log_file = os.path.join(self.app_support, "wordpress-access.log")
+        web_log_file = os.path.join(self.app_support, web_log.WEB_LOG_FILENAME)
 
         # Ensure the log file exists
         if not os.path.exists(web_log_file):
@@ -1421,6 +1582,58 @@ class OnionPressApp(rumps.App):
         with open(config_file, 'w') as f:
             f.writelines(lines)
 
+    @rumps.clicked("Diagnostics...")
+    def show_diagnostics(self, _):
+        """Show probe latency percentiles, uptime history, VM sizing and cache stats"""
+        def show():
+            snapshot = self.status.snapshot
+            if snapshot.running and snapshot.ready:
+                current = "Up"
+            elif snapshot.running:
+                current = "Starting / degraded"
+            else:
+                current = "Stopped"
+
+            lines = [f"Status: {current}"]
+            if self.launch_duration is not None:
+                lines.append(f"Launched in {self.launch_duration}s")
+            lines.append("")
+            lines.append("Uptime (while running):")
+            lines.append(f"  24h: {self.uptime_log.format_uptime(86400)}")
+            lines.append(f"  7d:  {self.uptime_log.format_uptime(7 * 86400)}")
+            lines.append("")
+            lines.append("Container VM:")
+            lines.extend(f"  {line}" for line in vm_sizing.report_lines(self.app_support))
+            lines.append("")
+            lines.append("Object cache:")
+            # INFO runs in the Redis container, so gather off the main thread
+            info = object_cache.read_info(self.docker) if snapshot.running else None
+            lines.extend(f"  {line}" for line in object_cache.report_lines(info))
+            lines.append("")
+            lines.append("PHP OPcache:")
+            opcache = php_opcache.read_status(self.docker, self.app_support) if snapshot.running else None
+            lines.extend(f"  {line}" for line in php_opcache.report_lines(opcache))
+            lines.append("")
+            lines.append("Database cache:")
+            pool = buffer_pool.read_status(self.docker) if snapshot.running else None
+            lines.extend(f"  {line}" for line in buffer_pool.report_lines(pool))
+            lines.append("")
+            lines.append("Probe latency (this session):")
+            probe_lines = self.probe_stats.report_lines()
+            lines.extend(f"  {line}" for line in probe_lines)
+            if not probe_lines:
+                lines.append("  No probes run yet")
+
+            self.show_native_alert(
+                title="Onion.Press Diagnostics",
+                message="\n".join(lines),
+                buttons=["OK"],
+                default_button=0,
+                style="informational"
+            )
+
+        threading.Thread(target=show, daemon=True).start()
+
     @rumps.clicked("Settings...")
     def open_settings(self, _):
         """Open config file in default text editor"""
@@ -1577,8 +1790,9 @@ DO NOT share these words with anyone."""
             subprocess.run([self.launcher_script, "stop"], capture_output=True)
             time.sleep(2)
 
-            # Write the new key
+            # Write the new key (also invalidates the cached onion address)
             key_manager.write_private_key(key_bytes)
+            self.address_cache = None
 
             # Restart the service
             time.sleep(3)
@@ -1600,40 +1814,54 @@ DO NOT share these words with anyone."""
             )
 
     def update_docker_images(self, show_notifications=True):
-        """Update Docker images (WordPress, MariaDB, Tor)"""
+        """Update the active compose files' Docker images whose registry digest changed"""
         try:
             self.log("Checking for Docker image updates...")
 
-            docker_bin = os.path.join(self.bin_dir, "docker")
-            docker_compose_file = os.path.join(self.parent_resources_dir, "docker", "docker-compose.yml")
-
-            # Set up environment
-            env = os.environ.copy()
-            env["DOCKER_HOST"] = f"unix://{self.colima_home}/default/docker.sock"
-            env["DOCKER_CONFIG"] = os.path.join(self.app_support, "docker-config")
-
-            # Pull latest images
-            self.log("Pulling latest Docker images...")
-            result = subprocess.run(
-                [docker_bin, "compose", "-f", docker_compose_file, "pull"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=300,  # 5 minute timeout
-                env=env
+            # One conditional manifest request per image instead of a pull each; the
+            # same images as the launcher's update_images (optional services, variant)
+            images = self.compose_images()
+            registry_url = self.read_config_value("IMAGE_REGISTRY_URL", "") or image_updates.DEFAULT_REGISTRY_URL
+            cache = image_updates.DigestCache()
+            results = image_updates.check_images(
+                [image for image, _ in images], cache,
+                docker=self.docker, registry_url=registry_url,
+                # An explicit "Check for Updates..." always asks the registry
+                max_age=0 if show_notifications else image_updates.CACHE_FRESH_SECONDS,
             )
-
-            if result.returncode == 0:
-                self.log("Docker images updated successfully")
-                if "Downloaded" in result.stdout or "Pulled" in result.stdout:
-                    return True
+            changed = []
+            for image, platform in images:
+                state, digest = results[image]
+                if state == image_updates.CHANGED:
+                    self.log(f"Update available for {image}")
+                    changed.append((image, platform))
+                elif state == image_updates.UNKNOWN:
+                    self.log(f"✗ Could not check {image} for updates (continuing with cached version)")
                 else:
-                    return False
-            else:
-                self.log(f"Failed to update Docker images: {result.stderr}")
+                    self.log(f"✓ {image} up to date")
+            if not changed:
+                self.log("Docker images are up to date")
                 return False
 
+            # Pull only the changed images, all at once
+            self.log(f"Pulling {len(changed)} updated Docker image(s)...")
+            try:
+                progress = image_pull.pull_images(self.docker, images=changed, log=self.log)
+            except docker_api.DockerAPIError as e:
+                self.log(f"Failed to update Docker images: {e}")
+                return False
+
+            for image, _ in changed:
+                if progress.images_done.get(image):
+                    cache.set(image, results[image][1])
+            if not all(progress.images_done.values()):
+                self.log("Failed to update some Docker images (continuing with cached versions)")
+            else:
+                self.log("Docker images updated successfully")
+            for image in sorted(progress.updated):
+                self.log(f"✓ Downloaded newer image: {image}")
+            return bool(progress.updated)
+
         except Exception as e:
             self.log(f"Error updating Docker images: {e}")
             return False
@@ -1740,46 +1968,52 @@ DO NOT share these words with anyone."""
             # Note: Native NSAlert dialogs close when user clicks a button
             # We can't programmatically force-close them, but they auto-close on completion
 
-    def monitor_image_downloads(self):
-        """Monitor Docker image downloads and show progress notifications"""
-        images_to_check = {
-            'wordpress': False,
-            'mariadb': False,
-            'tor': False
-        }
+    def update_splash_progress(self, text):
+        """Replace the launch splash's estimated-time line - thread-safe"""
+        def update():
+            if self.launch_splash and self.launch_splash_time_field:
+                self.launch_splash_time_field.setStringValue_(text)
 
-        self.log("Monitoring image downloads...")
+        AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(update)
 
-        # Check for images every 3 seconds for up to 10 minutes
-        for i in range(200):
-            try:
-                result = subprocess.run(
-                    ["docker", "images", "--format", "{{.Repository}}"],
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
-                    timeout=5
-                )
-                current_images = result.stdout.strip().split('\n')
+    def pull_images_with_progress(self):
+        """Pull all images concurrently via the Engine API, showing progress on the splash
 
-                # Check each image
-                for image_name in images_to_check:
-                    if not images_to_check[image_name]:
-                        if any(image_name in img for img in current_images):
-                            images_to_check[image_name] = True
-                            self.log(f"Image downloaded: {image_name}")
+        Returns the PullProgress, or None if the API is unreachable or every
+        image is bundled with the app (the launcher then loads or pulls them).
+        """
+        # Images shipped in the app bundle are loaded from disk by the launcher
+        bundled = image_pull.bundled_images(os.path.join(self.parent_resources_dir, "images"))
+        images = [(image, platform) for image, platform in self.compose_images() if image not in bundled]
+        if bundled:
+            self.log(f"{len(bundled)} image(s) bundled with the app - skipping their download")
+        if not images:
+            self.update_splash_progress("Loading bundled images...")
+            return None
 
-                # If all images are downloaded, we're done
-                if all(images_to_check.values()):
-                    self.log("All images downloaded")
-                    break
+        self.log("Pulling images in parallel...")
+        last_text = [None]
 
-            except Exception as e:
-                self.log(f"Error checking images: {e}")
-                pass
+        def on_progress(progress):
+            text = progress.describe()
+            if text != last_text[0]:
+                last_text[0] = text
+                self.update_splash_progress(text)
 
-            time.sleep(3)
+        try:
+            with self.tracer.span("image_pulls"):
+                progress = image_pull.pull_images(self.docker, images=images, on_progress=on_progress, log=self.log)
+        except docker_api.DockerAPIError as e:
+            self.log(f"Parallel image pull unavailable ({e}) - compose will pull images")
+            return None
+
+        downloaded, _, _, _ = progress.snapshot()
+        elapsed = time.monotonic() - progress.started_at
+        if all(progress.images_done.values()):
+            self.log(f"All images downloaded ({image_pull.format_bytes(downloaded)} in {int(elapsed)}s)",
+                     component="images", duration=elapsed, bytes=downloaded)
+        self.update_splash_progress("Starting services...")
+        return progress
 
     @rumps.clicked("About Onion.Press")
     def show_about(self, _):
@@ -1942,8 +2176,11 @@ GitHub: github.com/brewsterkahle/onion.press"""
         self.log("QUIT BUTTON CLICKED - v2.2.49 RUNNING")
         self.log("="*60)
 
+        self.log(self.scheduler.summary())
+
         # Stop monitoring immediately
         self.monitoring_tor_install = False
+        self.scheduler.wake()
         self.dismiss_setup_dialog()
         self.stop_web_log_capture()
 
@@ -1983,6 +2220,7 @@ GitHub: github.com/brewsterkahle/onion.press"""
                 self.log(f"Warning: Colima stop failed: {e}")
 
             # Now quit
+            self.logger.flush()
             rumps.quit_application()
 
         # Start cleanup thread
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Object cache stats for onion.press
+With OBJECT_CACHE=yes the stack runs a Redis container that WordPress uses
+as its persistent object cache (the object-cache.php drop-in the launcher
+installs). This module reads `redis-cli INFO` from that container through
+the Docker Engine API and turns it into hit ratio and memory lines for the
+Diagnostics dialog.
+
+Usage:
+    python3 object_cache.py
+"""
+
+import sys
+
+import docker_api
+
+CONTAINER_NAME = "onionpress-redis"
+
+
+def parse_info(text):
+    """Parse INFO output ("key:value" lines, "# Section" headers) into a dict"""
+    info = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and ":" in line:
+            key, value = line.split(":", 1)
+            info[key] = value
+    return info
+
+
+def key_count(info):
+    """Keys in all databases (db0:keys=12,expires=3,avg_ttl=0)"""
+    total = 0
+    for name, value in info.items():
+        if name.startswith("db") and name[2:].isdigit():
+            for field in value.split(","):
+                if field.startswith("keys="):
+                    total += int(field[5:])
+    return total
+
+
+def read_info(docker, timeout=5):
+    """INFO from the Redis container, or None when it isn't running"""
+    try:
+        container = docker.inspect_container(CONTAINER_NAME)
+        if not container.get("State", {}).get("Running"):
+            return None
+        code, stdout, _ = docker.exec_run(CONTAINER_NAME, ["redis-cli", "INFO"], timeout=timeout)
+    except docker_api.DockerAPIError:
+        return None
+    if code != 0:
+        return None
+    return parse_info(stdout.decode("utf-8", errors="replace"))
+
+
+def report_lines(info):
+    """Lines for the Diagnostics dialog"""
+    if info is None:
+        return ["Off (set OBJECT_CACHE=yes in Settings to enable)"]
+    hits = int(info.get("keyspace_hits", 0))
+    misses = int(info.get("keyspace_misses", 0))
+    lines = [f"Redis {info.get('redis_version', '?')}, {key_count(info)} keys"]
+    if hits + misses:
+        lines.append(f"Hits: {hits * 100.0 / (hits + misses):.1f}% ({hits} hits, {misses} misses)")
+    else:
+        lines.append("Hits: no lookups yet")
+    maxmemory = int(info.get("maxmemory", 0))
+    memory = f"Memory: {info.get('used_memory_human', '?')}"
+    if maxmemory:
+        memory += f" of {maxmemory / (1024 * 1024):.0f} MB"
+    evicted = int(info.get("evicted_keys", 0))
+    if evicted:
+        memory += f", {evicted} keys evicted"
+    lines.append(memory)
+    return lines
+
+
+def main():
+    if len(sys.argv) > 1:
+        print("Usage: object_cache.py")
+        sys.exit(1)
+    docker = docker_api.DockerClient()
+    for line in report_lines(read_info(docker)):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
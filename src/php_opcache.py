@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+PHP OPcache stats for onion.press
+The launcher mounts an OPcache profile into the wordpress container and
+copies a small status script into the document root. The script answers
+only from inside the web containers with the token the launcher keeps in
+~/.onion.press/shared/php/status-token, so this module runs curl (Apache)
+or wget (nginx in the PHP-FPM variant) there through the Docker Engine API
+and turns the JSON into hit rate and memory lines for the Diagnostics dialog.
+
+Usage:
+    python3 php_opcache.py
+"""
+
+import json
+import os
+import sys
+
+import docker_api
+import vm_sizing
+
+STATUS_URL = "http://127.0.0.1/onionpress-opcache-status.php"
+
+
+def read_token(data_dir):
+    try:
+        with open(os.path.join(data_dir, "shared", "php", "status-token"), 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def status_command(token, variant):
+    """The fetch command and the container to run it in, for the stack variant"""
+    header = f"X-Onionpress-Token: {token}"
+    if variant == "fpm":
+        return "onionpress-web", ["wget", "-q", "-O", "-", "--header", header, STATUS_URL]
+    return "onionpress-wordpress", ["curl", "-s", "-f", "-H", header, STATUS_URL]
+
+
+def read_status(docker, data_dir, timeout=10):
+    """OPcache status from the running stack, or None when it can't be read"""
+    token = read_token(data_dir)
+    if not token:
+        return None
+    variant = vm_sizing.read_key_values(os.path.join(data_dir, "compose-env")).get("STACK_VARIANT", "apache")
+    container, cmd = status_command(token, variant)
+    try:
+        code, stdout, _ = docker.exec_run(container, cmd, timeout=timeout)
+    except docker_api.DockerAPIError:
+        return None
+    if code != 0:
+        return None
+    try:
+        return json.loads(stdout.decode("utf-8", errors="replace"))
+    except ValueError:
+        return None
+
+
+def format_mb(value):
+    return f"{value / (1024 * 1024):.0f} MB"
+
+
+def report_lines(status):
+    """Lines for the Diagnostics dialog"""
+    if status is None:
+        return ["Status unavailable (stack not running or still starting)"]
+    if not status.get("opcache_enabled"):
+        return ["Off"]
+
+    stats = status.get("opcache_statistics") or {}
+    hits = stats.get("hits", 0)
+    misses = stats.get("misses", 0)
+    lines = []
+    if hits + misses:
+        lines.append(f"Hits: {hits * 100.0 / (hits + misses):.1f}% ({hits} hits, {misses} misses)")
+    else:
+        lines.append("Hits: no scripts run yet")
+
+    memory = status.get("memory_usage") or {}
+    used = memory.get("used_memory", 0)
+    total = used + memory.get("free_memory", 0) + memory.get("wasted_memory", 0)
+    line = f"Memory: {format_mb(used)} of {format_mb(total)}"
+    if memory.get("wasted_memory"):
+        line += f" ({memory.get('current_wasted_percentage', 0):.1f}% wasted)"
+    lines.append(line)
+
+    strings = status.get("interned_strings_usage") or {}
+    if strings.get("buffer_size"):
+        lines.append(f"Interned strings: {format_mb(strings.get('used_memory', 0))} "
+                     f"of {format_mb(strings['buffer_size'])}")
+
+    line = f"Scripts: {stats.get('num_cached_scripts', 0)} cached"
+    if stats.get("max_cached_keys"):
+        line += f" (table holds {stats['max_cached_keys']})"
+    preload = status.get("preload_statistics") or {}
+    if preload.get("scripts"):
+        line += f", {len(preload['scripts'])} preloaded"
+    lines.append(line)
+
+    restarts = stats.get("oom_restarts", 0) + stats.get("hash_restarts", 0)
+    if restarts:
+        lines.append(f"Restarts since start: {restarts} (cache full - raise the sizing)")
+
+    jit = status.get("jit") or {}
+    if jit.get("on"):
+        lines.append(f"JIT: on, {format_mb(jit.get('buffer_size', 0) - jit.get('buffer_free', 0))} "
+                     f"of {format_mb(jit.get('buffer_size', 0))} used")
+    return lines
+
+
+def main():
+    if len(sys.argv) > 1:
+        print("Usage: php_opcache.py")
+        sys.exit(1)
+    docker = docker_api.DockerClient()
+    data_dir = os.path.expanduser("~/.onion.press")
+    for line in report_lines(read_status(docker, data_dir)):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
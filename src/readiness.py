@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Readiness engine for onion.press
+Runs the hostname, Tor bootstrap, local HTTP and tor->wordpress probes
+(plus, with DB_WARM_WAIT=yes, the database buffer pool warm-up) concurrently,
+each under its own deadline, and publishes a single result to
+~/.onion.press/readiness. The menubar app is the only prober while it runs;
+the bash launcher (wait_for_services) reads the published file instead of
+probing again.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import buffer_pool
+import docker_api
+import tor_log
+
+# Per-probe deadlines in seconds
+DEFAULT_DEADLINES = {
+    "hostname": 3,
+    "bootstrap": 3,
+    "local_http": 4,
+    "tor_to_wordpress": 8,
+    "db_warm": 4,
+}
+
+# How long a published result counts as fresh for readers (launcher uses the same value)
+PUBLISH_MAX_AGE = 15
+
+
+class ProbeResult:
+    """Outcome of one probe"""
+
+    __slots__ = ("name", "ok", "detail", "duration", "skipped")
+
+    def __init__(self, name, ok, detail="", duration=0.0, skipped=False):
+        self.name = name
+        self.ok = ok
+        self.detail = detail
+        self.duration = duration
+        self.skipped = skipped  # Answered from a cache; duration isn't a real probe latency
+
+
+class ReadinessResult:
+    """Combined outcome of one readiness pass"""
+
+    def __init__(self, probes, checked_at):
+        self.probes = probes
+        self.checked_at = checked_at
+        hostname = probes["hostname"]
+        self.onion_address = hostname.detail if hostname.ok else None
+        # Only probed when readiness waits for the buffer pool warm-up
+        db_warm = probes.get("db_warm")
+        self.wordpress_ready = probes["local_http"].ok and (db_warm is None or db_warm.ok)
+        self.onion_ready = (
+            hostname.ok and probes["bootstrap"].ok and probes["tor_to_wordpress"].ok
+        )
+        self.ready = self.wordpress_ready and self.onion_ready
+
+
+class ReadinessEngine:
+    """Concurrent single-pass readiness checks shared by the menubar and launcher"""
+
+    def __init__(self, docker, docker_bin, state_file, local_url="http://localhost:8080",
+                 deadlines=None, tor_log_follower=None, upstream=None, warm_wait=None):
+        self.docker = docker
+        # Callable returning the service Tor forwards to (wordpress, web or cache-proxy)
+        self.upstream = upstream or (lambda: "wordpress")
+        # Callable returning whether WordPress counts as ready only once the buffer pool is warm
+        self.warm_wait = warm_wait or (lambda: False)
+        self.tor_log_follower = tor_log_follower
+        self.docker_bin = docker_bin
+        self.state_file = state_file
+        self.local_url = local_url
+        self.deadlines = dict(DEFAULT_DEADLINES, **(deadlines or {}))
+        self.last_result = None
+        self._executor = ThreadPoolExecutor(max_workers=len(self.deadlines),
+                                            thread_name_prefix="readiness")
+        self._run_lock = threading.Lock()
+        self._published = threading.Condition()
+
+    # -- probes ---------------------------------------------------------
+
+    def _docker_cli(self, args, timeout):
+        """Fallback for when the Docker socket is unusable"""
+        return subprocess.run(
+            [self.docker_bin] + list(args),
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            timeout=timeout
+        )
+
+    def probe_hostname(self, deadline):
+        """Read the onion hostname from the Tor container"""
+        try:
+            data = self.docker.read_file("onionpress-tor", docker_api.HOSTNAME_PATH, timeout=deadline)
+            hostname = data.decode("utf-8", errors="replace").strip()
+        except docker_api.DockerAPIError as e:
+            if e.status is not None:
+                return False, "Hidden service hostname file not found"
+            result = self._docker_cli(["exec", "onionpress-tor", "cat", docker_api.HOSTNAME_PATH],
+                                      deadline)
+            hostname = result.stdout.strip() if result.returncode == 0 else ""
+        if not hostname:
+            return False, "Hidden service hostname file not found"
+        return True, hostname
+
+    def bootstrap_from_follower(self, deadline):
+        """O(1): answer the bootstrap probe from the lines the Tor log follower already parsed"""
+        state = self.tor_log_follower.state
+        if not state.bootstrapped:
+            return False, f"Tor not fully bootstrapped yet ({state.bootstrap_percent}%)"
+        if state.publish_status == tor_log.PUBLISH_FAILED or state.recent_errors():
+            return False, "Tor errors detected in logs"
+        return True, "Tor bootstrapped"
+
+    def probe_bootstrap(self, deadline):
+        """Check the last 100 Tor log lines for a completed bootstrap and no publish errors"""
+        try:
+            stdout, stderr = self.docker.logs("onionpress-tor", tail=100, timeout=deadline)
+            log_text = (stdout + stderr).decode("utf-8", errors="replace")
+        except docker_api.DockerAPIError as e:
+            if e.status is not None:
+                return False, "Tor container not available"
+            result = self._docker_cli(["logs", "--tail", "100", "onionpress-tor"], deadline)
+            log_text = result.stdout + result.stderr
+
+        if "Bootstrapped 100% (done)" not in log_text:
+            return False, "Tor not fully bootstrapped yet"
+        if "ERROR" in log_text or "failed to publish" in log_text.lower():
+            return False, "Tor errors detected in logs"
+        return True, "Tor bootstrapped"
+
+    def probe_local_http(self, deadline):
+        """Check WordPress answers on localhost:8080"""
+        # Use curl instead of urllib to avoid "local network" permission prompt
+        result = subprocess.run(
+            ["curl", "-s", "--max-time", str(max(1, deadline - 1)), self.local_url],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            timeout=deadline
+        )
+        if result.returncode != 0:
+            return False, f"Connection failed (curl exit code {result.returncode})"
+        content = result.stdout
+        if ('Error establishing a database connection' in content
+                or 'Database connection error' in content):
+            return False, "Database connection error"
+        # Either the install page or actual WordPress content
+        return True, "WordPress responding"
+
+    def probe_tor_to_wordpress(self, deadline):
+        """Check WordPress is reachable from the Tor container over the Docker network
+
+        The SOCKS proxy at 127.0.0.1:9050 doesn't work through Colima VM port
+        forwarding, so this tests the actual path: tor -> wordpress (through
+        the cache proxy or nginx front when those are in the stack).
+        """
+        cmd = ["wget", "-q", "-O", "/dev/null", f"--timeout={max(1, deadline - 2)}",
+               f"http://{self.upstream()}:80/"]
+        try:
+            exit_code, _, _ = self.docker.exec_run("onionpress-tor", cmd, timeout=deadline)
+        except docker_api.DockerAPIError as e:
+            if e.status is not None:
+                return False, "Tor container not available"
+            exit_code = self._docker_cli(["exec", "onionpress-tor"] + cmd, deadline).returncode
+        if exit_code != 0:
+            return False, "WordPress not reachable from Tor container"
+        return True, "WordPress reachable from Tor container"
+
+    def probe_db_warm(self, deadline):
+        """Check MariaDB has finished loading the hot pages saved at its last shutdown"""
+        status = buffer_pool.read_status(self.docker, timeout=deadline)
+        if status is None:
+            return False, "Database not answering"
+        if buffer_pool.loading(status):
+            return False, f"Buffer pool warming up ({status.get('Innodb_buffer_pool_load_status')})"
+        return True, "Buffer pool warm"
+
+    # -- running --------------------------------------------------------
+
+    def _timed(self, name, probe):
+        deadline = self.deadlines[name]
+        start = time.monotonic()
+        try:
+            ok, detail = probe(deadline)
+        except subprocess.TimeoutExpired:
+            ok, detail = False, f"timed out after {deadline}s"
+        except Exception as e:
+            ok, detail = False, f"failed ({e})"
+        return ProbeResult(name, ok, detail, time.monotonic() - start)
+
+    def run(self, known_address=None):
+        """Run all probes concurrently, publish and return the ReadinessResult
+
+        known_address (from the address cache) skips reading the hostname file,
+        and a connected Tor log follower skips reading the Tor log.
+        """
+        if known_address:
+            hostname_probe = lambda deadline: (True, known_address)
+        else:
+            hostname_probe = self.probe_hostname
+        follower = self.tor_log_follower
+        from_follower = follower is not None and follower.connected
+        probes = {
+            "hostname": hostname_probe,
+            "bootstrap": self.bootstrap_from_follower if from_follower else self.probe_bootstrap,
+            "local_http": self.probe_local_http,
+            "tor_to_wordpress": self.probe_tor_to_wordpress,
+        }
+        if self.warm_wait():
+            probes["db_warm"] = self.probe_db_warm
+        with self._run_lock:
+            start = time.monotonic()
+            futures = {name: self._executor.submit(self._timed, name, probe)
+                       for name, probe in probes.items()}
+            # Probes enforce their own deadlines; this is a backstop for hung calls
+            wait(futures.values(), timeout=max(self.deadlines.values()) + 1)
+
+            results = {}
+            for name, future in futures.items():
+                if future.done():
+                    results[name] = future.result()
+                else:
+                    results[name] = ProbeResult(name, False, "deadline exceeded",
+                                                time.monotonic() - start)
+            if known_address:
+                results["hostname"].skipped = True
+            if from_follower:
+                results["bootstrap"].skipped = True
+            result = ReadinessResult(results, time.time())
+            self.publish(result)
+            return result
+
+    def publish(self, result):
+        """Atomically write the result where the launcher can read it"""
+        def flag(value):
+            return "yes" if value else "no"
+
+        lines = [
+            "# Written by the onion.press readiness engine - do not edit",
+            "SOURCE=menubar",
+            f"CHECKED_AT={int(result.checked_at)}",
+            f"READY={flag(result.ready)}",
+            f"WORDPRESS_READY={flag(result.wordpress_ready)}",
+            f"ONION_READY={flag(result.onion_ready)}",
+            f"ONION_ADDRESS={result.onion_address or ''}",
+        ]
+        for probe in result.probes.values():
+            lines.append(f"PROBE_{probe.name.upper()}={flag(probe.ok)} "
+                         f"{int(probe.duration * 1000)}ms")
+        temp_path = f"{self.state_file}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(temp_path, self.state_file)
+        except OSError:
+            pass
+
+        with self._published:
+            self.last_result = result
+            self._published.notify_all()
+
+    def wait_for(self, predicate, timeout):
+        """Block until a published result satisfies predicate; return it or None on timeout
+
+        Does not probe itself - the status checker is the one prober.
+        """
+        deadline = time.monotonic() + timeout
+        with self._published:
+            while True:
+                if self.last_result is not None and predicate(self.last_result):
+                    return self.last_result
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._published.wait(remaining)
+
+    def clear(self):
+        """Forget the last result (e.g. when containers stop or restart)"""
+        with self._published:
+            self.last_result = None
+        try:
+            os.unlink(self.state_file)
+        except OSError:
+            pass
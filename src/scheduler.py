@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Polling scheduler for onion.press
+One place that decides how long each background loop sleeps: exponential
+backoff while nothing changes, jitter so loops don't wake in lockstep, early
+wake when something happens, and longer intervals on battery power. Every
+timer wake costs energy on a caffeinated laptop, so it also counts how many
+wakeups were saved compared with the fixed intervals the loops used before.
+"""
+
+import random
+import subprocess
+import threading
+import time
+
+# How long a battery/AC reading stays valid
+POWER_CHECK_INTERVAL = 300
+
+
+class PollScheduler:
+    """Shared sleep/wait policy for the menubar app's polling loops"""
+
+    def __init__(self, battery_factor=2.0, jitter=0.1):
+        self.battery_factor = battery_factor
+        self.jitter = jitter
+        self.wakeups = 0
+        self.baseline_wakeups = 0.0
+        self._events = {}
+        self._lock = threading.Lock()
+        self._power_checked_at = None
+        self._on_battery = False
+
+    def on_battery(self):
+        """Return True when running on battery power (cached for a few minutes)"""
+        now = time.monotonic()
+        if self._power_checked_at is not None and now - self._power_checked_at < POWER_CHECK_INTERVAL:
+            return self._on_battery
+        try:
+            result = subprocess.run(["pmset", "-g", "ps"], capture_output=True, text=True,
+                                    encoding='utf-8', errors='replace', timeout=2)
+            self._on_battery = "Battery Power" in result.stdout
+        except Exception:
+            self._on_battery = False
+        self._power_checked_at = now
+        return self._on_battery
+
+    def _event(self, name):
+        with self._lock:
+            event = self._events.get(name)
+            if event is None:
+                event = self._events[name] = threading.Event()
+            return event
+
+    def wake(self, name=None):
+        """Wake the named loop (or every loop) before its timer fires"""
+        with self._lock:
+            events = [self._events[name]] if name in self._events else (
+                list(self._events.values()) if name is None else [])
+        if name is not None and not events:
+            events = [self._event(name)]  # Wake it as soon as it starts waiting
+        for event in events:
+            event.set()
+
+    def sleep(self, name, interval, baseline=None):
+        """Sleep for about interval seconds; return True if woken early
+
+        baseline is the fixed interval this loop used to poll at, for the
+        wakeups-saved count.
+        """
+        if self.on_battery():
+            interval *= self.battery_factor
+        interval *= 1 + random.uniform(-self.jitter, self.jitter)
+        event = self._event(name)
+        start = time.monotonic()
+        woken = event.wait(max(0.0, interval))
+        event.clear()
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self.wakeups += 1
+            self.baseline_wakeups += elapsed / baseline if baseline else 1
+        return woken
+
+    def wait_until(self, name, condition, timeout, initial=1.0, maximum=30.0, factor=1.5,
+                   baseline=None):
+        """Poll condition with exponential backoff until it is true or timeout expires
+
+        Returns True if the condition was met. An early wake() resets the
+        backoff to the initial interval.
+        """
+        deadline = time.monotonic() + timeout
+        interval = initial
+        while True:
+            if condition():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            woken = self.sleep(name, min(interval, remaining), baseline=baseline)
+            interval = initial if woken else min(interval * factor, maximum)
+
+    def wakeups_saved(self):
+        with self._lock:
+            return max(0, int(self.baseline_wakeups - self.wakeups))
+
+    def summary(self):
+        return (f"Scheduler: {self.wakeups} timer wakeups, "
+                f"{self.wakeups_saved()} saved vs fixed-interval polling")
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Startup tracer for onion.press
+Records start/end spans for each launch phase - the launcher's Colima
+initialization, the launcher's startup steps, the menubar app's init and
+waits, up to the first green icon - and writes them as one Chrome
+trace-event JSON file per launch (load it in chrome://tracing or Perfetto).
+
+The bash scripts and the menubar app all append complete ("ph": "X") events,
+one JSON object per line, to ~/.onion.press/traces/<launch id>.jsonl. The
+launch id comes from ONIONPRESS_TRACE_ID, which the launcher exports so every
+process started for one launch writes to the same file. When the icon first
+turns green the lines are merged into <launch id>.json.
+
+Usage:
+    python3 startup_trace.py --compare [N]   Compare phase durations of the last N launches
+    python3 startup_trace.py show [ID]       Print the spans of one launch (default: latest)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_DIR = os.path.expanduser("~/.onion.press/traces")
+KEEP_LAUNCHES = 20
+
+
+def now_us():
+    """Wall-clock time in microseconds (the bash scripts use the same clock via perl)"""
+    return int(time.time() * 1000000)
+
+
+class StartupTracer:
+    """Appends spans for the current launch"""
+
+    def __init__(self, trace_dir=TRACE_DIR, process_name="menubar"):
+        self.trace_dir = trace_dir
+        self.process_name = process_name
+        self.launch_id = os.environ.get("ONIONPRESS_TRACE_ID") or time.strftime("%Y%m%d-%H%M%S")
+        # Launch start as seen by the launcher, or our own start if launched directly
+        try:
+            self.launch_start_us = int(os.environ.get("ONIONPRESS_LAUNCH_START_US", ""))
+        except ValueError:
+            self.launch_start_us = now_us()
+        # Launcher invocations we spawn (start/restart) join this launch's trace
+        os.environ["ONIONPRESS_TRACE_ID"] = self.launch_id
+        os.environ["ONIONPRESS_LAUNCH_START_US"] = str(self.launch_start_us)
+        self.events_path = os.path.join(trace_dir, f"{self.launch_id}.jsonl")
+        self.finalized = False
+        self._lock = threading.Lock()
+
+    def record(self, name, start_us, end_us=None, tid=None, args=None):
+        """Append one complete span"""
+        end_us = end_us or now_us()
+        event = {
+            "name": name,
+            "cat": self.process_name,
+            "ph": "X",
+            "ts": start_us,
+            "dur": max(0, end_us - start_us),
+            "pid": os.getpid(),
+            "tid": tid or threading.current_thread().name,
+        }
+        if args:
+            event["args"] = args
+        line = json.dumps(event) + "\n"
+        with self._lock:
+            try:
+                os.makedirs(self.trace_dir, exist_ok=True)
+                with open(self.events_path, 'a') as f:
+                    f.write(line)
+            except OSError:
+                pass
+
+    @contextmanager
+    def span(self, name, tid=None, args=None):
+        start = now_us()
+        try:
+            yield
+        finally:
+            self.record(name, start, tid=tid, args=args)
+
+    def finalize(self):
+        """Merge this launch's spans into <launch id>.json; return its path or None"""
+        path = write_trace(self.events_path)
+        self.finalized = path is not None
+        prune(self.trace_dir)
+        return path
+
+
+def read_events(events_path):
+    events = []
+    try:
+        with open(events_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        pass  # Partially written line from a killed process
+    except OSError:
+        pass
+    return events
+
+
+def write_trace(events_path):
+    """Convert a .jsonl span file into a Chrome trace-event JSON file"""
+    events = read_events(events_path)
+    if not events:
+        return None
+    events.sort(key=lambda e: e.get("ts", 0))
+
+    # Name each process after the script or app that wrote its spans
+    metadata = []
+    seen = set()
+    for event in events:
+        pid = event.get("pid")
+        if pid not in seen:
+            seen.add(pid)
+            metadata.append({"name": "process_name", "ph": "M", "pid": pid,
+                             "args": {"name": f"{event.get('cat', 'onion.press')} ({pid})"}})
+
+    trace_path = events_path[:-len(".jsonl")] + ".json"
+    temp_path = f"{trace_path}.tmp"
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        os.replace(temp_path, trace_path)
+    except OSError:
+        return None
+    return trace_path
+
+
+def launch_ids(trace_dir=TRACE_DIR):
+    """Launch ids with a finalized trace, oldest first"""
+    try:
+        names = os.listdir(trace_dir)
+    except OSError:
+        return []
+    return sorted(name[:-len(".json")] for name in names if name.endswith(".json"))
+
+
+def prune(trace_dir=TRACE_DIR, keep=KEEP_LAUNCHES):
+    """Delete all but the newest launches"""
+    try:
+        names = os.listdir(trace_dir)
+    except OSError:
+        return
+    ids = sorted(set(name.split(".", 1)[0] for name in names))
+    for launch_id in ids[:-keep]:
+        for suffix in (".json", ".jsonl"):
+            try:
+                os.unlink(os.path.join(trace_dir, launch_id + suffix))
+            except OSError:
+                pass
+
+
+def span_durations(launch_id, trace_dir=TRACE_DIR):
+    """Return {"cat:name": total ms} for one finalized launch"""
+    try:
+        with open(os.path.join(trace_dir, f"{launch_id}.json"), 'r') as f:
+            events = json.load(f).get("traceEvents", [])
+    except (OSError, ValueError):
+        return {}
+    durations = {}
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        key = f"{event.get('cat', '?')}:{event.get('name', '?')}"
+        durations[key] = durations.get(key, 0) + event.get("dur", 0) / 1000.0
+    return durations
+
+
+def compare(count=5, trace_dir=TRACE_DIR):
+    """Print phase durations of the last count launches side by side"""
+    ids = launch_ids(trace_dir)[-count:]
+    if not ids:
+        print(f"No traces in {trace_dir}")
+        return
+    per_launch = [span_durations(launch_id, trace_dir) for launch_id in ids]
+    names = sorted(set(name for durations in per_launch for name in durations))
+    width = max([len(name) for name in names] + [4])
+
+    def cell(value):
+        return f"{value:>15.0f}" if value is not None else f"{'-':>15}"
+
+    print(f"{'span':<{width}}" + "".join(f"{launch_id:>16}" for launch_id in ids)
+          + (f"{'delta':>12}" if len(ids) > 1 else ""))
+    for name in names:
+        values = [durations.get(name) for durations in per_launch]
+        row = f"{name:<{width}}" + "".join(" " + cell(value) for value in values)
+        if len(ids) > 1 and values[-1] is not None and values[-2] is not None:
+            row += f"{values[-1] - values[-2]:>+12.0f}"
+        print(row)
+    print("(milliseconds; delta = latest launch minus the one before)")
+
+
+def show(launch_id=None, trace_dir=TRACE_DIR):
+    """Print the spans of one launch in start order"""
+    ids = launch_ids(trace_dir)
+    launch_id = launch_id or (ids[-1] if ids else None)
+    if not launch_id:
+        print(f"No traces in {trace_dir}")
+        return
+    events = [e for e in read_events(os.path.join(trace_dir, f"{launch_id}.jsonl"))
+              if e.get("ph") == "X"]
+    if not events:
+        print(f"No spans for launch {launch_id}")
+        return
+    events.sort(key=lambda e: e.get("ts", 0))
+    origin = events[0]["ts"]
+    for event in events:
+        print(f"{(event['ts'] - origin) / 1000.0:>10.0f}ms {event.get('dur', 0) / 1000.0:>10.0f}ms  "
+              f"{event.get('cat', '?')}:{event.get('name', '?')}")
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--compare":
+        count = int(args[1]) if len(args) > 1 else 5
+        compare(count)
+    elif args and args[0] == "show":
+        show(args[1] if len(args) > 1 else None)
+    else:
+        print("Usage: startup_trace.py --compare [N] | show [ID]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Central status store for onion.press
+Holds the service status as one immutable snapshot that is replaced
+atomically, and notifies subscribers only about the fields that changed.
+The menu, logging, splash, caffeinate and web log capture each subscribe to
+the fields they care about, so a status poll that finds nothing new does no
+work on the main thread.
+"""
+
+import threading
+
+# Fields that change what the menu bar shows
+VISIBLE_FIELDS = ("running", "ready", "onion_address", "transition")
+
+
+class StatusSnapshot:
+    """Immutable view of the service status"""
+
+    __slots__ = ("running", "ready", "onion_address", "transition", "checked_at")
+
+    def __init__(self, running=False, ready=False, onion_address="Starting...", transition=None,
+                 checked_at=None):
+        self.running = running              # Any of our containers is running
+        self.ready = ready                  # WordPress and the onion service both verified
+        self.onion_address = onion_address  # Address, or a placeholder like "Not running"
+        self.transition = transition        # "Starting"/"Stopping"/"Restarting" while a user action runs
+        self.checked_at = checked_at        # Time of the last completed status check
+
+    def replace(self, **changes):
+        values = {field: getattr(self, field) for field in self.__slots__}
+        values.update(changes)
+        return StatusSnapshot(**values)
+
+    def changed_fields(self, other):
+        return frozenset(field for field in self.__slots__
+                         if getattr(self, field) != getattr(other, field))
+
+
+class StatusStore:
+    """Publishes StatusSnapshots and dispatches change notifications"""
+
+    def __init__(self, initial=None, log=None):
+        self.snapshot = initial or StatusSnapshot()
+        self.log = log or (lambda message: None)
+        self._subscribers = []
+        # Reentrant so a subscriber may publish; serialises notifications so
+        # every subscriber sees changes in the order they were published
+        self._lock = threading.RLock()
+
+    def subscribe(self, callback, fields=None):
+        """Call callback(old, new) whenever one of fields changes (any field if None)"""
+        with self._lock:
+            self._subscribers.append((frozenset(fields) if fields else None, callback))
+
+    def publish(self, **changes):
+        """Apply changes atomically; notify subscribers; return the current snapshot"""
+        with self._lock:
+            old = self.snapshot
+            new = old.replace(**changes)
+            changed = old.changed_fields(new)
+            if not changed:
+                return old
+            self.snapshot = new
+            for fields, callback in list(self._subscribers):
+                if fields is None or fields & changed:
+                    try:
+                        callback(old, new)
+                    except Exception as e:
+                        self.log(f"Status subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+            return new
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Incremental Tor log follower for onion.press
+Follows the onionpress-tor container log over the Docker Engine API, parses
+each line exactly once and keeps a small state machine (bootstrap percent,
+descriptor publish status, recent errors) so readiness questions are answered
+in O(1) instead of re-reading `docker logs --tail 100` on every poll.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import docker_api
+
+BOOTSTRAP_RE = re.compile(r"Bootstrapped (\d+)%")
+
+# Errors older than this no longer block readiness
+ERROR_WINDOW = 300
+
+PUBLISH_UNKNOWN = "unknown"
+PUBLISH_UPLOADED = "uploaded"
+PUBLISH_FAILED = "failed"
+
+
+def parse_docker_timestamp(value):
+    """Convert Docker's RFC3339Nano timestamp to a float epoch, or None"""
+    try:
+        base, _, fraction = value.rstrip("Z").partition(".")
+        seconds = datetime.strptime(base, "%Y-%m-%dT%H:%M:%S")
+        epoch = (seconds - datetime(1970, 1, 1)).total_seconds()
+        return epoch + (float(f"0.{fraction}") if fraction else 0.0)
+    except ValueError:
+        return None
+
+
+class TorLogState:
+    """Immutable view of what the Tor log has told us so far"""
+
+    __slots__ = ("bootstrap_percent", "bootstrapped_at", "publish_status",
+                 "published_at", "errors", "lines_seen", "started_at")
+
+    def __init__(self, bootstrap_percent=0, bootstrapped_at=None, publish_status=PUBLISH_UNKNOWN,
+                 published_at=None, errors=(), lines_seen=0, started_at=None):
+        self.bootstrap_percent = bootstrap_percent
+        self.bootstrapped_at = bootstrapped_at
+        self.publish_status = publish_status
+        self.published_at = published_at
+        self.errors = tuple(errors)  # (timestamp, message) pairs, newest last
+        self.lines_seen = lines_seen
+        self.started_at = started_at
+
+    @property
+    def bootstrapped(self):
+        return self.bootstrap_percent >= 100
+
+    def recent_errors(self, window=ERROR_WINDOW, now=None):
+        """Errors logged within the last window seconds"""
+        cutoff = (now or time.time()) - window
+        return [(ts, msg) for ts, msg in self.errors if ts >= cutoff]
+
+
+class TorLogFollower:
+    """Background follower that feeds Tor log lines into TorLogState"""
+
+    def __init__(self, docker, container="onionpress-tor", max_errors=20, log=None):
+        self.docker = docker
+        self.container = container
+        self.max_errors = max_errors
+        self.log = log or (lambda message: None)
+        self.connected = False
+        self._lock = threading.Lock()
+        self._errors = deque(maxlen=max_errors)
+        self._reset_locked(None)
+        self._last_timestamp = None
+        self._thread = None
+
+    def _reset_locked(self, started_at):
+        self._bootstrap_percent = 0
+        self._bootstrapped_at = None
+        self._publish_status = PUBLISH_UNKNOWN
+        self._published_at = None
+        self._errors.clear()
+        self._lines_seen = 0
+        self._started_at = started_at
+        self.state = TorLogState(started_at=started_at)
+
+    def feed_line(self, line, timestamp=None):
+        """Parse one log line and advance the state machine"""
+        timestamp = timestamp or time.time()
+        lowered = line.lower()
+        with self._lock:
+            self._lines_seen += 1
+            match = BOOTSTRAP_RE.search(line)
+            if match:
+                percent = int(match.group(1))
+                self._bootstrap_percent = percent
+                if percent >= 100 and self._bootstrapped_at is None:
+                    self._bootstrapped_at = timestamp
+            if "failed to publish" in lowered or ("descriptor" in lowered and "upload" in lowered
+                                                   and "fail" in lowered):
+                self._publish_status = PUBLISH_FAILED
+                self._errors.append((timestamp, line.strip()))
+            elif "descriptor" in lowered and ("uploaded" in lowered or "published" in lowered):
+                self._publish_status = PUBLISH_UPLOADED
+                self._published_at = timestamp
+            elif "[err]" in lowered or "ERROR" in line:
+                self._errors.append((timestamp, line.strip()))
+
+            self.state = TorLogState(
+                bootstrap_percent=self._bootstrap_percent,
+                bootstrapped_at=self._bootstrapped_at,
+                publish_status=self._publish_status,
+                published_at=self._published_at,
+                errors=self._errors,
+                lines_seen=self._lines_seen,
+                started_at=self._started_at,
+            )
+
+    def _follow_once(self):
+        """Follow the current container run until the stream ends; return the new lines parsed"""
+        info = self.docker.inspect_container(self.container)
+        started_at = parse_docker_timestamp(info.get("State", {}).get("StartedAt", ""))
+        with self._lock:
+            if started_at != self._started_at:
+                # New container run: earlier lines describe a previous Tor process
+                self._reset_locked(started_at)
+                self._last_timestamp = None
+        since = self._last_timestamp or started_at
+
+        frames = self.docker.follow_logs(self.container, since=since, timestamps=True)
+        self.connected = True
+        fed = 0
+        pending = b""
+        for _, payload in frames:
+            pending += payload
+            while b"\n" in pending:
+                raw, pending = pending.split(b"\n", 1)
+                text = raw.decode("utf-8", errors="replace")
+                stamp, _, line = text.partition(" ")
+                timestamp = parse_docker_timestamp(stamp)
+                if timestamp is None:
+                    timestamp, line = time.time(), text
+                elif self._last_timestamp is not None and timestamp <= self._last_timestamp:
+                    continue  # Already parsed before a reconnect
+                else:
+                    self._last_timestamp = timestamp
+                self.feed_line(line, timestamp)
+                fed += 1
+        return fed
+
+    def _container_running(self):
+        try:
+            info = self.docker.inspect_container(self.container)
+        except (docker_api.DockerAPIError, OSError, ValueError):
+            return False
+        return bool((info or {}).get("State", {}).get("Running"))
+
+    def start(self):
+        """Start following in a daemon thread; reconnects when the container restarts"""
+        if self._thread is not None:
+            return
+
+        def run():
+            retry_delay = 2
+            outage = False
+            while True:
+                fed = 0
+                try:
+                    fed = self._follow_once()
+                except (docker_api.DockerAPIError, OSError, ValueError):
+                    pass
+                self.connected = False
+                # A stopped or crash-looping container ends the stream straight away;
+                # only a run that produced new lines and is still up resets the back-off
+                if fed and self._container_running():
+                    retry_delay = 2
+                    outage = False
+                elif not outage:
+                    outage = True
+                    self.log("Tor log follower disconnected - will reconnect")
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Traffic statistics for onion.press
+Parses the Apache combined-format lines in ~/.onion.press/wordpress-access.log
+as a stream and keeps running totals: requests and bytes per hour, status
+codes, and the most requested pages and user agents. Top pages and agents use
+a Space-Saving sketch, so memory stays bounded however many distinct URLs a
+site gets.
+
+A checkpoint (~/.onion.press/traffic-stats.json) stores the totals together
+with the byte offset reached in the log, so each update reads only the lines
+added since. When the log has rotated, the rest of the old file is read from
+its gzipped segment first.
+
+Pages served by the page cache plugin never reach PHP, so the hit ratio comes
+from here: cacheable requests counted in the log, minus the pages the plugin
+counted itself rendering (/var/lib/onionpress/page-cache-stats.json).
+When the microcaching proxy is in front, its log lines end in cache=<status>,
+which are counted as they are.
+
+Usage:
+    python3 traffic_stats.py [access log]
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+CHECKPOINT_FILENAME = "traffic-stats.json"
+HOURS_KEPT = 7 * 24
+SKETCH_SIZE = 200  # Counters per Space-Saving sketch
+READ_CHUNK = 1024 * 1024
+
+# host ident user [time] "request" status bytes "referer" "agent" [cache=status]
+COMBINED_RE = re.compile(
+    r'^\S+ \S+ \S+ \[([^\]]+)\] "([^"]*)" (\d{3}) (\d+|-)(?: "[^"]*" "([^"]*)")?(?: cache=(\S*))?'
+)
+
+# Proxy cache statuses that were answered without WordPress
+PROXY_HIT_STATUSES = ("HIT", "STALE", "UPDATING", "REVALIDATED")
+
+# Requests the page cache rewrite rules can serve: GET, no query string, path
+# ending in a slash, outside wp-admin/wp-content/wp-includes/wp-json
+CACHEABLE_RE = re.compile(r'^GET (?!/wp-(?:admin|content|includes|json)/)[^?\s]*/ ')
+
+# Per-hour counts the page cache plugin keeps in the wordpress container
+PAGE_CACHE_STATS_PATH = "/var/lib/onionpress/page-cache-stats.json"
+
+# Requests for these are assets, not pages
+ASSET_EXTENSIONS = (".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico",
+                    ".webp", ".woff", ".woff2", ".ttf", ".map")
+
+
+class SpaceSaving:
+    """Bounded-memory heavy hitters (Metwally et al.): counts are upper bounds, error <= N/size"""
+
+    def __init__(self, size=SKETCH_SIZE, counters=None):
+        self.size = size
+        self.counters = counters or {}  # key -> [count, overestimate]
+
+    def add(self, key, count=1):
+        entry = self.counters.get(key)
+        if entry is not None:
+            entry[0] += count
+        elif len(self.counters) < self.size:
+            self.counters[key] = [count, 0]
+        else:
+            # Replace the smallest counter; the newcomer inherits its count as error
+            victim = min(self.counters, key=lambda k: self.counters[k][0])
+            floor = self.counters.pop(victim)[0]
+            self.counters[key] = [floor + count, floor]
+
+    def top(self, n=10):
+        """[(key, count, overestimate)] with the largest counts first"""
+        ranked = sorted(self.counters.items(), key=lambda item: item[1][0], reverse=True)
+        return [(key, count, error) for key, (count, error) in ranked[:n]]
+
+
+class TrafficStats:
+    """Incremental counters over the access log, checkpointed to disk"""
+
+    def __init__(self, log_path, checkpoint_path):
+        self.log_path = log_path
+        self.checkpoint_path = checkpoint_path
+        self.offset = 0
+        self.inode = None
+        self.head = None  # Hash of the first line, identifies the file across rotation
+        self.hourly = {}  # epoch hour -> [requests, bytes]
+        self.statuses = {}
+        self.cacheable = {}  # epoch hour -> requests the page cache could serve
+        self.proxy_cache = {}  # Cache proxy status -> requests
+        self.pages = SpaceSaving()
+        self.agents = SpaceSaving()
+        self.lines = 0
+        self.unparsed = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.offset = data.get("offset", 0)
+        self.inode = data.get("inode")
+        self.head = data.get("head")
+        self.hourly = {int(hour): counts for hour, counts in data.get("hourly", {}).items()}
+        self.statuses = data.get("statuses", {})
+        self.cacheable = {int(hour): count for hour, count in data.get("cacheable", {}).items()}
+        self.proxy_cache = data.get("proxy_cache", {})
+        self.pages = SpaceSaving(counters=data.get("pages"))
+        self.agents = SpaceSaving(counters=data.get("agents"))
+        self.lines = data.get("lines", 0)
+        self.unparsed = data.get("unparsed", 0)
+
+    def save(self):
+        data = {
+            "offset": self.offset,
+            "inode": self.inode,
+            "head": self.head,
+            "hourly": {str(hour): counts for hour, counts in self.hourly.items()},
+            "statuses": self.statuses,
+            "cacheable": {str(hour): count for hour, count in self.cacheable.items()},
+            "proxy_cache": self.proxy_cache,
+            "pages": self.pages.counters,
+            "agents": self.agents.counters,
+            "lines": self.lines,
+            "unparsed": self.unparsed,
+        }
+        temp_path = f"{self.checkpoint_path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.checkpoint_path)
+        except OSError:
+            pass
+
+    def feed_line(self, line):
+        """Count one log line"""
+        self.lines += 1
+        match = COMBINED_RE.match(line)
+        if not match:
+            self.unparsed += 1  # Apache error output shares the container log
+            return
+        stamp, request, status, size, agent, cache_status = match.groups()
+        try:
+            hour = int(datetime.strptime(stamp, "%d/%b/%Y:%H:%M:%S %z").timestamp()) // 3600
+        except ValueError:
+            self.unparsed += 1
+            return
+        counts = self.hourly.setdefault(hour, [0, 0])
+        counts[0] += 1
+        counts[1] += int(size) if size != "-" else 0
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status in ("200", "304") and CACHEABLE_RE.match(request):
+            self.cacheable[hour] = self.cacheable.get(hour, 0) + 1
+        if cache_status:
+            self.proxy_cache[cache_status] = self.proxy_cache.get(cache_status, 0) + 1
+
+        parts = request.split()
+        path = parts[1].split("?", 1)[0] if len(parts) >= 2 else request
+        if status.startswith(("2", "3")) and not path.lower().endswith(ASSET_EXTENSIONS):
+            self.pages.add(path)
+        if agent:
+            self.agents.add(agent)
+
+    def _feed_file(self, f, offset):
+        """Parse complete lines from offset; return the offset after the last one"""
+        f.seek(offset)
+        pending = b""
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            pending += chunk
+            *complete, pending = pending.split(b"\n")
+            for raw in complete:
+                self.feed_line(raw.decode("utf-8", errors="replace"))
+                offset += len(raw) + 1
+        return offset
+
+    def update(self):
+        """Parse lines added since the checkpoint; return how many were read"""
+        before = self.lines
+        try:
+            info = os.stat(self.log_path)
+        except OSError:
+            return 0
+        with open(self.log_path, 'rb') as f:
+            head = hashlib.sha1(f.readline()).hexdigest()
+
+        if self.inode is not None and (info.st_ino != self.inode or head != self.head):
+            # Rotated: finish the old file from its gzipped segment if it's still there
+            segment = f"{self.log_path}.1.gz"
+            try:
+                with gzip.open(segment, 'rb') as old:
+                    if hashlib.sha1(old.readline()).hexdigest() == self.head:
+                        self._feed_file(old, self.offset)
+            except (OSError, EOFError):
+                pass
+            self.offset = 0
+        elif info.st_size < self.offset:
+            self.offset = 0  # Truncated
+
+        self.inode, self.head = info.st_ino, head
+        with open(self.log_path, 'rb') as f:
+            self.offset = self._feed_file(f, self.offset)
+
+        # Keep a week of hourly counters
+        newest = max(self.hourly) if self.hourly else 0
+        for hour in [hour for hour in self.hourly if hour <= newest - HOURS_KEPT]:
+            del self.hourly[hour]
+            self.cacheable.pop(hour, None)
+        self.save()
+        return self.lines - before
+
+    def totals(self, hours, now=None):
+        """(requests, bytes) over the last hours"""
+        current = int((now or time.time()) // 3600)
+        requests = bytes_sent = 0
+        for hour, (count, size) in self.hourly.items():
+            if hour > current - hours:
+                requests += count
+                bytes_sent += size
+        return requests, bytes_sent
+
+    def cache_hits(self, rendered, hours, now=None):
+        """(hits, cacheable requests) over the last hours, given the plugin's rendered counts"""
+        current = int((now or time.time()) // 3600)
+        cacheable = sum(count for hour, count in self.cacheable.items() if hour > current - hours)
+        misses = sum(sum(counts) for hour, counts in rendered.items() if hour > current - hours)
+        return max(0, cacheable - misses), cacheable
+
+    def report_lines(self, now=None, page_cache=None):
+        """Lines for the Traffic Stats dialog; page_cache is the plugin's rendered counts"""
+        now = now or time.time()
+        if not self.lines:
+            return ["No visits recorded yet"]
+        lines = []
+        for label, hours in (("Last 24 hours", 24), ("Last 7 days", HOURS_KEPT)):
+            requests, bytes_sent = self.totals(hours, now)
+            lines.append(f"{label}: {requests} requests, {bytes_sent / 1000000.0:.1f} MB")
+
+        if page_cache is not None:
+            hits, cacheable = self.cache_hits(page_cache, 24, now)
+            if cacheable:
+                lines.append(f"Page cache: {hits * 100.0 / cacheable:.0f}% hits "
+                             f"({hits} of {cacheable} cacheable requests, last 24 hours)")
+        cached = sum(count for name, count in self.proxy_cache.items() if name != "BYPASS")
+        if cached:
+            hits = sum(self.proxy_cache.get(name, 0) for name in PROXY_HIT_STATUSES)
+            lines.append(f"Proxy cache: {hits * 100.0 / cached:.0f}% hits ("
+                         + ", ".join(f"{name} {count}" for name, count in
+                                     sorted(self.proxy_cache.items(), key=lambda item: -item[1]))
+                         + ")")
+
+        # Requests per hour over the last day, oldest first
+        current = int(now // 3600)
+        per_hour = [self.hourly.get(hour, [0, 0])[0] for hour in range(current - 23, current + 1)]
+        if any(per_hour):
+            bars = "▁▂▃▄▅▆▇█"
+            peak = max(per_hour)
+            lines.append("Per hour: " + "".join(bars[min(7, count * 8 // (peak + 1))] for count in per_hour))
+
+        total = sum(self.statuses.values())
+        if total:
+            classes = {}
+            for code, count in self.statuses.items():
+                classes[code[0] + "xx"] = classes.get(code[0] + "xx", 0) + count
+            lines.append("Status: " + ", ".join(f"{name} {count * 100.0 / total:.0f}%"
+                                                for name, count in sorted(classes.items())))
+            errors = sorted(((count, code) for code, count in self.statuses.items()
+                             if code[0] in "45"), reverse=True)[:3]
+            if errors:
+                lines.append("Top errors: " + ", ".join(f"{code} ({count})" for count, code in errors))
+
+        top_pages = self.pages.top(10)
+        if top_pages:
+            lines.append("")
+            lines.append("Top pages:")
+            lines.extend(f"  {count:>6}  {path[:60]}" for path, count, _ in top_pages)
+        top_agents = self.agents.top(5)
+        if top_agents:
+            lines.append("")
+            lines.append("Top user agents:")
+            lines.extend(f"  {count:>6}  {agent[:60]}" for agent, count, _ in top_agents)
+        return lines
+
+
+def parse_page_cache_stats(data):
+    """The plugin's stats file as {epoch hour: [stored, bypassed]}"""
+    try:
+        raw = json.loads(data)
+        return {int(hour): [int(count) for count in counts] for hour, counts in raw.items()}
+    except (ValueError, TypeError, AttributeError):
+        return {}
+
+
+def main():
+    data_dir = os.path.expanduser("~/.onion.press")
+    if len(sys.argv) > 1:
+        # Another log gets its own checkpoint
+        log_path = sys.argv[1]
+        checkpoint_path = f"{log_path}.stats.json"
+    else:
+        log_path = os.path.join(data_dir, "wordpress-access.log")
+        checkpoint_path = os.path.join(data_dir, CHECKPOINT_FILENAME)
+    stats = TrafficStats(log_path, checkpoint_path)
+    started = time.monotonic()
+    read = stats.update()
+    print(f"Read {read} new lines in {time.monotonic() - started:.2f}s ({stats.lines} total)")
+    for line in stats.report_lines():
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+VM sizing feedback for onion.press
+The launcher sizes the Colima VM from the host's cores and RAM and grows it
+when the containers need more. This module supplies the "need" side: the
+menubar app samples the containers' CPU and memory use through the Engine
+API stats endpoint every few minutes and keeps a week of samples in
+~/.onion.press/vm-pressure.log. After each sample it rewrites a small
+KEY=value summary (95th percentiles) that the launcher reads at the next
+launch, when the VM can be resized without interrupting the site.
+
+The launcher records the size it picked, and why, in ~/.onion.press/vm-size.
+
+Usage:
+    python3 vm_sizing.py [summary]
+"""
+
+import os
+import sys
+import time
+
+import docker_api
+
+PRESSURE_FILENAME = "vm-pressure.log"
+SUMMARY_FILENAME = "vm-pressure-summary"
+SIZE_FILENAME = "vm-size"
+
+SAMPLE_INTERVAL = 300  # Seconds between samples while the site is up
+MAX_SAMPLES = 2016     # One week at SAMPLE_INTERVAL
+
+
+def container_usage(stats):
+    """Return (cpu millicores, memory bytes) from one /containers/{id}/stats response"""
+    cpu = stats.get("cpu_stats") or {}
+    precpu = stats.get("precpu_stats") or {}
+    cpu_delta = (cpu.get("cpu_usage", {}).get("total_usage", 0)
+                 - precpu.get("cpu_usage", {}).get("total_usage", 0))
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online = cpu.get("online_cpus") or len(cpu.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+    millicores = int(cpu_delta / system_delta * online * 1000) if cpu_delta > 0 and system_delta > 0 else 0
+
+    memory = stats.get("memory_stats") or {}
+    details = memory.get("stats") or {}
+    # Page cache can be reclaimed, so it doesn't count as pressure (cgroup v2 / v1 names)
+    cache = details.get("inactive_file", details.get("total_inactive_file", 0))
+    return millicores, max(0, memory.get("usage", 0) - cache)
+
+
+def sample_usage(docker, names=docker_api.CONTAINER_NAMES, optional=docker_api.OPTIONAL_CONTAINER_NAMES):
+    """Return (cpu millicores, memory MB) summed over the containers, or None
+
+    Optional containers count when they exist; a missing required one gives None.
+    """
+    total_cpu = total_memory = 0
+    for name in list(names) + list(optional):
+        try:
+            stats = docker.stats(name)
+        except docker_api.DockerAPIError:
+            if name in optional:
+                continue
+            return None
+        cpu, memory = container_usage(stats or {})
+        total_cpu += cpu
+        total_memory += memory
+    return total_cpu, total_memory // (1024 * 1024)
+
+
+def percentile(values, p):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+def read_key_values(path):
+    """Parse a KEY=value file (the launcher's vm-size, the pressure summary)"""
+    values = {}
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                if "=" in line and not line.startswith("#"):
+                    key, value = line.rstrip("\n").split("=", 1)
+                    values[key] = value
+    except OSError:
+        pass
+    return values
+
+
+class PressureLog:
+    """A week of (time, cpu millicores, memory MB) samples plus the summary the launcher reads"""
+
+    def __init__(self, data_dir):
+        self.path = os.path.join(data_dir, PRESSURE_FILENAME)
+        self.summary_path = os.path.join(data_dir, SUMMARY_FILENAME)
+        self.samples = []
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 3:
+                        try:
+                            self.samples.append(tuple(int(part) for part in parts))
+                        except ValueError:
+                            pass
+        except OSError:
+            pass
+        self.samples = self.samples[-MAX_SAMPLES:]
+
+    def add(self, millicores, memory_mb, now=None):
+        self.samples.append((int(now or time.time()), int(millicores), int(memory_mb)))
+        self.samples = self.samples[-MAX_SAMPLES:]
+        self._write(self.path, "".join(f"{t} {cpu} {memory}\n" for t, cpu, memory in self.samples))
+        self._write(self.summary_path, "".join(f"{key}={value}\n" for key, value in self.summary().items()))
+
+    def summary(self):
+        cpu = [sample[1] for sample in self.samples]
+        memory = [sample[2] for sample in self.samples]
+        return {
+            "SAMPLES": len(self.samples),
+            "CPU_P95_MILLICORES": percentile(cpu, 95),
+            "CPU_MAX_MILLICORES": max(cpu) if cpu else 0,
+            "MEM_P95_MB": percentile(memory, 95),
+            "MEM_MAX_MB": max(memory) if memory else 0,
+            "UPDATED_AT": int(time.time()),
+        }
+
+    @staticmethod
+    def _write(path, text):
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(text)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+
+def report_lines(data_dir, pressure_log=None):
+    """Lines for the Diagnostics dialog: current VM size, why, and measured load"""
+    lines = []
+    size = read_key_values(os.path.join(data_dir, SIZE_FILENAME))
+    if size:
+        lines.append(f"VM: {size.get('CPU', '?')} vCPU, {size.get('MEMORY', '?')} GB "
+                     f"(chosen {size.get('CHOSEN_AT', '?')})")
+        if size.get("REASON"):
+            lines.append(f"Why: {size['REASON']}")
+        if size.get("PENDING"):
+            lines.append(f"Pending: {size['PENDING']} (applied when the VM next starts)")
+    else:
+        lines.append("VM: 2 vCPU, 4 GB (created before automatic sizing)")
+    summary = (pressure_log or PressureLog(data_dir)).summary()
+    if summary["SAMPLES"]:
+        lines.append(f"Load p95 over {summary['SAMPLES']} samples: "
+                     f"{summary['CPU_P95_MILLICORES'] / 1000.0:.2f} cores, {summary['MEM_P95_MB']} MB")
+    return lines
+
+
+def main():
+    data_dir = os.path.expanduser("~/.onion.press")
+    if len(sys.argv) > 1 and sys.argv[1] != "summary":
+        print("Usage: vm_sizing.py [summary]")
+        sys.exit(1)
+    for line in report_lines(data_dir):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
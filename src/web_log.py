@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+WordPress access-log capture for onion.press
+Follows the onionpress-wordpress container log over the Docker Engine API and
+appends it to ~/.onion.press/wordpress-access.log. The position (timestamp of
+the last captured line, and how many lines carried that exact timestamp) is
+saved next to the log, so a restarted capture asks Docker only for lines
+since then and skips the ones it already has instead of re-appending the
+last 100 lines.
+
+The file rotates by size and at the first write of each day through
+buffered_log.RotatingFile; old days are gzipped and the oldest are deleted
+once the total exceeds the retention budget (WEB_LOG_MAX_MB in the config).
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+import buffered_log
+import docker_api
+
+WEB_LOG_FILENAME = "wordpress-access.log"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024         # Rotate the live file at this size...
+DEFAULT_MAX_TOTAL_BYTES = 100 * 1024 * 1024  # ...and keep this much in total
+
+# Seconds between position saves; a crash re-captures at most this much
+SAVE_INTERVAL = 1.0
+
+
+def parse_stamp_ns(value):
+    """Docker's RFC3339Nano timestamp as integer nanoseconds (floats lose the precision)"""
+    try:
+        base, _, fraction = value.rstrip("Z").partition(".")
+        seconds = datetime.strptime(base, "%Y-%m-%dT%H:%M:%S")
+        epoch = int((seconds - datetime(1970, 1, 1)).total_seconds())
+        return epoch * 1000000000 + int((fraction + "000000000")[:9] or 0)
+    except ValueError:
+        return None
+
+
+def since_param(stamp_ns):
+    """The 'since' query value for a position: seconds.nanoseconds (inclusive)"""
+    return f"{stamp_ns // 1000000000}.{stamp_ns % 1000000000:09d}"
+
+
+class WebLogCapture:
+    """Resumable capture of the WordPress container log into a rotating file"""
+
+    def __init__(self, docker, path, container="onionpress-wordpress",
+                 max_bytes=DEFAULT_MAX_BYTES, max_total_bytes=DEFAULT_MAX_TOTAL_BYTES, log=None):
+        self.docker = docker
+        self.container = container
+        self.file = buffered_log.RotatingFile(path, max_bytes, max_total_bytes, daily=True)
+        self.position_path = f"{path}.position"
+        self.log = log or (lambda message: None)
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped by stop(); an older follower thread exits quietly
+        self._thread = None
+        self._saved_at = 0.0
+        self.last_ns, self.seen_at_last = self._load_position()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def _load_position(self):
+        try:
+            with open(self.position_path, 'r') as f:
+                stamp, count = f.read().split()
+            return int(stamp), int(count)
+        except (OSError, ValueError):
+            return None, 0
+
+    def _save_position(self):
+        if self.last_ns is None:
+            return
+        temp_path = f"{self.position_path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(f"{self.last_ns} {self.seen_at_last}\n")
+            os.replace(temp_path, self.position_path)
+        except OSError:
+            pass
+        self._saved_at = time.monotonic()
+
+    def _accept(self, stamp_ns, skip):
+        """Advance the position for a line; return False for lines captured before"""
+        if self.last_ns is not None and stamp_ns < self.last_ns:
+            return False
+        if stamp_ns == self.last_ns:
+            if skip[0] > 0:
+                skip[0] -= 1  # Same timestamp as the last line we have: one we already wrote
+                return False
+            self.seen_at_last += 1
+        else:
+            self.last_ns, self.seen_at_last = stamp_ns, 1
+        return True
+
+    def _follow_once(self, generation):
+        """Follow the container log from the saved position until the stream ends; return the lines written"""
+        since = since_param(self.last_ns) if self.last_ns is not None else None
+        frames = self.docker.follow_logs(self.container, since=since, timestamps=True)
+        # 'since' is inclusive: the first lines at last_ns were written last time
+        skip = [self.seen_at_last]
+        written = 0
+        pending = b""
+        for _, payload in frames:
+            if generation != self._generation:
+                return written
+            pending += payload
+            if b"\n" not in pending:
+                continue
+            *complete, pending = pending.split(b"\n")
+            out = []
+            with self._lock:
+                if generation != self._generation:
+                    return written
+                for raw in complete:
+                    text = raw.decode("utf-8", errors="replace")
+                    stamp, _, line = text.partition(" ")
+                    stamp_ns = parse_stamp_ns(stamp)
+                    if stamp_ns is None:
+                        out.append(text + "\n")
+                    elif self._accept(stamp_ns, skip):
+                        out.append(line + "\n")
+                if out:
+                    self.file.write("".join(out))
+                    written += len(out)
+                if time.monotonic() - self._saved_at >= SAVE_INTERVAL:
+                    self._save_position()
+        return written
+
+    def _container_running(self):
+        try:
+            info = self.docker.inspect_container(self.container)
+        except (docker_api.DockerAPIError, OSError, ValueError):
+            return False
+        return bool((info or {}).get("State", {}).get("Running"))
+
+    def start(self):
+        """Start capturing in a daemon thread; reconnects while the container runs"""
+        if self._thread is not None:
+            return
+        generation = self._generation
+
+        def run():
+            retry_delay = 2
+            outage = False
+            while generation == self._generation:
+                written = 0
+                try:
+                    written = self._follow_once(generation)
+                except (docker_api.DockerAPIError, OSError, ValueError):
+                    pass
+                with self._lock:
+                    self._save_position()
+                if generation != self._generation:
+                    break
+                # A stopped or crash-looping container ends the stream straight away;
+                # only a run that wrote new lines and is still up resets the back-off
+                if written and self._container_running():
+                    retry_delay = 2
+                    outage = False
+                elif not outage:
+                    outage = True
+                    self.log("Web log capture disconnected - will reconnect")
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+        self._thread = threading.Thread(target=run, name="web-log", daemon=True)
+        self._thread.start()
+        self.log(f"Started web log capture to {self.file.path}")
+
+    def stop(self):
+        """Stop capturing and save the position"""
+        if self._thread is None:
+            return
+        with self._lock:
+            self._generation += 1
+            self._save_position()
+            self.file.close()
+        self._thread = None
+        self.log("Stopped web log capture")
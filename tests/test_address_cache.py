@@ -0,0 +1,39 @@
+import os
+
+import address_cache
+
+ADDRESS = "abcdefghijklmnopqrstuvwxyz234567abcdefghijklmnopqrstuvwx.onion"
+
+
+def test_save_then_load(tmp_path):
+    address_cache.save(ADDRESS, "2026-01-31T12:00:00Z", str(tmp_path))
+    assert address_cache.load(str(tmp_path)) == (ADDRESS, "2026-01-31T12:00:00Z")
+    assert not os.path.exists(address_cache.cache_path(str(tmp_path)) + ".tmp")
+
+
+def test_file_is_readable_by_the_launcher(tmp_path):
+    address_cache.save(ADDRESS, "2026-01-31T12:00:00Z", str(tmp_path))
+    with open(address_cache.cache_path(str(tmp_path))) as f:
+        lines = f.read().splitlines()
+    assert f"ADDRESS={ADDRESS}" in lines
+    assert "VOLUME_CREATED_AT=2026-01-31T12:00:00Z" in lines
+
+
+def test_missing_or_invalid_cache_loads_as_none(tmp_path):
+    assert address_cache.load(str(tmp_path)) is None
+    with open(address_cache.cache_path(str(tmp_path)), "w") as f:
+        f.write("ADDRESS=Starting...\n")
+    assert address_cache.load(str(tmp_path)) is None
+
+
+def test_comments_and_unknown_keys_are_ignored(tmp_path):
+    with open(address_cache.cache_path(str(tmp_path)), "w") as f:
+        f.write(f"# note\nOTHER=1\nADDRESS={ADDRESS}\n")
+    assert address_cache.load(str(tmp_path)) == (ADDRESS, "")
+
+
+def test_invalidate(tmp_path):
+    address_cache.save(ADDRESS, "2026-01-31T12:00:00Z", str(tmp_path))
+    address_cache.invalidate(str(tmp_path))
+    assert address_cache.load(str(tmp_path)) is None
+    address_cache.invalidate(str(tmp_path))  # Already gone is fine
@@ -0,0 +1,108 @@
+import gzip
+import json
+import os
+
+import buffered_log
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def read_gz(path):
+    with gzip.open(path, "rt") as f:
+        return f.read()
+
+
+def test_write_appends(tmp_path):
+    path = str(tmp_path / "app.log")
+    log = buffered_log.RotatingFile(path, max_bytes=1000)
+    log.write("one\n")
+    log.write("two\n")
+    log.close()
+    assert read(path) == "one\ntwo\n"
+
+
+def test_full_file_rotates_before_the_next_write(tmp_path):
+    path = str(tmp_path / "app.log")
+    log = buffered_log.RotatingFile(path, max_bytes=10)
+    log.write("0123456789\n")
+    log.write("second\n")
+    log.write("second part\n")
+    log.write("third\n")
+    log.close()
+    assert read(path) == "third\n"
+    assert log.segments() == [(1, path + ".1.gz"), (2, path + ".2.gz")]
+    assert read_gz(path + ".1.gz") == "second\nsecond part\n"
+    assert read_gz(path + ".2.gz") == "0123456789\n"
+    assert not os.path.exists(path + ".1")
+
+
+def test_rotation_follows_writes_from_other_processes(tmp_path):
+    path = str(tmp_path / "app.log")
+    log = buffered_log.RotatingFile(path, max_bytes=10)
+    log.write("mine\n")
+    with open(path, "a") as other:  # The bash launcher appends to the same file
+        other.write("from bash, long enough to fill it\n")
+    log.write("after\n")
+    log.close()
+    assert read(path) == "after\n"
+    assert "from bash" in read_gz(path + ".1.gz")
+
+
+def test_total_size_cap_deletes_the_oldest_segments(tmp_path):
+    path = str(tmp_path / "app.log")
+    log = buffered_log.RotatingFile(path, max_bytes=1, max_total_bytes=1)
+    for index in range(4):
+        log.write(f"entry {index}\n")
+    log.close()
+    # Each gzipped segment is bigger than the cap, so none survive a rotation
+    assert log.segments() == []
+    assert read(path) == "entry 3\n"
+
+
+def test_cap_keeps_the_newest_segments_that_fit(tmp_path):
+    path = str(tmp_path / "app.log")
+    for index in (1, 2, 3):
+        with gzip.open(f"{path}.{index}.gz", "wt") as f:
+            f.write(f"segment {index}\n")
+    size = os.path.getsize(path + ".1.gz")
+    log = buffered_log.RotatingFile(path, max_total_bytes=size * 2 + 1)
+    kept = log.enforce_cap()
+    assert kept == [path + ".1.gz", path + ".2.gz"]
+    assert not os.path.exists(path + ".3.gz")
+
+
+def test_segments_ignores_other_files(tmp_path):
+    path = str(tmp_path / "app.log")
+    for name in ("app.log.2.gz", "app.log.1.gz", "app.log.x.gz", "app.log.position", "other.log.1.gz"):
+        (tmp_path / name).write_bytes(b"")
+    assert buffered_log.RotatingFile(path).segments() == [(1, path + ".1.gz"), (2, path + ".2.gz")]
+
+
+def test_logger_writes_text_and_json_lines(tmp_path):
+    path = str(tmp_path / "app.log")
+    json_path = str(tmp_path / "app.jsonl")
+    logger = buffered_log.BufferedLogger(path, json_path=json_path)
+    logger.log("Started", duration=0.25, step="init")
+    logger.log("Ready", component="readiness")
+    assert logger.flush()
+    lines = read(path).splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["Started", "Ready"]
+    records = [json.loads(line) for line in read(json_path).splitlines()]
+    assert records[0]["event"] == "Started" and records[0]["component"] == "menubar"
+    assert records[0]["duration_ms"] == 250.0 and records[0]["step"] == "init"
+    assert records[1]["component"] == "readiness" and "duration_ms" not in records[1]
+
+
+def test_logger_rotate_separates_sessions(tmp_path):
+    path = str(tmp_path / "app.log")
+    with open(path, "w") as f:
+        f.write("previous session\n")
+    logger = buffered_log.BufferedLogger(path)
+    logger.rotate()
+    logger.log("new session")
+    assert logger.flush()
+    assert "previous session" in read_gz(path + ".1.gz")
+    assert read(path).endswith("new session\n")
@@ -0,0 +1,184 @@
+import io
+import socket
+import struct
+import threading
+
+import pytest
+
+import docker_api
+
+
+class BufferConn(docker_api._Connection):
+    """_Connection reading canned bytes in small pieces, to exercise the buffering"""
+
+    def __init__(self, data, piece=7):
+        self._buf = b""
+        self._data = io.BytesIO(data)
+        self._piece = piece
+
+    def _fill(self):
+        data = self._data.read(self._piece)
+        self._buf += data
+        return bool(data)
+
+
+def frame(stream_type, payload):
+    return bytes([stream_type, 0, 0, 0]) + struct.pack(">I", len(payload)) + payload
+
+
+def response_for(raw):
+    conn = BufferConn(raw)
+    return docker_api.DockerClient()._read_response(conn)
+
+
+def test_quote_escapes_reserved_characters():
+    assert docker_api._quote("a b&c=d/é") == "a%20b%26c%3Dd%2F%C3%A9"
+    assert docker_api._quote("Safe-._~09") == "Safe-._~09"
+
+
+def test_demux_stream_splits_stdout_and_stderr():
+    data = frame(1, b"out1 ") + frame(2, b"err") + frame(1, b"out2")
+    assert docker_api.demux_stream(data) == (b"out1 out2", b"err")
+
+
+def test_demux_stream_returns_unframed_data_as_stdout():
+    assert docker_api.demux_stream(b"plain tty output\n") == (b"plain tty output\n", b"")
+
+
+def test_iter_demuxed_reassembles_frames_split_across_reads():
+    body = frame(1, b"hello") + frame(2, b"world" * 10)
+    response = response_for(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+    assert list(docker_api.iter_demuxed(response)) == [(1, b"hello"), (2, b"world" * 10)]
+
+
+def test_content_length_body_is_reusable():
+    response = response_for(b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n"
+                            b"Content-Length: 5\r\n\r\nhello(next response)")
+    assert response.status == 200
+    assert response.headers["content-type"] == "text/plain"
+    assert response.read() == b"hello"
+    assert response.reusable and response._done
+
+
+def test_chunked_body_with_extension_and_trailer():
+    raw = (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+           b"5;ext=1\r\nhello\r\n"
+           b"7\r\n, world\r\n"
+           b"0\r\nX-Trailer: yes\r\n\r\n")
+    response = response_for(raw)
+    assert response.read() == b"hello, world"
+    assert response.reusable and response._done
+
+
+def test_body_without_framing_runs_to_close_and_is_not_reusable():
+    response = response_for(b"HTTP/1.1 200 OK\r\nConnection: close\r\n\r\nuntil eof")
+    assert response.read() == b"until eof"
+    assert not response.reusable
+
+
+def test_iter_lines_keeps_the_unterminated_tail():
+    body = b'{"a": 1}\n{"b": 2}\n{"c"'
+    response = response_for(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+    assert list(response.iter_lines()) == [b'{"a": 1}', b'{"b": 2}', b'{"c"']
+
+
+def test_closed_connection_before_status_line():
+    with pytest.raises(ConnectionResetError):
+        response_for(b"")
+
+
+class FakeDaemon:
+    """Unix socket server answering each connection from a list of handlers"""
+
+    def __init__(self, path, handlers):
+        self.requests = []
+        self._handlers = list(handlers)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen(8)
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while self._handlers:
+            conn, _ = self._server.accept()
+            request = conn.recv(65536)
+            self.requests.append(request.split(b"\r\n", 1)[0].decode())
+            self._handlers.pop(0)(conn)
+            conn.close()
+
+    def close(self):
+        self._server.close()
+
+
+def drop(conn):
+    pass
+
+
+def ok_json(conn):
+    body = b'{"ok": true}'
+    conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                 b"Content-Length: %d\r\n\r\n" % len(body) + body)
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "docker.sock")
+
+
+def test_get_is_retried_once_on_a_fresh_connection(socket_path):
+    daemon = FakeDaemon(socket_path, [drop, ok_json])
+    try:
+        client = docker_api.DockerClient(socket_path=socket_path, timeout=2)
+        assert client.request("GET", "/containers/x/json") == {"ok": True}
+        assert daemon.requests == ["GET /containers/x/json HTTP/1.1"] * 2
+    finally:
+        daemon.close()
+
+
+def test_post_is_not_resent_after_it_was_written(socket_path):
+    daemon = FakeDaemon(socket_path, [drop, ok_json])
+    try:
+        client = docker_api.DockerClient(socket_path=socket_path, timeout=2)
+        with pytest.raises(docker_api.DockerAPIError):
+            client.request("POST", "/containers/x/exec", body={"Cmd": ["true"]})
+        assert daemon.requests == ["POST /containers/x/exec HTTP/1.1"]
+    finally:
+        daemon.close()
+
+
+def test_http_errors_carry_the_status_and_message(socket_path):
+    def not_found(conn):
+        body = b'{"message": "No such container: x"}'
+        conn.sendall(b"HTTP/1.1 404 Not Found\r\nContent-Type: application/json\r\n"
+                     b"Content-Length: %d\r\n\r\n" % len(body) + body)
+
+    daemon = FakeDaemon(socket_path, [not_found])
+    try:
+        client = docker_api.DockerClient(socket_path=socket_path, timeout=2)
+        with pytest.raises(docker_api.DockerAPIError) as error:
+            client.inspect_container("x")
+        assert error.value.status == 404
+        assert "No such container: x" in str(error.value)
+    finally:
+        daemon.close()
+
+
+def test_events_yields_one_dict_per_line_until_the_stream_closes(socket_path):
+    def event_stream(conn):
+        conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        for line in (b'{"Action": "start", "Actor": {"Attributes": {"name": "onionpress-tor"}}}\n',
+                     b'\n',
+                     b'{"Action": "die", "Actor": {"Attributes": {"name": "onionpress-db"}}}\n'):
+            conn.sendall(b"%x\r\n" % len(line) + line + b"\r\n")
+        conn.sendall(b"0\r\n\r\n")
+
+    daemon = FakeDaemon(socket_path, [event_stream])
+    try:
+        client = docker_api.DockerClient(socket_path=socket_path, timeout=2)
+        events = client.events(filters={"type": ["container"]})
+        assert [(e["Action"], e["Actor"]["Attributes"]["name"]) for e in events] == [
+            ("start", "onionpress-tor"), ("die", "onionpress-db")]
+        assert daemon.requests[0].startswith("GET /events?filters=%7B%22type%22")
+    finally:
+        daemon.close()
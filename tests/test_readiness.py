@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+
+import docker_api
+import readiness
+import tor_log
+
+
+def probes(**oks):
+    names = ("hostname", "bootstrap", "local_http", "tor_to_wordpress")
+    results = {name: readiness.ProbeResult(name, oks.get(name, True), "x.onion" if name == "hostname" else "")
+               for name in names}
+    if "db_warm" in oks:
+        results["db_warm"] = readiness.ProbeResult("db_warm", oks["db_warm"])
+    return results
+
+
+def test_result_is_ready_when_every_probe_passes():
+    result = readiness.ReadinessResult(probes(), 0)
+    assert result.ready and result.wordpress_ready and result.onion_ready
+    assert result.onion_address == "x.onion"
+
+
+def test_onion_failures_leave_wordpress_ready():
+    result = readiness.ReadinessResult(probes(bootstrap=False), 0)
+    assert result.wordpress_ready
+    assert not result.onion_ready and not result.ready
+
+
+def test_failed_hostname_probe_has_no_address():
+    result = readiness.ReadinessResult(probes(hostname=False), 0)
+    assert result.onion_address is None and not result.onion_ready
+
+
+def test_db_warm_counts_only_when_probed():
+    assert not readiness.ReadinessResult(probes(db_warm=False), 0).wordpress_ready
+    assert readiness.ReadinessResult(probes(db_warm=True), 0).wordpress_ready
+
+
+class FakeDocker:
+    def __init__(self, logs=b""):
+        self._logs = logs
+        self.calls = []
+
+    def logs(self, container, **kwargs):
+        self.calls.append(("logs", kwargs))
+        return self._logs, b""
+
+    def read_file(self, container, path, **kwargs):
+        self.calls.append(("read_file", kwargs))
+        return b"abc.onion\n"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = readiness.ReadinessEngine(FakeDocker(), "/nonexistent/docker", str(tmp_path / "readiness"))
+    engine.probe_hostname = lambda deadline: (True, "abc.onion")
+    engine.probe_bootstrap = lambda deadline: (True, "Tor bootstrapped")
+    engine.probe_local_http = lambda deadline: (True, "WordPress responding")
+    engine.probe_tor_to_wordpress = lambda deadline: (True, "Tor can reach WordPress")
+    return engine
+
+
+def test_run_publishes_the_result_for_the_launcher(engine):
+    result = engine.run()
+    assert result.ready and engine.last_result is result
+    with open(engine.state_file) as f:
+        published = f.read().splitlines()
+    assert "READY=yes" in published
+    assert "ONION_ADDRESS=abc.onion" in published
+    assert any(line.startswith("PROBE_TOR_TO_WORDPRESS=yes ") for line in published)
+    assert "PROBE_DB_WARM" not in "".join(published)
+
+
+def test_cached_address_marks_the_hostname_probe_skipped(engine):
+    result = engine.run(known_address="cached.onion")
+    assert result.onion_address == "cached.onion"
+    assert result.probes["hostname"].skipped
+    assert not result.probes["bootstrap"].skipped
+
+
+def test_connected_follower_answers_and_skips_the_bootstrap_probe(engine):
+    follower = tor_log.TorLogFollower(FakeDocker())
+    follower.connected = True
+    follower.feed_line("[notice] Bootstrapped 100% (done): Done")
+    engine.tor_log_follower = follower
+    result = engine.run()
+    assert result.probes["bootstrap"].ok and result.probes["bootstrap"].skipped
+
+    follower.connected = False
+    assert not engine.run().probes["bootstrap"].skipped
+
+
+def test_hung_probe_is_reported_as_deadline_exceeded(engine):
+    release = threading.Event()
+    engine.deadlines = {name: 0.1 for name in engine.deadlines}
+    engine.probe_local_http = lambda deadline: (release.wait(5), "")
+    try:
+        result = engine.run()
+    finally:
+        release.set()
+    assert result.probes["local_http"].detail == "deadline exceeded"
+    assert not result.wordpress_ready
+
+
+def test_probe_exceptions_become_failed_results(engine):
+    def broken(deadline):
+        raise docker_api.DockerAPIError("socket gone")
+
+    engine.probe_tor_to_wordpress = broken
+    probe = engine.run().probes["tor_to_wordpress"]
+    assert not probe.ok and "socket gone" in probe.detail
+
+
+def test_api_probes_pass_their_deadline(tmp_path):
+    docker = FakeDocker(logs=b"Bootstrapped 100% (done): Done\n")
+    engine = readiness.ReadinessEngine(docker, "/nonexistent/docker", str(tmp_path / "readiness"))
+    assert engine.probe_hostname(3) == (True, "abc.onion")
+    assert engine.probe_bootstrap(3) == (True, "Tor bootstrapped")
+    assert [kwargs.get("timeout") for _, kwargs in docker.calls] == [3, 3]
+
+
+def test_wait_for_returns_a_matching_result_or_none(engine):
+    assert engine.wait_for(lambda result: True, timeout=0.05) is None
+    engine.run()
+    assert engine.wait_for(lambda result: result.ready, timeout=0.05) is engine.last_result
+    engine.clear()
+    assert engine.last_result is None
@@ -0,0 +1,100 @@
+import tor_log
+
+
+def test_parse_docker_timestamp():
+    assert tor_log.parse_docker_timestamp("1970-01-01T00:00:10Z") == 10.0
+    assert tor_log.parse_docker_timestamp("1970-01-01T00:00:10.250000000Z") == 10.25
+    assert tor_log.parse_docker_timestamp("0001-01-01T00:00:00Z") is not None  # never-started container
+    assert tor_log.parse_docker_timestamp("") is None
+    assert tor_log.parse_docker_timestamp("not a time") is None
+
+
+def follower(docker=None):
+    return tor_log.TorLogFollower(docker, max_errors=3)
+
+
+def test_bootstrap_progress_and_completion_time():
+    f = follower()
+    f.feed_line("[notice] Bootstrapped 45% (requesting_descriptors): Asking for relay descriptors", 1.0)
+    assert f.state.bootstrap_percent == 45 and not f.state.bootstrapped
+    f.feed_line("[notice] Bootstrapped 100% (done): Done", 2.0)
+    f.feed_line("[notice] Bootstrapped 100% (done): Done", 3.0)
+    assert f.state.bootstrapped and f.state.bootstrapped_at == 2.0
+    assert f.state.lines_seen == 3
+
+
+def test_descriptor_publish_status():
+    f = follower()
+    f.feed_line("[info] Uploaded rendezvous descriptor (status 200)", 5.0)
+    assert f.state.publish_status == tor_log.PUBLISH_UPLOADED and f.state.published_at == 5.0
+    f.feed_line("[warn] Failed to publish descriptor: upload failed", 6.0)
+    assert f.state.publish_status == tor_log.PUBLISH_FAILED
+    assert f.state.errors[-1] == (6.0, "[warn] Failed to publish descriptor: upload failed")
+
+
+def test_errors_are_capped_and_expire():
+    f = follower()
+    for second in range(5):
+        f.feed_line(f"[err] problem {second}", 100.0 + second)
+    assert [msg for _, msg in f.state.errors] == ["[err] problem 2", "[err] problem 3", "[err] problem 4"]
+    assert len(f.state.recent_errors(window=10, now=110.0)) == 3
+    assert f.state.recent_errors(window=10, now=1000.0) == []
+
+
+def test_state_snapshots_are_immutable():
+    f = follower()
+    before = f.state
+    f.feed_line("[err] boom", 1.0)
+    assert before.errors == () and f.state.errors == ((1.0, "[err] boom"),)
+
+
+class FakeDocker:
+    """One container run whose log arrives split across frames"""
+
+    def __init__(self, started_at, frames, running=True):
+        self.started_at = started_at
+        self.frames = frames
+        self.running = running
+        self.since = []
+
+    def inspect_container(self, name):
+        return {"State": {"StartedAt": self.started_at, "Running": self.running}}
+
+    def follow_logs(self, container, since=None, timestamps=False):
+        self.since.append(since)
+        return iter(self.frames)
+
+
+def test_follow_parses_split_lines_once_across_reconnects():
+    frames = [
+        (1, b"1970-01-01T00:01:40.000000000Z [notice] Bootstrapped 50% (loading): x\n1970-01-01T00:01:41"),
+        (1, b".000000000Z [notice] Bootstrapped 100% (done): Done\n"),
+    ]
+    docker = FakeDocker("1970-01-01T00:01:39Z", frames)
+    f = follower(docker)
+    assert f._follow_once() == 2
+    assert f.state.bootstrapped and f.state.bootstrapped_at == 101.0
+
+    # Reconnecting replays from the last timestamp; nothing is counted twice
+    assert f._follow_once() == 0
+    assert docker.since == [99.0, 101.0]
+    assert f.state.lines_seen == 2
+
+
+def test_new_container_run_resets_the_state():
+    docker = FakeDocker("1970-01-01T00:01:39Z",
+                        [(1, b"1970-01-01T00:01:40Z [notice] Bootstrapped 100% (done): Done\n")])
+    f = follower(docker)
+    f._follow_once()
+    assert f.state.bootstrapped
+
+    docker.started_at = "1970-01-01T00:05:00Z"
+    docker.frames = [(1, b"1970-01-01T00:05:01Z [notice] Bootstrapped 5% (conn): x\n")]
+    f._follow_once()
+    assert f.state.bootstrap_percent == 5 and f.state.started_at == 300.0
+    assert docker.since[-1] == 300.0
+
+
+def test_container_running():
+    assert follower(FakeDocker("", [], running=True))._container_running()
+    assert not follower(FakeDocker("", [], running=False))._container_running()
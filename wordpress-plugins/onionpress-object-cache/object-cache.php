@@ -0,0 +1,468 @@
+<?php
+/**
+ * Plugin Name: Onion.Press Object Cache
+ * Plugin URI: https://github.com/brewsterkahle/onion.press
+ * Description: Persistent object cache drop-in backed by the onion.press Redis service (pure PHP, no extension needed)
+ * Version: 1.0.0
+ * Author: Onion.Press
+ * Author URI: https://github.com/brewsterkahle/onion.press
+ * License: AGPL-3.0
+ *
+ * Installed by onion.press as wp-content/object-cache.php when OBJECT_CACHE=yes.
+ * The Redis host comes from ONIONPRESS_REDIS_HOST (set by object-cache.yml);
+ * without it, or when Redis can't be reached, this behaves like WordPress's
+ * built-in per-request cache.
+ */
+
+if (!defined('ABSPATH')) {
+    exit; // Exit if accessed directly
+}
+
+function wp_cache_init() {
+    $GLOBALS['wp_object_cache'] = new WP_Object_Cache();
+}
+
+function wp_cache_add($key, $data, $group = '', $expire = 0) {
+    return $GLOBALS['wp_object_cache']->add($key, $data, $group, (int) $expire);
+}
+
+function wp_cache_add_multiple(array $data, $group = '', $expire = 0) {
+    return $GLOBALS['wp_object_cache']->add_multiple($data, $group, (int) $expire);
+}
+
+function wp_cache_replace($key, $data, $group = '', $expire = 0) {
+    return $GLOBALS['wp_object_cache']->replace($key, $data, $group, (int) $expire);
+}
+
+function wp_cache_set($key, $data, $group = '', $expire = 0) {
+    return $GLOBALS['wp_object_cache']->set($key, $data, $group, (int) $expire);
+}
+
+function wp_cache_set_multiple(array $data, $group = '', $expire = 0) {
+    return $GLOBALS['wp_object_cache']->set_multiple($data, $group, (int) $expire);
+}
+
+function wp_cache_get($key, $group = '', $force = false, &$found = null) {
+    return $GLOBALS['wp_object_cache']->get($key, $group, $force, $found);
+}
+
+function wp_cache_get_multiple($keys, $group = '', $force = false) {
+    return $GLOBALS['wp_object_cache']->get_multiple($keys, $group, $force);
+}
+
+function wp_cache_delete($key, $group = '') {
+    return $GLOBALS['wp_object_cache']->delete($key, $group);
+}
+
+function wp_cache_delete_multiple(array $keys, $group = '') {
+    return $GLOBALS['wp_object_cache']->delete_multiple($keys, $group);
+}
+
+function wp_cache_incr($key, $offset = 1, $group = '') {
+    return $GLOBALS['wp_object_cache']->incr($key, $offset, $group);
+}
+
+function wp_cache_decr($key, $offset = 1, $group = '') {
+    return $GLOBALS['wp_object_cache']->decr($key, $offset, $group);
+}
+
+function wp_cache_flush() {
+    return $GLOBALS['wp_object_cache']->flush();
+}
+
+function wp_cache_flush_runtime() {
+    return $GLOBALS['wp_object_cache']->flush_runtime();
+}
+
+function wp_cache_flush_group($group) {
+    return false;
+}
+
+function wp_cache_supports($feature) {
+    switch ($feature) {
+        case 'add_multiple':
+        case 'set_multiple':
+        case 'get_multiple':
+        case 'delete_multiple':
+        case 'flush_runtime':
+            return true;
+        default:
+            return false;
+    }
+}
+
+function wp_cache_close() {
+    return true;
+}
+
+function wp_cache_add_global_groups($groups) {
+    $GLOBALS['wp_object_cache']->add_global_groups($groups);
+}
+
+function wp_cache_add_non_persistent_groups($groups) {
+    $GLOBALS['wp_object_cache']->add_non_persistent_groups($groups);
+}
+
+function wp_cache_switch_to_blog($blog_id) {
+    $GLOBALS['wp_object_cache']->switch_to_blog($blog_id);
+}
+
+function wp_cache_reset() {
+    _deprecated_function(__FUNCTION__, '3.5.0', 'wp_cache_switch_to_blog()');
+}
+
+class WP_Object_Cache {
+
+    const CONNECT_TIMEOUT = 0.5;
+    const IO_TIMEOUT = 1.0;
+
+    public $cache_hits = 0;
+    public $cache_misses = 0;
+    public $redis_calls = 0;
+
+    private $cache = array();
+    private $global_groups = array();
+    private $non_persistent_groups = array();
+    private $blog_prefix = '';
+    private $key_salt;
+    private $socket = null;
+    private $connect_failed = false;
+
+    public function __construct() {
+        $this->blog_prefix = is_multisite() ? get_current_blog_id() . ':' : '';
+        $this->key_salt = defined('WP_CACHE_KEY_SALT') ? WP_CACHE_KEY_SALT : ($GLOBALS['table_prefix'] ?? 'wp_');
+    }
+
+    public function add_global_groups($groups) {
+        foreach ((array) $groups as $group) {
+            $this->global_groups[$group] = true;
+        }
+    }
+
+    public function add_non_persistent_groups($groups) {
+        foreach ((array) $groups as $group) {
+            $this->non_persistent_groups[$group] = true;
+        }
+    }
+
+    public function switch_to_blog($blog_id) {
+        $this->blog_prefix = is_multisite() ? (int) $blog_id . ':' : '';
+    }
+
+    private function persistent($group) {
+        return !isset($this->non_persistent_groups[$group]) && $this->connect();
+    }
+
+    /**
+     * The Redis key for a cache key: salt, blog (unless the group is global), group, key
+     */
+    private function redis_key($key, $group) {
+        $blog = isset($this->global_groups[$group]) ? '' : $this->blog_prefix;
+        return $this->key_salt . ':' . $blog . $group . ':' . $key;
+    }
+
+    private function runtime_key($key, $group) {
+        return (isset($this->global_groups[$group]) ? '' : $this->blog_prefix) . $group . ':' . $key;
+    }
+
+    private static function valid_key($key) {
+        return is_int($key) || (is_string($key) && trim($key) !== '');
+    }
+
+    public function get($key, $group = '', $force = false, &$found = null) {
+        $group = $group ?: 'default';
+        if (!self::valid_key($key)) {
+            $found = false;
+            return false;
+        }
+        $runtime_key = $this->runtime_key($key, $group);
+        if (!$force && array_key_exists($runtime_key, $this->cache)) {
+            $found = true;
+            $this->cache_hits++;
+            return is_object($this->cache[$runtime_key]) ? clone $this->cache[$runtime_key] : $this->cache[$runtime_key];
+        }
+        if ($this->persistent($group)) {
+            $raw = $this->command(array('GET', $this->redis_key($key, $group)));
+            if (is_string($raw)) {
+                $value = unserialize($raw);
+                $this->cache[$runtime_key] = $value;
+                $found = true;
+                $this->cache_hits++;
+                return is_object($value) ? clone $value : $value;
+            }
+        }
+        $found = false;
+        $this->cache_misses++;
+        return false;
+    }
+
+    /**
+     * Everything missing from the runtime cache comes back in one MGET
+     */
+    public function get_multiple($keys, $group = '', $force = false) {
+        $group = $group ?: 'default';
+        $values = array();
+        $fetch = array();
+        foreach ($keys as $key) {
+            $runtime_key = $this->runtime_key($key, $group);
+            if (!$force && array_key_exists($runtime_key, $this->cache)) {
+                $values[$key] = $this->get($key, $group);
+            } elseif (self::valid_key($key)) {
+                $fetch[] = $key;
+                $values[$key] = false;
+            } else {
+                $values[$key] = false;
+            }
+        }
+        if ($fetch && $this->persistent($group)) {
+            $args = array('MGET');
+            foreach ($fetch as $key) {
+                $args[] = $this->redis_key($key, $group);
+            }
+            $raw = $this->command($args);
+            foreach ($fetch as $index => $key) {
+                if (is_array($raw) && is_string($raw[$index] ?? null)) {
+                    $value = unserialize($raw[$index]);
+                    $this->cache[$this->runtime_key($key, $group)] = $value;
+                    $values[$key] = $value;
+                    $this->cache_hits++;
+                } else {
+                    $this->cache_misses++;
+                }
+            }
+        } else {
+            $this->cache_misses += count($fetch);
+        }
+        return $values;
+    }
+
+    /**
+     * Store a value; $mode is '' (always), 'NX' (add) or 'XX' (replace)
+     */
+    private function store($key, $data, $group, $expire, $mode = '') {
+        $group = $group ?: 'default';
+        if (!self::valid_key($key)) {
+            return false;
+        }
+        if (is_object($data)) {
+            $data = clone $data;
+        }
+        $runtime_key = $this->runtime_key($key, $group);
+
+        if ($this->persistent($group)) {
+            $args = array('SET', $this->redis_key($key, $group), serialize($data));
+            if ($expire > 0) {
+                array_push($args, 'EX', $expire);
+            }
+            if ($mode) {
+                $args[] = $mode;
+            }
+            $reply = $this->command($args);
+            if ($reply !== 'OK') {
+                if ($mode) {
+                    return false; // NX/XX condition not met (or Redis went away)
+                }
+                unset($this->cache[$runtime_key]);
+                return false;
+            }
+        } elseif ($mode === 'NX' && array_key_exists($runtime_key, $this->cache)) {
+            return false;
+        } elseif ($mode === 'XX' && !array_key_exists($runtime_key, $this->cache)) {
+            return false;
+        }
+        $this->cache[$runtime_key] = $data;
+        return true;
+    }
+
+    public function set($key, $data, $group = '', $expire = 0) {
+        return $this->store($key, $data, $group, $expire);
+    }
+
+    public function add($key, $data, $group = '', $expire = 0) {
+        if (wp_suspend_cache_addition()) {
+            return false;
+        }
+        return $this->store($key, $data, $group, $expire, 'NX');
+    }
+
+    public function replace($key, $data, $group = '', $expire = 0) {
+        return $this->store($key, $data, $group, $expire, 'XX');
+    }
+
+    public function set_multiple(array $data, $group = '', $expire = 0) {
+        $results = array();
+        foreach ($data as $key => $value) {
+            $results[$key] = $this->set($key, $value, $group, $expire);
+        }
+        return $results;
+    }
+
+    public function add_multiple(array $data, $group = '', $expire = 0) {
+        $results = array();
+        foreach ($data as $key => $value) {
+            $results[$key] = $this->add($key, $value, $group, $expire);
+        }
+        return $results;
+    }
+
+    public function delete($key, $group = '') {
+        $group = $group ?: 'default';
+        if (!self::valid_key($key)) {
+            return false;
+        }
+        $runtime_key = $this->runtime_key($key, $group);
+        $existed = array_key_exists($runtime_key, $this->cache);
+        unset($this->cache[$runtime_key]);
+        if ($this->persistent($group)) {
+            return $this->command(array('DEL', $this->redis_key($key, $group))) > 0 || $existed;
+        }
+        return $existed;
+    }
+
+    public function delete_multiple(array $keys, $group = '') {
+        $results = array();
+        foreach ($keys as $key) {
+            $results[$key] = $this->delete($key, $group);
+        }
+        return $results;
+    }
+
+    public function incr($key, $offset = 1, $group = '') {
+        $value = $this->get($key, $group, false, $found);
+        if (!$found) {
+            return false;
+        }
+        $value = max(0, (is_numeric($value) ? (int) $value : 0) + (int) $offset);
+        $this->set($key, $value, $group);
+        return $value;
+    }
+
+    public function decr($key, $offset = 1, $group = '') {
+        return $this->incr($key, -(int) $offset, $group);
+    }
+
+    public function flush() {
+        $this->cache = array();
+        if ($this->connect()) {
+            return $this->command(array('FLUSHDB')) === 'OK';
+        }
+        return true;
+    }
+
+    public function flush_runtime() {
+        $this->cache = array();
+        return true;
+    }
+
+    public function stats() {
+        echo '<p><strong>Cache Hits:</strong> ' . (int) $this->cache_hits . '<br />';
+        echo '<strong>Cache Misses:</strong> ' . (int) $this->cache_misses . '<br />';
+        echo '<strong>Redis Calls:</strong> ' . (int) $this->redis_calls . '<br />';
+        echo '<strong>Redis:</strong> ' . ($this->socket ? 'connected' : 'not connected') . '</p>';
+    }
+
+    /**
+     * Open the Redis connection once per request; after a failure, stay runtime-only
+     */
+    private function connect() {
+        if ($this->socket) {
+            return true;
+        }
+        $host = getenv('ONIONPRESS_REDIS_HOST');
+        if ($this->connect_failed || !$host) {
+            return false;
+        }
+        $socket = @stream_socket_client('tcp://' . $host . ':6379', $errno, $errstr, self::CONNECT_TIMEOUT);
+        if (!$socket) {
+            $this->connect_failed = true;
+            return false;
+        }
+        stream_set_timeout($socket, (int) self::IO_TIMEOUT, (int) ((self::IO_TIMEOUT - (int) self::IO_TIMEOUT) * 1000000));
+        $this->socket = $socket;
+        return true;
+    }
+
+    private function disconnect() {
+        if ($this->socket) {
+            @fclose($this->socket);
+        }
+        $this->socket = null;
+        $this->connect_failed = true;
+    }
+
+    /**
+     * Send one command in RESP and return its reply (null on any connection error)
+     */
+    private function command(array $args) {
+        if (!$this->socket) {
+            return null;
+        }
+        $payload = '*' . count($args) . "\r\n";
+        foreach ($args as $arg) {
+            $arg = (string) $arg;
+            $payload .= '$' . strlen($arg) . "\r\n" . $arg . "\r\n";
+        }
+        $this->redis_calls++;
+        try {
+            $this->write($payload);
+            return $this->read_reply();
+        } catch (RuntimeException $e) {
+            $this->disconnect();
+            return null;
+        }
+    }
+
+    private function write($payload) {
+        while ($payload !== '') {
+            $written = @fwrite($this->socket, $payload);
+            if ($written === false || $written === 0) {
+                throw new RuntimeException('Redis write failed');
+            }
+            $payload = substr($payload, $written);
+        }
+    }
+
+    private function read_bytes($length) {
+        $data = '';
+        while (strlen($data) < $length) {
+            $chunk = @fread($this->socket, $length - strlen($data));
+            if ($chunk === false || $chunk === '') {
+                throw new RuntimeException('Redis read failed');
+            }
+            $data .= $chunk;
+        }
+        return $data;
+    }
+
+    private function read_reply() {
+        $line = @fgets($this->socket);
+        if ($line === false || strlen($line) < 3) {
+            throw new RuntimeException('Redis read failed');
+        }
+        $type = $line[0];
+        $data = substr($line, 1, -2);
+        switch ($type) {
+            case '+':
+                return $data;
+            case '-':
+                return false; // Error reply: treat like a failed operation
+            case ':':
+                return (int) $data;
+            case '$':
+                if ((int) $data < 0) {
+                    return null;
+                }
+                return substr($this->read_bytes((int) $data + 2), 0, -2);
+            case '*':
+                if ((int) $data < 0) {
+                    return null;
+                }
+                $items = array();
+                for ($i = 0; $i < (int) $data; $i++) {
+                    $items[] = $this->read_reply();
+                }
+                return $items;
+        }
+        throw new RuntimeException('Unexpected Redis reply');
+    }
+}
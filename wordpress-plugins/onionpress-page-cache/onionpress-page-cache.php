@@ -0,0 +1,322 @@
+<?php
+/**
+ * Plugin Name: Onion.Press Page Cache
+ * Plugin URI: https://github.com/brewsterkahle/onion.press
+ * Description: Full-page cache for anonymous visitors - Apache serves pre-rendered pages from disk without starting PHP
+ * Version: 1.0.0
+ * Author: Onion.Press
+ * Author URI: https://github.com/brewsterkahle/onion.press
+ * License: AGPL-3.0
+ * Text Domain: onionpress-page-cache
+ */
+
+if (!defined('ABSPATH')) {
+    exit; // Exit if accessed directly
+}
+
+class OnionPress_Page_Cache {
+
+    const VERSION = '1.0.0';
+    const HTACCESS_MARKER = 'onion.press page cache';
+    const HOURS_KEPT = 168;
+
+    private static $instance = null;
+    private $cache_dir;
+    private $cache_path;
+    private $stats_file;
+
+    public static function get_instance() {
+        if (null === self::$instance) {
+            self::$instance = new self();
+        }
+        return self::$instance;
+    }
+
+    private function __construct() {
+        // Pages live under the document root so Apache can serve them directly
+        $this->cache_dir = WP_CONTENT_DIR . '/cache/onionpress-page-cache';
+        $this->cache_path = '/' . trim(str_replace(ABSPATH, '', $this->cache_dir), '/');
+
+        // Counters go to the persistent volume the menubar app reads them from
+        $this->stats_file = '/var/lib/onionpress/page-cache-stats.json';
+
+        register_activation_hook(__FILE__, array($this, 'activate'));
+        register_deactivation_hook(__FILE__, array($this, 'deactivate'));
+
+        // Rewrite the rules when this version's are missing (e.g. after an update)
+        add_action('init', array($this, 'maybe_install_rules'));
+        add_action('template_redirect', array($this, 'start_buffer'), 0);
+
+        // Purge: a post change can touch any archive, a comment only its post
+        add_action('transition_post_status', array($this, 'on_post_status'), 10, 3);
+        add_action('deleted_post', array($this, 'purge_all'));
+        add_action('comment_post', array($this, 'on_comment_post'), 10, 2);
+        add_action('edit_comment', array($this, 'on_comment_change'));
+        add_action('wp_set_comment_status', array($this, 'on_comment_change'));
+        foreach (array('switch_theme', 'customize_save_after', 'wp_update_nav_menu',
+                       'activated_plugin', 'deactivated_plugin', 'update_option_permalink_structure',
+                       'update_option_blogname', 'update_option_blogdescription') as $hook) {
+            add_action($hook, array($this, 'purge_all'));
+        }
+    }
+
+    /**
+     * Install the rewrite rules on activation
+     */
+    public function activate() {
+        $this->install_rules();
+    }
+
+    /**
+     * Remove the rewrite rules and every cached page
+     */
+    public function deactivate() {
+        $this->write_htaccess_block(array());
+        delete_option('onionpress_page_cache_rules');
+        $this->purge_all();
+    }
+
+    public function maybe_install_rules() {
+        if (get_option('onionpress_page_cache_rules') !== self::VERSION) {
+            $this->install_rules();
+        }
+    }
+
+    /**
+     * Serve cached pages straight from disk for anonymous GETs without a query string
+     */
+    private function install_rules() {
+        $file = $this->cache_path . '/%{HTTP_HOST}%{REQUEST_URI}index.html';
+        $rules = array(
+            '<IfModule mod_rewrite.c>',
+            'RewriteEngine On',
+            'RewriteCond %{REQUEST_METHOD} GET',
+            'RewriteCond %{QUERY_STRING} ^$',
+            'RewriteCond %{REQUEST_URI} /$',
+            'RewriteCond %{REQUEST_URI} !^/wp-(admin|content|includes|json)/',
+            'RewriteCond %{HTTP_COOKIE} !(wordpress_logged_in_|wp-postpass_|comment_author_) [NC]',
+            'RewriteCond %{DOCUMENT_ROOT}' . $file . ' -f',
+            'RewriteRule ^ ' . $file . ' [L]',
+            '</IfModule>',
+        );
+        if ($this->write_htaccess_block($rules)) {
+            update_option('onionpress_page_cache_rules', self::VERSION);
+        }
+
+        // Cached copies revalidate on every visit: Apache answers with its own
+        // ETag (mtime and size), so an unchanged page costs a 304 and no body
+        wp_mkdir_p($this->cache_dir);
+        @file_put_contents($this->cache_dir . '/.htaccess', implode("\n", array(
+            'Options -Indexes',
+            'FileETag MTime Size',
+            'AddDefaultCharset UTF-8',
+            '<IfModule mod_headers.c>',
+            '    Header set Cache-Control "no-cache"',
+            '    Header set X-Onionpress-Cache "HIT"',
+            '</IfModule>',
+        )) . "\n");
+    }
+
+    /**
+     * Put the block at the top of .htaccess: WordPress's own rules send every
+     * request for a missing file to index.php, so ours must run first
+     */
+    private function write_htaccess_block($rules) {
+        $htaccess = ABSPATH . '.htaccess';
+        $current = file_exists($htaccess) ? (string) @file_get_contents($htaccess) : '';
+        $begin = '# BEGIN ' . self::HTACCESS_MARKER;
+        $end = '# END ' . self::HTACCESS_MARKER;
+
+        $rest = preg_replace('/' . preg_quote($begin, '/') . '.*?' . preg_quote($end, '/') . '\n*/s', '', $current);
+        $block = $rules ? $begin . "\n" . implode("\n", $rules) . "\n" . $end . "\n\n" : '';
+        if ($block . $rest === $current) {
+            return true;
+        }
+        return false !== @file_put_contents($htaccess, $block . $rest, LOCK_EX);
+    }
+
+    /**
+     * Whether the URL is one the rewrite rules can serve (same tests, same order)
+     */
+    private function url_cacheable() {
+        if (($_SERVER['REQUEST_METHOD'] ?? '') !== 'GET' || ($_SERVER['QUERY_STRING'] ?? '') !== '') {
+            return false;
+        }
+        $path = $_SERVER['REQUEST_URI'] ?? '';
+        return substr($path, -1) === '/' && !preg_match('#^/wp-(admin|content|includes|json)/#', $path);
+    }
+
+    /**
+     * Whether this response may be stored for everyone
+     */
+    private function response_cacheable() {
+        foreach (array_keys($_COOKIE) as $name) {
+            if (preg_match('/^(wordpress_logged_in_|wp-postpass_|comment_author_)/i', $name)) {
+                return false;
+            }
+        }
+        if (defined('DONOTCACHEPAGE') || is_user_logged_in() || is_admin() || wp_doing_ajax()
+            || is_preview() || is_search() || is_feed() || is_trackback() || is_404()) {
+            return false;
+        }
+        if (is_singular() && post_password_required()) {
+            return false;
+        }
+        // Only paths that map safely onto the cache directory
+        $path = $_SERVER['REQUEST_URI'];
+        return preg_match('#^[A-Za-z0-9/_.-]+$#', $path) && strpos($path, '..') === false
+            && preg_match('/^[A-Za-z0-9.-]+(:\d+)?$/', $_SERVER['HTTP_HOST'] ?? '');
+    }
+
+    public function start_buffer() {
+        if ($this->url_cacheable()) {
+            ob_start(array($this, 'finish_buffer'));
+        }
+    }
+
+    /**
+     * Store the rendered page, add an ETag and answer If-None-Match with 304
+     */
+    public function finish_buffer($html) {
+        $status = http_response_code();
+        if ($status !== 200 || stripos($html, '</html>') === false || !$this->sends_html()) {
+            return $html;
+        }
+
+        $stored = false;
+        if ($this->response_cacheable()) {
+            $stored = $this->store($_SERVER['HTTP_HOST'], $_SERVER['REQUEST_URI'], $html);
+        }
+        $this->count($stored ? 0 : 1);
+
+        $etag = '"' . md5($html) . '"';
+        header('ETag: ' . $etag);
+        header('X-Onionpress-Cache: ' . ($stored ? 'MISS' : 'BYPASS'));
+        if (trim($_SERVER['HTTP_IF_NONE_MATCH'] ?? '') === $etag) {
+            http_response_code(304);
+            return '';
+        }
+        return $html;
+    }
+
+    private function sends_html() {
+        foreach (headers_list() as $header) {
+            if (stripos($header, 'content-type:') === 0) {
+                return stripos($header, 'text/html') !== false;
+            }
+        }
+        return true;
+    }
+
+    private function store($host, $path, $html) {
+        $dir = $this->cache_dir . '/' . $host . rtrim($path, '/');
+        if (!wp_mkdir_p($dir)) {
+            return false;
+        }
+        // Write then rename, so Apache never serves a half-written page
+        $temp = $dir . '/.index.html.' . getmypid();
+        $page = $html . "\n<!-- onion.press page cache " . gmdate('Y-m-d H:i:s') . " UTC -->\n";
+        if (false === @file_put_contents($temp, $page)) {
+            return false;
+        }
+        return @rename($temp, $dir . '/index.html');
+    }
+
+    /**
+     * Count a page PHP rendered for a cacheable URL: 0 = stored (miss), 1 = bypassed
+     * Hits never reach PHP; the menubar app takes them from the access log
+     */
+    private function count($index) {
+        $handle = @fopen($this->stats_file, 'c+');
+        if (!$handle) {
+            return;
+        }
+        if (flock($handle, LOCK_EX)) {
+            $stats = json_decode(stream_get_contents($handle), true);
+            if (!is_array($stats)) {
+                $stats = array();
+            }
+            $hour = (string) intdiv(time(), 3600);
+            if (!isset($stats[$hour])) {
+                $stats[$hour] = array(0, 0);
+                foreach (array_keys($stats) as $key) {
+                    if ((int) $key <= (int) $hour - self::HOURS_KEPT) {
+                        unset($stats[$key]);
+                    }
+                }
+            }
+            $stats[$hour][$index]++;
+            ftruncate($handle, 0);
+            rewind($handle);
+            fwrite($handle, json_encode($stats));
+            fflush($handle);
+            flock($handle, LOCK_UN);
+        }
+        fclose($handle);
+    }
+
+    /**
+     * Publishing, updating (publish -> publish) or unpublishing a post
+     */
+    public function on_post_status($new_status, $old_status, $post) {
+        if ($new_status === 'publish' || $old_status === 'publish') {
+            $this->purge_all();
+        }
+    }
+
+    public function on_comment_post($comment_id, $approved) {
+        if ($approved === 1) {
+            $this->on_comment_change($comment_id);
+        }
+    }
+
+    public function on_comment_change($comment_id) {
+        $comment = get_comment($comment_id);
+        if ($comment) {
+            $this->purge_post($comment->comment_post_ID);
+        }
+    }
+
+    /**
+     * Drop one post's page and the front page (comment counts show there) for every host
+     */
+    public function purge_post($post_id) {
+        $paths = array('/');
+        $permalink = get_permalink($post_id);
+        if ($permalink) {
+            $paths[] = (string) wp_parse_url($permalink, PHP_URL_PATH);
+        }
+        foreach (glob($this->cache_dir . '/*', GLOB_ONLYDIR) ?: array() as $host_dir) {
+            foreach ($paths as $path) {
+                @unlink($host_dir . '/' . trim($path, '/') . '/index.html');
+            }
+        }
+    }
+
+    /**
+     * Drop every cached page (the directory's .htaccess stays)
+     */
+    public function purge_all() {
+        foreach (glob($this->cache_dir . '/*', GLOB_ONLYDIR) ?: array() as $host_dir) {
+            $this->remove_tree($host_dir);
+        }
+    }
+
+    private function remove_tree($dir) {
+        foreach (scandir($dir) ?: array() as $entry) {
+            if ($entry === '.' || $entry === '..') {
+                continue;
+            }
+            $path = $dir . '/' . $entry;
+            if (is_dir($path) && !is_link($path)) {
+                $this->remove_tree($path);
+            } else {
+                @unlink($path);
+            }
+        }
+        @rmdir($dir);
+    }
+}
+
+// Initialize plugin
+OnionPress_Page_Cache::get_instance();